@@ -0,0 +1,36 @@
+"""
+Benchmark comparing memory per history entry for the list and columnar backends
+
+Usage: python benchmarks/bench_history_memory.py [num_entries]
+"""
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from calculator.calculation import Calculation
+from calculator.calculations import create_history_store
+
+OPERATIONS = ['add', 'subtract', 'multiply', 'divide']
+
+def measure(backend: str, count: int) -> float:
+    """Return the number of bytes allocated per entry for a backend"""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    store = create_history_store(backend)
+    for i in range(count):
+        store.append(Calculation(float(i), i + 0.5, OPERATIONS[i % 4]))
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (after - before) / count
+
+def main():
+    """Run the benchmark and print bytes per entry for each backend"""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    print(f"Entries: {count}")
+    for backend in ('list', 'columnar'):
+        print(f"{backend.ljust(10)} {measure(backend, count):8.1f} bytes/entry")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""
+Benchmark measuring how quickly a persisted history log reloads
+
+Usage: python benchmarks/bench_history_reload.py [num_entries]
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from calculator.calculation import Calculation
+from calculator.history_log import MappedHistory
+
+OPERATIONS = ['add', 'subtract', 'multiply', 'divide']
+
+def main():
+    """Write a log, then time reopening it and reading recent entries"""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    path = os.path.join(tempfile.mkdtemp(), "history.bin")
+
+    start = time.perf_counter()
+    store = MappedHistory(path, fsync='batch', flush_every=65536)
+    for i in range(count):
+        store.append(Calculation(float(i), i + 0.5, OPERATIONS[i % 4]))
+    store.close()
+    print(f"Wrote {count} entries in {time.perf_counter() - start:.3f}s "
+          f"({os.path.getsize(path) / 1e6:.1f} MB)")
+
+    start = time.perf_counter()
+    store = MappedHistory(path)
+    latest = store[-1]
+    print(f"Reloaded {len(store)} entries in {(time.perf_counter() - start) * 1000:.2f} ms "
+          f"(latest: {latest})")
+
+    start = time.perf_counter()
+    total = sum(1 for _ in store)
+    print(f"Full scan of {total} entries in {time.perf_counter() - start:.3f}s")
+    store.close()
+    os.remove(path)
+
+if __name__ == "__main__":
+    main()
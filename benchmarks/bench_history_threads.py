@@ -0,0 +1,58 @@
+"""
+Benchmark measuring what the history lock costs. Threads append to one shared
+CalculationHistory, which takes its lock for every append, and are compared
+with per-thread shards (one history per thread, so the lock is never
+contended) and, on a single thread, with an unsynchronized history whose lock
+is a no-op
+
+Usage: python benchmarks/bench_history_threads.py [appends_per_run]
+"""
+import os
+import sys
+import threading
+import time
+from contextlib import nullcontext
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from calculator.calculation import Calculation
+from calculator.calculations import CalculationHistory
+
+def unsynchronized_history() -> CalculationHistory:
+    """Return a history without locking; only safe on a single thread"""
+    history = CalculationHistory()
+    history._lock = nullcontext()
+    return history
+
+def run(histories, total: int) -> float:
+    """Return appends per second with one thread per history in histories"""
+    per_thread = total // len(histories)
+
+    def worker(history):
+        for i in range(per_thread):
+            history.add_calculation(Calculation(float(i), 3.0, 'divide'))
+
+    workers = [threading.Thread(target=worker, args=(history,)) for history in histories]
+    start = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    assert sum(len(history.history) for history in set(histories)) == per_thread * len(histories)
+    return per_thread * len(histories) / elapsed
+
+def main():
+    """Run the benchmark for 1, 2, 4 and 8 threads"""
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    print(f"{'threads':>8} {'shared':>14} {'shards':>14} {'unsynchronized':>16}")
+    for threads in (1, 2, 4, 8):
+        shared_history = CalculationHistory()
+        shared = run([shared_history] * threads, total)
+        shards = run([CalculationHistory() for _ in range(threads)], total)
+        unsynchronized = (f"{run([unsynchronized_history()], total):>14,.0f}/s"
+                          if threads == 1 else '-')
+        print(f"{threads:>8} {shared:>12,.0f}/s {shards:>12,.0f}/s {unsynchronized:>16}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Benchmark comparing CalculatorApp.parse_input against plain shlex.split on a
+realistic command stream: mostly 'op num num ...' lines with a few quoted ones
+
+Usage: python benchmarks/bench_parse_input.py [lines]
+"""
+import os
+import random
+import shlex
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from calculator_app import CalculatorApp
+
+OPERATIONS = ('add', 'subtract', 'multiply', 'divide', 'power')
+
+def make_stream(count: int, quoted_every: int = 100):
+    """Return command lines where one in quoted_every uses shell quoting"""
+    rng = random.Random(42)
+    lines = []
+    for i in range(count):
+        operands = [f"{rng.uniform(-1000, 1000):.3f}" for _ in range(rng.randint(2, 4))]
+        if i % quoted_every == 0:
+            operands[0] = f'"{operands[0]}"'
+        lines.append(f"{rng.choice(OPERATIONS)} {' '.join(operands)}\n")
+    return lines
+
+def parse_with_shlex(line: str):
+    """Parse a line the way parse_input did before the fast path"""
+    parts = shlex.split(line)
+    if not parts:
+        return ('', [])
+    return (parts[0].lower(), parts[1:])
+
+def run(parse, lines) -> float:
+    """Return lines parsed per second"""
+    start = time.perf_counter()
+    for line in lines:
+        parse(line)
+    return len(lines) / (time.perf_counter() - start)
+
+def main():
+    """Run the benchmark and check that both parsers agree"""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    lines = make_stream(count)
+    app = CalculatorApp()
+    assert all(app.parse_input(line) == parse_with_shlex(line) for line in lines[:10_000])
+
+    slow = run(parse_with_shlex, lines)
+    fast = run(app.parse_input, lines)
+    print(f"{'parser':>12} {'lines/s':>14}")
+    print(f"{'shlex':>12} {slow:>12,.0f}/s")
+    print(f"{'parse_input':>12} {fast:>12,.0f}/s")
+    print(f"speedup: {fast / slow:.1f}x")
+
+if __name__ == "__main__":
+    main()
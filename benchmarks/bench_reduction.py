@@ -0,0 +1,80 @@
+"""
+Benchmark comparing a left fold with calculator.reduction for variadic add and
+multiply on argument lists from 2 to 1M values, reporting throughput and the
+error of each against an exact rational reference
+
+Usage: python benchmarks/bench_reduction.py [max_size]
+"""
+import math
+import os
+import random
+import sys
+import time
+from fractions import Fraction
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from calculator.operations import get_operation
+from calculator.reduction import fold, reduce_operands
+
+SIZES = (2, 10, 100, 1_000, 10_000, 100_000, 1_000_000)
+# Exact references get slow for long products, so they are checked up to this size
+EXACT_LIMIT = 10_000
+
+def make_operands(operation: str, size: int):
+    """Return operands typical of each operation: mixed-sign sums, products close to 1"""
+    rng = random.Random(size)
+    if operation == 'add':
+        return [rng.uniform(-1000, 1000) for _ in range(size)]
+    return [rng.uniform(0.9, 1.1) for _ in range(size)]
+
+def exact(operation: str, operands) -> float:
+    """Return the correctly rounded result computed with fractions"""
+    if operation == 'add':
+        return float(sum(map(Fraction, operands)))
+    product = Fraction(1)
+    for operand in operands:
+        product *= Fraction(operand)
+    try:
+        return float(product)
+    except OverflowError:
+        return math.inf
+
+def relative_error(value: float, reference: float) -> float:
+    """Return |value - reference| / |reference|, or 0 when they are equal"""
+    if value == reference:
+        return 0.0
+    if not math.isfinite(reference) or reference == 0.0:
+        return math.inf
+    return abs(value - reference) / abs(reference)
+
+def throughput(reduce, operands) -> float:
+    """Return operands reduced per second, repeating short lists"""
+    repeats = max(1, 200_000 // len(operands))
+    start = time.perf_counter()
+    for _ in range(repeats):
+        reduce(operands)
+    return repeats * len(operands) / (time.perf_counter() - start)
+
+def main():
+    """Run the benchmark for add and multiply"""
+    max_size = int(sys.argv[1]) if len(sys.argv) > 1 else SIZES[-1]
+    print(f"{'operation':>9} {'size':>9} {'fold/s':>14} {'reduce/s':>14} "
+          f"{'fold error':>11} {'reduce error':>12}")
+    for operation in ('add', 'multiply'):
+        func = get_operation(operation)
+        for size in (size for size in SIZES if size <= max_size):
+            operands = make_operands(operation, size)
+            folded = throughput(lambda values: fold(func, values), operands)
+            reduced = throughput(lambda values: reduce_operands(operation, func, values), operands)
+            if size <= EXACT_LIMIT:
+                reference = exact(operation, operands)
+                fold_error = f"{relative_error(fold(func, operands), reference):.1e}"
+                reduce_error = f"{relative_error(reduce_operands(operation, func, operands), reference):.1e}"
+            else:
+                fold_error = reduce_error = '-'
+            print(f"{operation:>9} {size:>9,} {folded:>12,.0f}/s {reduced:>12,.0f}/s "
+                  f"{fold_error:>11} {reduce_error:>12}")
+
+if __name__ == "__main__":
+    main()
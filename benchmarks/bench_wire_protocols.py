@@ -0,0 +1,67 @@
+"""
+Benchmark comparing the text protocol server with the binary protocol server
+
+Usage: python benchmarks/bench_wire_protocols.py [num_operations] [frame_size]
+"""
+import asyncio
+import os
+import socket
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('LOG_LEVEL', 'CRITICAL')
+
+from server.text_server import CalculatorServer
+from server.binary_server import BinaryCalculatorServer
+from server.binary_client import BinaryCalculatorClient
+
+OPERATIONS = ['add', 'subtract', 'multiply', 'divide']
+
+def start_in_background(server, loop):
+    """Start a server on an ephemeral port in a background event loop and return the port"""
+    listener = loop.run_until_complete(server.start_tcp('127.0.0.1', 0))
+    return listener.sockets[0].getsockname()[1]
+
+def bench_text(port: int, count: int, frame_size: int) -> float:
+    """Return operations per second over the text protocol, pipelining frame_size lines"""
+    with socket.create_connection(('127.0.0.1', port)) as connection:
+        reader = connection.makefile('rb')
+        start = time.perf_counter()
+        for first in range(0, count, frame_size):
+            size = min(frame_size, count - first)
+            lines = "".join(f"{OPERATIONS[i % 4]} {i} {i % 7 + 1}\n"
+                            for i in range(first, first + size))
+            connection.sendall(lines.encode())
+            for _ in range(size):
+                float(reader.readline())
+        return count / (time.perf_counter() - start)
+
+def bench_binary(port: int, count: int, frame_size: int) -> float:
+    """Return operations per second over the binary protocol with frame_size operations per frame"""
+    with BinaryCalculatorClient('127.0.0.1', port) as client:
+        start = time.perf_counter()
+        for first in range(0, count, frame_size):
+            size = min(frame_size, count - first)
+            client.calculate([(OPERATIONS[i % 4], float(i), float(i % 7 + 1))
+                              for i in range(first, first + size)])
+        return count / (time.perf_counter() - start)
+
+def main():
+    """Run both servers and print operations per second for each protocol"""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    frame_size = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+
+    loop = asyncio.new_event_loop()
+    text_port = start_in_background(CalculatorServer(), loop)
+    binary_port = start_in_background(BinaryCalculatorServer(), loop)
+    threading.Thread(target=loop.run_forever, daemon=True).start()
+
+    print(f"Operations: {count}, batch size: {frame_size}")
+    print(f"text   {bench_text(text_port, count, frame_size):12,.0f} ops/s")
+    print(f"binary {bench_binary(binary_port, count, frame_size):12,.0f} ops/s")
+    loop.call_soon_threadsafe(loop.stop)
+
+if __name__ == "__main__":
+    main()
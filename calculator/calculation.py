@@ -1,44 +1,73 @@
 """
 Calculation module for representing individual calculations
 """
-from typing import TypeVar, Callable, Generic
+from typing import TypeVar, Callable, Generic, Sequence, Tuple
+from calculator.operations import get_operation
+from calculator.reduction import reduce_operands
 
 T = TypeVar('T', int, float)
 
 class Calculation(Generic[T]):
     """
-    Calculation class represents a single calculation with two operands and an operation
+    Calculation class represents a single calculation with two operands and an operation.
+    Variadic calls keep their further operands in rest and reduce the operation
+    over all of them as the commands do, e.g. subtract 10 2 3 is (10 - 2) - 3.
     """
-    def __init__(self, a: T, b: T, operation: str):
+    # Slots keep long histories compact by avoiding a per-instance __dict__
+    __slots__ = ('a', 'b', 'operation', 'rest', '_func')
+
+    def __init__(self, a: T, b: T, operation: str, rest: Sequence[T] = ()):
         """Initialize the calculation with operands and operation"""
         self.a = a
         self.b = b
         self.operation = operation
+        self.rest: Tuple[T, ...] = tuple(rest)
+        # Resolve the operation once so perform() is a single call
+        self._func = get_operation(operation)
+
+    @classmethod
+    def from_operands(cls, operation: str, operands: Sequence[T]) -> 'Calculation[T]':
+        """
+        Create a calculation from two or more operands
+        Raises ValueError if fewer than two operands are given
+        """
+        if len(operands) < 2:
+            raise ValueError("A calculation requires at least 2 operands")
+        return cls(operands[0], operands[1], operation, operands[2:])
+
+    @property
+    def operands(self) -> Tuple[T, ...]:
+        """Return all operands in order"""
+        return (self.a, self.b) + self.rest
 
     def __repr__(self) -> str:
         """Return string representation of the calculation"""
+        if self.rest:
+            return f"Calculation({', '.join(map(str, self.operands))}, {self.operation})"
         return f"Calculation({self.a}, {self.b}, {self.operation})"
 
+    def __eq__(self, other) -> bool:
+        """Compare calculations by operands and operation"""
+        if not isinstance(other, Calculation):
+            return NotImplemented
+        return ((self.a, self.b, self.operation, self.rest) ==
+                (other.a, other.b, other.operation, other.rest))
+
+    def __hash__(self) -> int:
+        """Hash calculations consistently with equality"""
+        return hash((self.a, self.b, self.operation, self.rest))
+
     def perform(self) -> T:
         """
         Perform the stored calculation based on the operation
         Raises ValueError for unsupported operations
         """
-        # Dictionary mapping operation symbols to corresponding functions
-        operations = {
-            'add': lambda: self.a + self.b,
-            'subtract': lambda: self.a - self.b,
-            'multiply': lambda: self.a * self.b,
-            'divide': lambda: self._divide()
-        }
-        
-        if self.operation not in operations:
-            raise ValueError(f"Unsupported operation: {self.operation}")
-        
-        return operations[self.operation]()
-    
-    def _divide(self) -> T:
-        """Helper method to handle division with zero check"""
-        if self.b == 0:
-            raise ZeroDivisionError("Cannot divide by zero")
-        return self.a / self.b
\ No newline at end of file
+        func = self._func
+        if func is None:
+            # The operation may have been registered by a plugin after construction
+            func = self._func = get_operation(self.operation)
+            if func is None:
+                raise ValueError(f"Unsupported operation: {self.operation}")
+        if not self.rest:
+            return func(self.a, self.b)
+        return reduce_operands(self.operation, func, self.operands)
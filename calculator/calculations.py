@@ -1,38 +1,252 @@
 """
 Calculations module for managing calculation history
 """
-from typing import List, Optional
+import atexit
+import threading
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 from calculator.calculation import Calculation
+from calculator.history import ColumnarHistory, ListHistory, RingBufferHistory, HistoryView
+from calculator.history_index import HistoryIndex
+from calculator.history_log import MappedHistory
+from calculator.sqlite_history import SQLiteHistory
+from calculator.stats import HistoryStats
+from utils.env_config import EnvConfig
 
-class Calculations:
+def create_history_store(backend: str = None, capacity: int = None,
+                         spill_path: str = None):
     """
-    Calculations class for managing a history of calculations
+    Create the history store for the configured backend
+    A positive capacity turns the list backend into a bounded ring buffer that
+    spills to spill_path
+    Raises ValueError for unknown backends, or a capacity with another backend
     """
-    history: List[Calculation] = []
+    backend = (backend or EnvConfig.HISTORY_BACKEND).lower()
+    capacity = EnvConfig.HISTORY_CAPACITY if capacity is None else capacity
+    if capacity > 0:
+        if backend != 'list':
+            raise ValueError(f"History capacity is only supported by the list backend, "
+                             f"not {backend}")
+        spill_path = spill_path or EnvConfig.HISTORY_SPILL_FILE or None
+        store = RingBufferHistory(capacity, spill_path)
+        if spill_path is not None:
+            atexit.register(store.close)
+        return store
+    if backend == 'list':
+        return ListHistory()
+    if backend == 'columnar':
+        return ColumnarHistory()
+    if backend == 'mmap':
+        store = MappedHistory(EnvConfig.HISTORY_LOG_FILE, EnvConfig.HISTORY_FSYNC,
+                              EnvConfig.HISTORY_FLUSH_EVERY)
+        # Write out the last partial batch when the process exits
+        atexit.register(store.close)
+        return store
+    if backend == 'sqlite':
+        store = SQLiteHistory(EnvConfig.HISTORY_DB_FILE, EnvConfig.HISTORY_FLUSH_EVERY)
+        atexit.register(store.close)
+        return store
+    raise ValueError(f"Unknown history backend: {backend}")
 
-    @classmethod
-    def add_calculation(cls, calculation: Calculation) -> None:
-        """Add a calculation to the history"""
-        cls.history.append(calculation)
+def _safe_result(calculation: Calculation) -> Optional[float]:
+    """Return the result of a calculation, or None if it cannot be performed"""
+    try:
+        return calculation.perform()
+    except (ValueError, ArithmeticError):
+        return None
+
+class CalculationHistory:
+    """
+    CalculationHistory class for managing a history of calculations together
+    with its indexes and running statistics. Each session owns one; the
+    process-wide default is available as Calculations.
+    All methods are safe to call from multiple threads. Each history has one
+    re-entrant lock guarding its store, indexes and statistics; views take it
+    while reading each chunk. Insertion order is the order in which
+    add_calculation acquires the lock. Histories of different sessions do not
+    share a lock.
+    """
+    def __init__(self, store=None):
+        """Initialize the history with a store, an in-memory list by default"""
+        self.history: List[Calculation] = ListHistory() if store is None else store
+        self._lock = threading.RLock()
+        self._index = HistoryIndex()
+        self._stats = HistoryStats()
+        # Number of history positions reflected in the indexes and statistics
+        self._observed = 0
+        # Positions before this were evicted and dropped from the indexes
+        self._pruned = 0
+
+    def set_history_store(self, store) -> None:
+        """Replace the history store, e.g. with a ColumnarHistory"""
+        with self._lock:
+            self.history = store
+            self._reset_derived()
+
+    def _reset_derived(self) -> None:
+        """Reset the indexes and statistics derived from the history"""
+        self._index.clear()
+        self._stats.clear()
+        self._observed = 0
+        self._pruned = 0
+
+    def add_calculation(self, calculation: Calculation,
+                        result: Optional[float] = None) -> None:
+        """
+        Add a calculation to the history and update the indexes and statistics
+        Callers that already know the result pass it to avoid computing it again
+        """
+        # Compute the result outside the lock to keep the critical section short
+        if result is None:
+            result = _safe_result(calculation)
+        with self._lock:
+            position = max(self._observed, len(self.history))
+            if self._pushes_down():
+                # The store keeps results for its queries; pass the computed one
+                self.history.append(calculation, result)
+            else:
+                self.history.append(calculation)
+            if self._observed == position:
+                self._observe(position, calculation, result)
+
+    def _observe(self, position: int, calculation: Calculation,
+                 result: Optional[float]) -> None:
+        """Feed a calculation stored at position and its result into the indexes and statistics"""
+        if not self._pushes_down():
+            self._index.add(position, calculation, result)
+        self._stats.add(calculation, result)
+        self._observed = position + 1
+        # Positions before cold were evicted or spilled to disk. They are pruned
+        # once they outnumber the entries in memory, so a bounded store keeps a
+        # bounded index at amortized constant cost per append
+        spilled = getattr(self.history, 'spilled', 0)
+        cold = self._observed - len(self.history) + spilled
+        if cold - self._pruned > len(self.history) - spilled:
+            self._index.discard_before(cold)
+            self._pruned = cold
+
+    def _pushes_down(self) -> bool:
+        """Check whether the store answers queries itself, e.g. in SQL"""
+        return getattr(self.history, 'supports_queries', False)
+
+    def _sync(self) -> int:
+        """
+        Observe entries not yet covered, e.g. from a preloaded store
+        Returns the number of observed positions evicted from the store
+        """
+        start = self._observed
+        if len(self.history) > start:
+            for position, calculation in enumerate(HistoryView(self.history, start), start):
+                self._observe(position, calculation, _safe_result(calculation))
+        return self._observed - len(self.history)
+
+    def _scan_pruned(self, evicted: int) -> Iterator[Tuple[int, Calculation]]:
+        """
+        Iterate (position, calculation) over entries pruned from the indexes but
+        still held by the store, i.e. spilled to disk, reading them sequentially
+        """
+        stop = self._pruned - evicted
+        if stop <= 0:
+            return iter(())
+        return enumerate(HistoryView(self.history, 0, stop), evicted)
 
-    @classmethod
-    def get_history(cls) -> List[Calculation]:
-        """Get the complete calculation history"""
-        return cls.history.copy()
+    def _resolve(self, positions: Iterable[int], evicted: int) -> List[Calculation]:
+        """Map indexed positions to calculations still held by the store"""
+        history = self.history
+        return [history[position - evicted] for position in positions
+                if position >= evicted]
 
-    @classmethod
-    def clear_history(cls) -> None:
-        """Clear the calculation history"""
-        cls.history.clear()
+    def get_history(self, offset: int = 0, limit: Optional[int] = None) -> HistoryView:
+        """
+        Get a read-only view of the history starting at offset with at most limit entries
+        The view does not copy the store; use snapshot() for an independent list
+        """
+        stop = None if limit is None else offset + limit
+        with self._lock:
+            return HistoryView(self.history, offset, stop, lock=self._lock)
 
-    @classmethod
-    def get_latest(cls) -> Optional[Calculation]:
+    def snapshot(self) -> List[Calculation]:
+        """Get a copy of the complete calculation history"""
+        with self._lock:
+            return list(self.history)
+
+    def page(self, number: int, size: int) -> HistoryView:
+        """Get a view of the zero-based page number of the given size"""
+        return self.get_history(number * size, size)
+
+    def tail(self, count: int) -> HistoryView:
+        """Get a view of the most recent count calculations"""
+        with self._lock:
+            return HistoryView(self.history, max(len(self.history) - count, 0),
+                               lock=self._lock)
+
+    def iter_history(self, reverse: bool = False) -> Iterator[Calculation]:
+        """Iterate the history oldest first, or newest first when reverse is True"""
+        view = self.get_history()
+        return reversed(view) if reverse else iter(view)
+
+    def clear_history(self) -> None:
+        """Clear the calculation history, its indexes and statistics"""
+        with self._lock:
+            self.history.clear()
+            self._reset_derived()
+
+    def get_latest(self) -> Optional[Calculation]:
         """Get the most recent calculation or None if history is empty"""
-        if cls.history:
-            return cls.history[-1]
-        return None
+        with self._lock:
+            if self.history:
+                return self.history[-1]
+            return None
     
-    @classmethod
-    def find_by_operation(cls, operation: str) -> List[Calculation]:
+    def find_by_operation(self, operation: str) -> List[Calculation]:
         """Find all calculations with the specified operation"""
-        return [calc for calc in cls.history if calc.operation == operation]
\ No newline at end of file
+        with self._lock:
+            if self._pushes_down():
+                return self.history.find_by_operation(operation)
+            evicted = self._sync()
+            spilled = [calculation for _, calculation in self._scan_pruned(evicted)
+                       if calculation.operation == operation]
+            return spilled + self._resolve(self._index.positions_for_operation(operation),
+                                           evicted)
+
+    def find_by_operand(self, value: float) -> List[Calculation]:
+        """Find all calculations involving the given value as an operand"""
+        with self._lock:
+            if self._pushes_down():
+                return self.history.find_by_operand(value)
+            evicted = self._sync()
+            spilled = [calculation for _, calculation in self._scan_pruned(evicted)
+                       if value in calculation.operands]
+            return spilled + self._resolve(self._index.positions_for_operand(value), evicted)
+
+    def find_by_result_range(self, low: float, high: float) -> List[Calculation]:
+        """Find all calculations whose result lies between low and high, ordered by result"""
+        with self._lock:
+            if self._pushes_down():
+                return self.history.find_by_result_range(low, high)
+            evicted = self._sync()
+            matches = []
+            for position, calculation in self._scan_pruned(evicted):
+                result = _safe_result(calculation)
+                if isinstance(result, (int, float)) and low <= result <= high:
+                    matches.append((result, position, calculation))
+            indexed = self._index.entries_for_result_range(low, high)
+            if not matches:
+                return self._resolve((position for _, position in indexed), evicted)
+            history = self.history
+            matches.extend((result, position, history[position - evicted])
+                           for result, position in indexed if position >= evicted)
+            # Spilled matches precede the indexed ones, so order by result, then position
+            matches.sort(key=lambda match: match[:2])
+            return [calculation for _, _, calculation in matches]
+
+    def get_stats(self) -> Dict:
+        """
+        Get running statistics over the history: total count, counts per operation,
+        and count/mean/variance/min/max of results and operands
+        """
+        with self._lock:
+            self._sync()
+            return self._stats.summary()
+
+# Process-wide history used when no session is given
+Calculations = CalculationHistory(create_history_store())
@@ -1,8 +1,17 @@
 """
 Calculator module providing static methods for arithmetic operations
 """
-from typing import TypeVar, Generic
+import math
+from array import array
+from numbers import Number
+from typing import TypeVar, Generic, Sequence, Tuple
 from calculator.calculation import Calculation
+from calculator.operations import get_operation
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - NumPy is an optional dependency
+    np = None
 
 T = TypeVar('T', int, float)
 
@@ -38,4 +47,98 @@ class Calculator:
     @staticmethod
     def create_calculation(a: T, b: T, operation: str) -> Calculation:
         """Create and return a Calculation object"""
-        return Calculation(a, b, operation)
\ No newline at end of file
+        return Calculation(a, b, operation)
+
+    @staticmethod
+    def perform(operation: str, a: T, b: T) -> T:
+        """
+        Perform a registered operation on two operands
+        Raises ValueError for unsupported operations
+        """
+        func = get_operation(operation)
+        if func is None:
+            raise ValueError(f"Unsupported operation: {operation}")
+        return func(a, b)
+
+    @staticmethod
+    def batch(operation: str, a_values, b_values, mask: bool = False):
+        """
+        Apply an operation element-wise over whole columns of operands
+        Accepts sequences, array.array or NumPy arrays; scalars are broadcast.
+        Division by zero yields NaN for that element instead of aborting the batch.
+        With mask=True a (results, zero_mask) tuple is returned.
+        Raises ValueError for unsupported operations or mismatched lengths
+        """
+        func = get_operation(operation)
+        if func is None:
+            raise ValueError(f"Unsupported operation: {operation}")
+
+        if np is not None and (isinstance(a_values, np.ndarray) or
+                               isinstance(b_values, np.ndarray)):
+            return _batch_numpy(operation, func, a_values, b_values, mask)
+
+        a_column, b_column, size = _broadcast(a_values, b_values)
+        if operation == 'divide':
+            nan = math.nan
+            results = [x / y if y else nan for x, y in zip(a_column, b_column)]
+        else:
+            results = list(map(func, a_column, b_column))
+
+        # Preserve the compact representation when callers pass array.array
+        if isinstance(a_values, array) or isinstance(b_values, array):
+            results = array('d', results)
+
+        if not mask:
+            return results
+        if operation == 'divide':
+            zero_mask = [y == 0 for y in b_column]
+        else:
+            zero_mask = [False] * size
+        return results, zero_mask
+
+
+def _broadcast(a_values, b_values) -> Tuple[Sequence, Sequence, int]:
+    """
+    Broadcast scalar operands against sequence operands
+    Raises ValueError if two sequences have different lengths
+    """
+    a_scalar = isinstance(a_values, Number)
+    b_scalar = isinstance(b_values, Number)
+
+    if a_scalar and b_scalar:
+        return [a_values], [b_values], 1
+    if a_scalar:
+        size = len(b_values)
+        return [a_values] * size, b_values, size
+    if b_scalar:
+        size = len(a_values)
+        return a_values, [b_values] * size, size
+    if len(a_values) != len(b_values):
+        raise ValueError(
+            f"Operand length mismatch: {len(a_values)} != {len(b_values)}"
+        )
+    return a_values, b_values, len(a_values)
+
+
+def _batch_numpy(operation: str, func, a_values, b_values, mask: bool):
+    """Vectorized NumPy implementation of Calculator.batch"""
+    a_column = np.asarray(a_values, dtype=float)
+    b_column = np.asarray(b_values, dtype=float)
+    a_column, b_column = np.broadcast_arrays(a_column, b_column)
+
+    if operation == 'divide':
+        zero_mask = b_column == 0
+        results = np.full(a_column.shape, np.nan)
+        np.divide(a_column, b_column, out=results, where=~zero_mask)
+    else:
+        ufuncs = {'add': np.add, 'subtract': np.subtract, 'multiply': np.multiply}
+        ufunc = ufuncs.get(operation)
+        if ufunc is None:
+            # Plugin operations without a native ufunc are applied element-wise
+            ufunc = np.frompyfunc(func, 2, 1)
+        results = np.asarray(ufunc(a_column, b_column), dtype=float)
+        zero_mask = np.zeros(a_column.shape, dtype=bool)
+
+    if mask:
+        return results, zero_mask
+    return results
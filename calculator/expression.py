@@ -0,0 +1,259 @@
+"""
+Expression module compiling infix formulas such as (a + b) * c / d into closures
+"""
+import re
+from typing import Any, Callable, Dict, FrozenSet, List, Mapping, Optional, Tuple
+from calculator.operations import get_operation
+from calculator.reduction import reduce_operands
+from calculator.result_cache import ResultCache, MISSING
+
+Evaluator = Callable[[Mapping[str, float]], float]
+
+# Infix operators: symbol -> (operation name, binding power, right associative)
+BINARY_OPERATORS: Dict[str, Tuple[str, int, bool]] = {
+    '+': ('add', 10, False),
+    '-': ('subtract', 10, False),
+    '*': ('multiply', 20, False),
+    '/': ('divide', 20, False),
+    '^': ('power', 40, True),
+}
+# Unary minus binds looser than ^, so -2^2 is -(2^2)
+PREFIX_BINDING = 30
+
+_TOKEN = re.compile(r"""
+    \s*(?:
+        (?P<number>(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)
+      | (?P<name>[A-Za-z_]\w*)
+      | (?P<symbol>[-+*/^(),])
+    )""", re.VERBOSE)
+
+class ExpressionError(ValueError):
+    """Raised for malformed expressions, unknown functions and unbound variables"""
+
+def tokenize(text: str) -> List[Tuple[str, str, int]]:
+    """
+    Split an expression into (kind, text, position) tokens
+    Raises ExpressionError for characters that are not part of the grammar
+    """
+    tokens = []
+    position = 0
+    end = len(text.rstrip())
+    while position < end:
+        match = _TOKEN.match(text, position)
+        if match is None:
+            offset = len(text) - len(text[position:].lstrip())
+            raise ExpressionError(f"Unexpected character {text[offset]!r} at position {offset}")
+        kind = match.lastgroup
+        tokens.append((kind, match.group(kind), match.start(kind)))
+        position = match.end()
+    tokens.append(('end', '', len(text)))
+    return tokens
+
+
+class _Node:
+    """Compiled subexpression: an evaluator plus its value when it is constant"""
+    __slots__ = ('evaluate', 'value')
+
+    def __init__(self, evaluate: Evaluator, value: Any = MISSING):
+        """Initialize the node"""
+        self.evaluate = evaluate
+        self.value = value
+
+
+def _constant(value: float) -> _Node:
+    """Compile a constant"""
+    return _Node(lambda env: value, value)
+
+def _apply(func: Callable[[float, float], float], left: _Node, right: _Node) -> _Node:
+    """Compile a binary operation, folding it if both operands are constant"""
+    if left.value is not MISSING and right.value is not MISSING:
+        try:
+            return _constant(func(left.value, right.value))
+        except (ValueError, ArithmeticError):
+            # Errors such as 1/0 are reported when the expression is evaluated
+            pass
+    left_eval, right_eval = left.evaluate, right.evaluate
+    return _Node(lambda env: func(left_eval(env), right_eval(env)))
+
+def _reduce(name: str, func: Callable[[float, float], float], args: List[_Node]) -> _Node:
+    """
+    Compile an operation over three or more arguments with reduce_operands, as the
+    commands do, folding it if every argument is constant
+    """
+    if all(arg.value is not MISSING for arg in args):
+        try:
+            return _constant(reduce_operands(name, func, [arg.value for arg in args]))
+        except (ValueError, ArithmeticError):
+            pass
+    evaluators = [arg.evaluate for arg in args]
+    return _Node(lambda env: reduce_operands(name, func,
+                                             [evaluate(env) for evaluate in evaluators]))
+
+
+class _Parser:
+    """Pratt parser turning a token list into a compiled _Node"""
+
+    def __init__(self, text: str):
+        """Tokenize the expression text"""
+        self.text = text
+        self.tokens = tokenize(text)
+        self.index = 0
+        self.variables: set = set()
+
+    def _next(self) -> Tuple[str, str, int]:
+        """Consume and return the current token"""
+        token = self.tokens[self.index]
+        self.index += 1
+        return token
+
+    def _peek(self) -> Tuple[str, str, int]:
+        """Return the current token without consuming it"""
+        return self.tokens[self.index]
+
+    def _expect(self, symbol: str) -> None:
+        """Consume a symbol or raise ExpressionError"""
+        kind, text, position = self._next()
+        if text != symbol or kind != 'symbol':
+            raise self._error(text, position, f"expected {symbol!r}")
+
+    @staticmethod
+    def _error(text: str, position: int, expected: str = '') -> ExpressionError:
+        """Build an error for an unexpected token"""
+        found = repr(text) if text else "end of expression"
+        detail = f", {expected}" if expected else ''
+        return ExpressionError(f"Unexpected {found} at position {position}{detail}")
+
+    @staticmethod
+    def _operation(name: str, symbol: str = '') -> Callable[[float, float], float]:
+        """Resolve a registered operation or raise ExpressionError"""
+        func = get_operation(name)
+        if func is None:
+            if symbol:
+                raise ExpressionError(f"Operator {symbol!r} requires the '{name}' operation")
+            raise ExpressionError(f"Unknown function: {name}")
+        return func
+
+    def parse(self) -> _Node:
+        """Parse the whole expression"""
+        node = self.expression(0)
+        kind, text, position = self._peek()
+        if kind != 'end':
+            raise self._error(text, position)
+        return node
+
+    def expression(self, min_binding: int) -> _Node:
+        """Parse operators binding tighter than min_binding"""
+        left = self.prefix()
+        while True:
+            kind, symbol, _ = self._peek()
+            operator = BINARY_OPERATORS.get(symbol) if kind == 'symbol' else None
+            if operator is None:
+                return left
+            name, binding, right_assoc = operator
+            if binding <= min_binding:
+                return left
+            self._next()
+            func = self._operation(name, symbol)
+            right = self.expression(binding - 1 if right_assoc else binding)
+            left = _apply(func, left, right)
+
+    def prefix(self) -> _Node:
+        """Parse a number, variable, call, parenthesized or negated operand"""
+        kind, text, position = self._next()
+        if kind == 'number':
+            return _constant(float(text))
+        if kind == 'name':
+            if self._peek()[1] == '(':
+                return self.call(text)
+            self.variables.add(text)
+            return _Node(lambda env: env[text])
+        if text == '(':
+            node = self.expression(0)
+            self._expect(')')
+            return node
+        if text in ('-', '+'):
+            operand = self.expression(PREFIX_BINDING)
+            if text == '+':
+                return operand
+            if operand.value is not MISSING:
+                return _constant(-operand.value)
+            evaluate = operand.evaluate
+            return _Node(lambda env: -evaluate(env))
+        raise self._error(text, position)
+
+    def call(self, name: str) -> _Node:
+        """Parse a call to a registered operation, reduced over its arguments like the commands"""
+        func = self._operation(name)
+        self._expect('(')
+        args = [self.expression(0)]
+        while self._peek()[1] == ',':
+            self._next()
+            args.append(self.expression(0))
+        self._expect(')')
+        if len(args) < 2:
+            raise ExpressionError(f"Function {name} requires at least 2 arguments")
+        if len(args) == 2:
+            return _apply(func, args[0], args[1])
+        return _reduce(name, func, args)
+
+
+class CompiledExpression:
+    """
+    CompiledExpression class holding an expression compiled to nested closures.
+    Evaluating it again with new variable bindings does not reparse the text.
+    """
+    __slots__ = ('text', 'variables', '_evaluate')
+
+    def __init__(self, text: str):
+        """
+        Parse and compile the expression text
+        Raises ExpressionError if the text is not a valid expression
+        """
+        parser = _Parser(text)
+        node = parser.parse()
+        self.text = text
+        self.variables: FrozenSet[str] = frozenset(parser.variables)
+        self._evaluate = node.evaluate
+
+    def evaluate(self, variables: Optional[Mapping[str, float]] = None) -> float:
+        """
+        Evaluate the expression with the given variable bindings
+        Raises ExpressionError for unbound variables; arithmetic errors propagate
+        """
+        env = variables if variables is not None else {}
+        try:
+            return self._evaluate(env)
+        except KeyError:
+            missing = sorted(self.variables.difference(env))
+            if not missing:
+                raise
+            raise ExpressionError(f"Unknown variable: {', '.join(missing)}") from None
+
+    def __repr__(self) -> str:
+        """Return string representation of the compiled expression"""
+        return f"CompiledExpression({self.text!r})"
+
+
+class ExpressionEngine:
+    """
+    ExpressionEngine class compiling expressions on first use and keeping the
+    compiled forms in a bounded LRU cache keyed by expression text
+    """
+    def __init__(self, cache_size: int = 256):
+        """Initialize the engine with a cache of cache_size compiled expressions (0 disables it)"""
+        self.cache = ResultCache(cache_size) if cache_size > 0 else None
+
+    def compile(self, text: str) -> CompiledExpression:
+        """Return the compiled form of an expression, compiling it if not cached"""
+        text = text.strip()
+        if self.cache is None:
+            return CompiledExpression(text)
+        compiled = self.cache.get(text)
+        if compiled is MISSING:
+            compiled = CompiledExpression(text)
+            self.cache.put(text, compiled)
+        return compiled
+
+    def evaluate(self, text: str, variables: Optional[Mapping[str, float]] = None) -> float:
+        """Compile (or reuse) an expression and evaluate it with the given bindings"""
+        return self.compile(text).evaluate(variables)
@@ -0,0 +1,373 @@
+"""
+History module providing compact storage backends for calculation history
+"""
+import os
+from array import array
+from contextlib import nullcontext
+from itertools import islice
+from typing import Dict, Iterator, List, Optional, Tuple
+from calculator.calculation import Calculation
+
+class HistoryChangedError(RuntimeError):
+    """Raised when a view is read after the entries it covers were cleared or evicted"""
+
+
+class ListHistory(list):
+    """
+    In-memory history store: a list that counts how often it was cleared,
+    so views created before a clear can detect it
+    """
+    generation = 0
+
+    def clear(self) -> None:
+        """Remove all entries"""
+        super().clear()
+        self.generation += 1
+
+
+class ColumnarHistory:
+    """
+    Columnar history store keeping operands in parallel double arrays and
+    operations as interned one-byte codes. Operands beyond the second are
+    rare and kept in a sparse mapping by position. Calculation objects are only
+    materialized when entries are read.
+    """
+    MAX_OPERATIONS = 256
+
+    def __init__(self):
+        """Initialize empty operand and operation-code columns"""
+        self._a = array('d')
+        self._b = array('d')
+        self._codes = array('B')
+        self._rest: Dict[int, Tuple[float, ...]] = {}
+        self._operations: List[str] = []
+        self._operation_codes: Dict[str, int] = {}
+        # Incremented by clear() so views can detect it
+        self.generation = 0
+
+    def _intern(self, operation: str) -> int:
+        """
+        Return the code for an operation, assigning a new one if needed
+        Raises ValueError if the code column is full
+        """
+        code = self._operation_codes.get(operation)
+        if code is None:
+            if len(self._operations) >= self.MAX_OPERATIONS:
+                raise ValueError("Too many distinct operations for columnar history")
+            code = len(self._operations)
+            self._operations.append(operation)
+            self._operation_codes[operation] = code
+        return code
+
+    def _materialize(self, index: int) -> Calculation:
+        """Build the Calculation stored at the given position"""
+        return Calculation(self._a[index], self._b[index],
+                           self._operations[self._codes[index]], self._rest.get(index, ()))
+
+    def append(self, calculation: Calculation) -> None:
+        """Append a calculation to the columns"""
+        code = self._intern(calculation.operation)
+        if calculation.rest:
+            self._rest[len(self._codes)] = calculation.rest
+        self._a.append(calculation.a)
+        self._b.append(calculation.b)
+        self._codes.append(code)
+
+    def clear(self) -> None:
+        """Remove all entries from the columns"""
+        del self._a[:]
+        del self._b[:]
+        del self._codes[:]
+        self._rest.clear()
+        self._operations.clear()
+        self._operation_codes.clear()
+        self.generation += 1
+
+    def find_by_operation(self, operation: str) -> List[Calculation]:
+        """Find all calculations with the specified operation"""
+        code = self._operation_codes.get(operation)
+        if code is None:
+            return []
+        return [self._materialize(i) for i, value in enumerate(self._codes) if value == code]
+
+    @property
+    def nbytes(self) -> int:
+        """Return the number of bytes used by the column buffers"""
+        return sum(column.itemsize * len(column) for column in (self._a, self._b, self._codes))
+
+    def __len__(self) -> int:
+        """Return the number of stored calculations"""
+        return len(self._codes)
+
+    def __getitem__(self, index):
+        """Return the calculation at an index, or a list for a slice"""
+        if isinstance(index, slice):
+            return [self._materialize(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("history index out of range")
+        return self._materialize(index)
+
+    def __iter__(self) -> Iterator[Calculation]:
+        """Lazily materialize calculations in insertion order"""
+        for i in range(len(self)):
+            yield self._materialize(i)
+
+
+class RingBufferHistory:
+    """
+    Bounded history store keeping the newest entries in a fixed-size ring buffer.
+    Evicted entries are optionally appended to a spill file on disk and remain
+    visible through indexing and iteration. The byte offset of every
+    SPILL_INDEX_STRIDE-th spilled entry is kept, so reading a spilled entry
+    seeks close to it instead of scanning the file from the start.
+    """
+    SPILL_INDEX_STRIDE = 64
+
+    def __init__(self, capacity: int, spill_path: Optional[str] = None):
+        """
+        Initialize the ring buffer with the given capacity and optional spill file
+        Raises ValueError if capacity is not positive
+        """
+        if capacity <= 0:
+            raise ValueError("History capacity must be positive")
+        self.capacity = capacity
+        self.spill_path = spill_path
+        self._buffer: List[Optional[Calculation]] = [None] * capacity
+        self._start = 0
+        self._size = 0
+        self._spill_file = None
+        self._spill_reader = None
+        # The spill file is an append-only audit log; bytes written before this
+        # store was created or last cleared are not part of its history
+        self._spill_end = self._spill_size()
+        self._checkpoints = array('q')
+        self._spilled = 0
+        # Entries dropped without a spill file, which shift positions toward the
+        # front, and the number of clears; views use both to locate their entries
+        self.evicted = 0
+        self.generation = 0
+
+    def _spill_size(self) -> int:
+        """Return the current size of the spill file in bytes"""
+        if self.spill_path is None:
+            return 0
+        try:
+            return os.path.getsize(self.spill_path)
+        except FileNotFoundError:
+            return 0
+
+    def _flush(self) -> None:
+        """Flush buffered spill writes so they are visible to readers"""
+        if self._spill_file is not None:
+            self._spill_file.flush()
+
+    def _spill(self, calculation: Calculation) -> None:
+        """Append an evicted calculation to the spill file"""
+        if self._spill_file is None:
+            self._spill_file = open(self.spill_path, 'ab')
+        # Lines are 'a,b,operation' followed by any further operands
+        fields = [repr(calculation.a), repr(calculation.b), calculation.operation]
+        fields.extend(map(repr, calculation.rest))
+        line = (",".join(fields) + "\n").encode('utf-8')
+        if self._spilled % self.SPILL_INDEX_STRIDE == 0:
+            self._checkpoints.append(self._spill_end)
+        self._spill_file.write(line)
+        self._spill_end += len(line)
+        self._spilled += 1
+
+    @staticmethod
+    def _parse_spilled(line: bytes) -> Calculation:
+        """Decode a spill file line"""
+        a, b, operation, *rest = line.decode('utf-8').rstrip('\n').split(',')
+        return Calculation(float(a), float(b), operation, [float(x) for x in rest])
+
+    def _seek_spilled(self, spill, position: int) -> None:
+        """Position an open spill file at the line of a spilled entry"""
+        checkpoint = position // self.SPILL_INDEX_STRIDE
+        spill.seek(self._checkpoints[checkpoint])
+        for _ in range(position - checkpoint * self.SPILL_INDEX_STRIDE):
+            spill.readline()
+
+    def _read_spilled(self, position: int) -> Calculation:
+        """Read one spilled calculation"""
+        self._flush()
+        if self._spill_reader is None:
+            self._spill_reader = open(self.spill_path, 'rb')
+        self._seek_spilled(self._spill_reader, position)
+        return self._parse_spilled(self._spill_reader.readline())
+
+    def _iter_spilled(self, start: int, stop: int) -> Iterator[Calculation]:
+        """Read spilled calculations in [start, stop) from disk sequentially"""
+        if start >= stop:
+            return
+        self._flush()
+        # A separate handle keeps the position while entries are read elsewhere
+        with open(self.spill_path, 'rb') as spill:
+            self._seek_spilled(spill, start)
+            for line in islice(spill, stop - start):
+                yield self._parse_spilled(line)
+
+    def append(self, calculation: Calculation) -> None:
+        """Append a calculation, evicting the oldest entry when full"""
+        if self._size < self.capacity:
+            self._buffer[(self._start + self._size) % self.capacity] = calculation
+            self._size += 1
+            return
+        if self.spill_path is None:
+            self.evicted += 1
+        else:
+            self._spill(self._buffer[self._start])
+        self._buffer[self._start] = calculation
+        self._start = (self._start + 1) % self.capacity
+
+    def clear(self) -> None:
+        """Remove all entries and close the spill file, which is kept as an audit log"""
+        self.close()
+        self._buffer = [None] * self.capacity
+        self._start = 0
+        self._size = 0
+        self._checkpoints = array('q')
+        self._spilled = 0
+        self.evicted = 0
+        self.generation += 1
+
+    def close(self) -> None:
+        """Flush and close the spill file; it is reopened by the next spill or read"""
+        if self._spill_file is not None:
+            self._spill_file.close()
+            self._spill_file = None
+        if self._spill_reader is not None:
+            self._spill_reader.close()
+            self._spill_reader = None
+
+    @property
+    def spilled(self) -> int:
+        """Return the number of entries held in the spill file rather than in memory"""
+        return self._spilled
+
+    def __len__(self) -> int:
+        """Return the number of entries across the buffer and spill file"""
+        return self._spilled + self._size
+
+    def __getitem__(self, index):
+        """Return the calculation at an index, or a list for a slice"""
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step == 1:
+                return list(self.iter_range(start, stop))
+            return [self[i] for i in range(start, stop, step)]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("history index out of range")
+        if index < self._spilled:
+            return self._read_spilled(index)
+        return self._buffer[(self._start + index - self._spilled) % self.capacity]
+
+    def __iter__(self) -> Iterator[Calculation]:
+        """Iterate spilled entries from disk followed by the buffered entries"""
+        return self.iter_range(0, len(self))
+
+    def iter_range(self, start: int, stop: int) -> Iterator[Calculation]:
+        """Iterate entries in [start, stop) reading the spill file sequentially"""
+        spilled = self._spilled
+        yield from self._iter_spilled(start, min(stop, spilled))
+        for i in range(max(start - spilled, 0), max(stop - spilled, 0)):
+            yield self._buffer[(self._start + i) % self.capacity]
+
+
+class HistoryView:
+    """
+    Read-only view over a range of a history store that does not copy entries.
+    Bounds are fixed when the view is created, so calculations appended while
+    iterating are not visited. Entries are read in chunks; if a bounded store
+    evicted entries since the view was created, positions are shifted to find
+    them, and reading entries that were evicted or cleared raises
+    HistoryChangedError. A view given the lock guarding its store holds it
+    while reading each chunk, so reads never interleave with appends.
+    """
+    READ_CHUNK = 256
+
+    def __init__(self, store, start: int = 0, stop: Optional[int] = None, step: int = 1,
+                 lock=None):
+        """Initialize the view over store[start:stop:step]"""
+        self._store = store
+        self._lock = lock if lock is not None else nullcontext()
+        with self._lock:
+            self._positions = range(len(store))[start:stop:step]
+            self._generation = getattr(store, 'generation', 0)
+            self._evicted = getattr(store, 'evicted', 0)
+
+    def _narrow(self, positions: range) -> 'HistoryView':
+        """Return a view over some of this view's positions"""
+        view = HistoryView(self._store, 0, 0)
+        view._lock = self._lock
+        view._positions = positions
+        view._generation = self._generation
+        view._evicted = self._evicted
+        return view
+
+    def _index(self, position: int) -> int:
+        """
+        Translate a position of the view to the current store index
+        Raises HistoryChangedError if the entry is no longer in the store
+        """
+        store = self._store
+        if getattr(store, 'generation', 0) != self._generation:
+            raise HistoryChangedError("History was cleared after the view was created")
+        index = position - (getattr(store, 'evicted', 0) - self._evicted)
+        if index < 0:
+            raise HistoryChangedError("History entries in the view were evicted")
+        if index >= len(store):
+            raise HistoryChangedError("History was cleared after the view was created")
+        return index
+
+    def _read(self, positions: range) -> List[Calculation]:
+        """Read the entries at some of the view's positions"""
+        if not positions:
+            return []
+        store = self._store
+        iter_range = getattr(store, 'iter_range', None)
+        with self._lock:
+            if iter_range is not None and positions.step == 1:
+                # Stores backed by files iterate sequentially instead of seeking per entry
+                start = self._index(positions[0])
+                stop = self._index(positions[-1]) + 1
+                return list(iter_range(start, stop))
+            return [store[self._index(position)] for position in positions]
+
+    def __len__(self) -> int:
+        """Return the number of entries in the view"""
+        return len(self._positions)
+
+    def __getitem__(self, index):
+        """Return the calculation at an index, or a narrower view for a slice"""
+        if isinstance(index, slice):
+            return self._narrow(self._positions[index])
+        with self._lock:
+            return self._store[self._index(self._positions[index])]
+
+    def __iter__(self) -> Iterator[Calculation]:
+        """Iterate entries in the view"""
+        positions = self._positions
+        for start in range(0, len(positions), self.READ_CHUNK):
+            yield from self._read(positions[start:start + self.READ_CHUNK])
+
+    def __reversed__(self) -> Iterator[Calculation]:
+        """Iterate entries in the view from newest to oldest"""
+        positions = self._positions
+        for stop in range(len(positions), 0, -self.READ_CHUNK):
+            chunk = self._read(positions[max(stop - self.READ_CHUNK, 0):stop])
+            yield from reversed(chunk)
+
+    def __eq__(self, other) -> bool:
+        """Compare the viewed entries with another view or list"""
+        if isinstance(other, (HistoryView, list)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        """Return string representation of the view"""
+        return f"HistoryView({list(self)!r})"
@@ -0,0 +1,81 @@
+"""
+History index module providing incremental secondary indexes over calculation history
+"""
+import math
+from bisect import bisect_left, bisect_right
+from typing import Dict, List, Optional, Tuple
+from calculator.calculation import Calculation
+
+class HistoryIndex:
+    """
+    Secondary indexes mapping operations, operands and results to history positions.
+    Positions are absolute insertion positions, so indexes are updated incrementally
+    as calculations are appended. Results are appended unsorted and sorted on the
+    next range query, which merges the new entries in a single pass.
+    """
+    def __init__(self):
+        """Initialize empty indexes"""
+        self._by_operation: Dict[str, List[int]] = {}
+        self._by_operand: Dict[float, List[int]] = {}
+        # (result, position) pairs, sorted by result up to any unsorted tail
+        self._results: List[Tuple[float, int]] = []
+        self._results_sorted = True
+
+    def add(self, position: int, calculation: Calculation, result: Optional[float]) -> None:
+        """Index the calculation stored at the given position and its result (None if it failed)"""
+        self._by_operation.setdefault(calculation.operation, []).append(position)
+
+        if calculation.rest:
+            for operand in set(calculation.operands):
+                self._by_operand.setdefault(operand, []).append(position)
+        else:
+            self._by_operand.setdefault(calculation.a, []).append(position)
+            if calculation.b != calculation.a:
+                self._by_operand.setdefault(calculation.b, []).append(position)
+
+        if isinstance(result, (int, float)) and not math.isnan(result):
+            entry = (result, position)
+            if self._results and entry < self._results[-1]:
+                self._results_sorted = False
+            self._results.append(entry)
+
+    def discard_before(self, position: int) -> None:
+        """Drop positions before position, e.g. entries evicted from a bounded store"""
+        for index in (self._by_operation, self._by_operand):
+            for key in list(index):
+                positions = index[key]
+                cut = bisect_left(positions, position)
+                if cut == len(positions):
+                    del index[key]
+                elif cut:
+                    del positions[:cut]
+        self._results = [entry for entry in self._results if entry[1] >= position]
+
+    def clear(self) -> None:
+        """Reset all indexes"""
+        self._by_operation.clear()
+        self._by_operand.clear()
+        self._results.clear()
+        self._results_sorted = True
+
+    def positions_for_operation(self, operation: str) -> List[int]:
+        """Return positions of calculations with the given operation"""
+        return self._by_operation.get(operation, [])
+
+    def positions_for_operand(self, value: float) -> List[int]:
+        """Return positions of calculations using the given value as an operand"""
+        return self._by_operand.get(value, [])
+
+    def entries_for_result_range(self, low: float, high: float) -> List[Tuple[float, int]]:
+        """Return (result, position) pairs with the result in [low, high], ordered by result"""
+        if not self._results_sorted:
+            # Equal results keep insertion order because positions break ties
+            self._results.sort()
+            self._results_sorted = True
+        start = bisect_left(self._results, (low,))
+        stop = bisect_right(self._results, (high, math.inf))
+        return self._results[start:stop]
+
+    def positions_for_result_range(self, low: float, high: float) -> List[int]:
+        """Return positions of calculations whose result is in [low, high], ordered by result"""
+        return [position for _, position in self.entries_for_result_range(low, high)]
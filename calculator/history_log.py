@@ -0,0 +1,236 @@
+"""
+History log module providing a persistent, memory-mapped calculation history
+"""
+import mmap
+import os
+import struct
+from typing import Dict, Iterator, List, Optional, Tuple
+from calculator.calculation import Calculation
+from calculator.history import HistoryChangedError
+
+# File layout: an 8-byte magic header followed by fixed-size records
+MAGIC = b'CALCLOG1'
+RECORD = struct.Struct('<dd16s')
+# Operands beyond the second are kept in a text sidecar of 'position,x,y,...' lines
+REST_SUFFIX = '.rest'
+FSYNC_POLICIES = ('always', 'batch', 'never')
+# Records decoded per step of iter_range; each batch is copied out of the mapping
+ITER_BATCH = 1024
+
+class MappedHistory:
+    """
+    Persistent history store backed by an append-only log of fixed-size binary
+    records. Existing records are memory-mapped on open and decoded lazily, so
+    reloading a large history does not parse the file. New entries are buffered
+    and written in batches according to the fsync policy:
+    'always' writes and fsyncs every append, 'batch' fsyncs each written batch,
+    and 'never' leaves syncing to the operating system.
+    Records hold two operands; further operands of variadic calculations are
+    appended to a sidecar file and loaded into memory on open.
+    """
+    def __init__(self, path: str, fsync: str = 'batch', flush_every: int = 1024):
+        """
+        Open or create the log at path
+        Raises ValueError for an unknown fsync policy or a file that is not a history log
+        """
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"Unknown fsync policy: {fsync}")
+        self.path = path
+        self.fsync = fsync
+        self.flush_every = max(flush_every, 1)
+        self._pending: List[Calculation] = []
+        self._pending_records: List[bytes] = []
+        self._pending_rest: List[str] = []
+        self._map: Optional[mmap.mmap] = None
+        self._mapped = 0
+        # Incremented by clear() so views can detect it
+        self.generation = 0
+
+        self._file = open(path, 'a+b')
+        size = os.fstat(self._file.fileno()).st_size
+        if size == 0:
+            self._file.write(MAGIC)
+            self._file.flush()
+            size = len(MAGIC)
+        else:
+            self._file.seek(0)
+            if self._file.read(len(MAGIC)) != MAGIC:
+                self._file.close()
+                raise ValueError(f"Not a calculation history log: {path}")
+        self._persisted = (size - len(MAGIC)) // RECORD.size
+        if len(MAGIC) + self._persisted * RECORD.size != size:
+            # Drop a partially written trailing record from a crash, so records
+            # appended later start at a record boundary
+            self._file.truncate(len(MAGIC) + self._persisted * RECORD.size)
+        self.rest_path = path + REST_SUFFIX
+        self._rest_file = None
+        self._rest = self._load_rest()
+
+    def _load_rest(self) -> Dict[int, Tuple[float, ...]]:
+        """Read further operands of persisted records from the sidecar file"""
+        rest: Dict[int, Tuple[float, ...]] = {}
+        kept: List[str] = []
+        stale = False
+        try:
+            with open(self.rest_path, 'r', encoding='utf-8') as sidecar:
+                for line in sidecar:
+                    position, *operands = line.rstrip('\n').split(',')
+                    # The sidecar is written first, so it may run ahead of the log after a crash
+                    if operands and int(position) < self._persisted:
+                        rest[int(position)] = tuple(float(x) for x in operands)
+                        kept.append(line)
+                    else:
+                        stale = True
+        except FileNotFoundError:
+            pass
+        if stale:
+            # Lines for records that were never written would otherwise attach
+            # to the records appended at those positions later
+            with open(self.rest_path, 'w', encoding='utf-8') as sidecar:
+                sidecar.writelines(kept)
+        return rest
+
+    @staticmethod
+    def _pack(calculation: Calculation) -> bytes:
+        """
+        Encode a calculation as a fixed-size record
+        Raises ValueError if the operation name does not fit the record
+        """
+        operation = calculation.operation.encode('utf-8')
+        if len(operation) > 16:
+            raise ValueError(f"Operation name too long for history log: {calculation.operation}")
+        return RECORD.pack(calculation.a, calculation.b, operation)
+
+    def _unpack(self, position: int, a: float, b: float, operation: bytes) -> Calculation:
+        """Decode the record fields stored at position into a Calculation"""
+        return Calculation(a, b, operation.rstrip(b'\0').decode('utf-8'),
+                           self._rest.get(position, ()))
+
+    def _ensure_mapped(self) -> None:
+        """Map the file again if records were written since the last mapping"""
+        if self._mapped == self._persisted:
+            return
+        self._unmap()
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._mapped = self._persisted
+
+    def _unmap(self) -> None:
+        """Close the current mapping; readers copy records out, so none is held elsewhere"""
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._mapped = 0
+
+    def append(self, calculation: Calculation) -> None:
+        """Buffer a calculation, writing the batch when it is full"""
+        # Encode eagerly so invalid entries are rejected before they are buffered
+        self._pending_records.append(self._pack(calculation))
+        if calculation.rest:
+            fields = [str(len(self))]
+            fields.extend(map(repr, calculation.rest))
+            self._pending_rest.append(",".join(fields) + "\n")
+        self._pending.append(calculation)
+        if self.fsync == 'always' or len(self._pending) >= self.flush_every:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write buffered calculations to the log and apply the fsync policy"""
+        if not self._pending:
+            return
+        if self._pending_rest:
+            if self._rest_file is None:
+                self._rest_file = open(self.rest_path, 'a', encoding='utf-8')
+            self._rest_file.write("".join(self._pending_rest))
+            self._rest_file.flush()
+            if self.fsync != 'never':
+                os.fsync(self._rest_file.fileno())
+            for position, calculation in enumerate(self._pending, self._persisted):
+                if calculation.rest:
+                    self._rest[position] = calculation.rest
+            self._pending_rest.clear()
+        self._file.seek(0, os.SEEK_END)
+        self._file.write(b''.join(self._pending_records))
+        self._file.flush()
+        if self.fsync != 'never':
+            os.fsync(self._file.fileno())
+        self._persisted += len(self._pending)
+        self._pending.clear()
+        self._pending_records.clear()
+
+    def clear(self) -> None:
+        """
+        Remove all entries from memory and from the log file
+        Iterators that are still open raise HistoryChangedError on their next step
+        """
+        self._pending.clear()
+        self._pending_records.clear()
+        self._pending_rest.clear()
+        self._rest.clear()
+        if self._rest_file is not None:
+            self._rest_file.close()
+            self._rest_file = None
+        if os.path.exists(self.rest_path):
+            os.truncate(self.rest_path, 0)
+        # Unmap before truncating: touching mapped pages past the end of the
+        # file would crash the process with SIGBUS
+        self._unmap()
+        self._file.truncate(len(MAGIC))
+        self._persisted = 0
+        self.generation += 1
+
+    def close(self) -> None:
+        """Flush pending entries and release the file and mapping"""
+        if self._file.closed:
+            return
+        self.flush()
+        self._unmap()
+        if self._rest_file is not None:
+            self._rest_file.close()
+            self._rest_file = None
+        self._file.close()
+
+    def __len__(self) -> int:
+        """Return the number of persisted and buffered entries"""
+        return self._persisted + len(self._pending)
+
+    def __getitem__(self, index):
+        """Return the calculation at an index, or a list for a slice"""
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("history index out of range")
+        if index >= self._persisted:
+            return self._pending[index - self._persisted]
+        self._ensure_mapped()
+        return self._unpack(index, *RECORD.unpack_from(self._map,
+                                                       len(MAGIC) + index * RECORD.size))
+
+    def __iter__(self) -> Iterator[Calculation]:
+        """Iterate persisted entries followed by buffered entries"""
+        return self.iter_range(0, len(self))
+
+    def iter_range(self, start: int, stop: int) -> Iterator[Calculation]:
+        """
+        Iterate entries in [start, stop) decoding mapped records in batches
+        Raises HistoryChangedError if the log is cleared while iterating
+        """
+        generation = self.generation
+        position = start
+        while position < stop:
+            if self.generation != generation:
+                raise HistoryChangedError("History log was cleared while iterating")
+            if position >= self._persisted:
+                yield self._pending[position - self._persisted]
+                position += 1
+                continue
+            self._ensure_mapped()
+            batch_stop = min(position + ITER_BATCH, stop, self._persisted)
+            # Slicing copies the records, so no view of the mapping outlives this step
+            data = self._map[len(MAGIC) + position * RECORD.size:
+                             len(MAGIC) + batch_stop * RECORD.size]
+            batch = [self._unpack(index, *fields)
+                     for index, fields in enumerate(RECORD.iter_unpack(data), position)]
+            position = batch_stop
+            yield from batch
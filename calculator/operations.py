@@ -0,0 +1,45 @@
+"""
+Operations module providing the shared registry of binary operations
+"""
+import operator
+from typing import Callable, Dict, Optional
+
+BinaryOperation = Callable[[float, float], float]
+
+def divide(a: float, b: float) -> float:
+    """
+    Divide a by b and return the result
+    Raises ZeroDivisionError if b is zero
+    """
+    if b == 0:
+        raise ZeroDivisionError("Cannot divide by zero")
+    return a / b
+
+# Module-level registry shared by Calculation, Calculator and the commands
+_OPERATIONS: Dict[str, BinaryOperation] = {
+    'add': operator.add,
+    'subtract': operator.sub,
+    'multiply': operator.mul,
+    'divide': divide,
+}
+
+def register_operation(name: str, func: BinaryOperation) -> None:
+    """
+    Register a binary operation under the given name
+    Raises TypeError if func is not callable
+    """
+    if not callable(func):
+        raise TypeError(f"Operation '{name}' must be callable")
+    _OPERATIONS[name] = func
+
+def unregister_operation(name: str) -> Optional[BinaryOperation]:
+    """Remove an operation from the registry and return it, or None if unknown"""
+    return _OPERATIONS.pop(name, None)
+
+def get_operation(name: str) -> Optional[BinaryOperation]:
+    """Get the function registered for an operation or None if unknown"""
+    return _OPERATIONS.get(name)
+
+def get_operations() -> Dict[str, BinaryOperation]:
+    """Get a copy of all registered operations"""
+    return dict(_OPERATIONS)
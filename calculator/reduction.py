@@ -0,0 +1,122 @@
+"""
+Reduction module applying an operation across many operands with fast, accurate paths
+"""
+import math
+import operator
+import sys
+from typing import Callable, Dict, Sequence
+
+BinaryOperation = Callable[[float, float], float]
+
+# Values are multiplied in chunks of this many before the running product is rescaled
+PRODUCT_CHUNK = 64
+# Products of integers wider than this cannot be represented as a finite float
+_MAX_PRODUCT_BITS = 1100
+
+def fold(func: BinaryOperation, operands: Sequence[float]) -> float:
+    """Apply func left to right over the operands"""
+    result = operands[0]
+    for operand in operands[1:]:
+        result = func(result, operand)
+    return result
+
+def reduce_sum(operands: Sequence[float]) -> float:
+    """
+    Return the correctly rounded sum of the operands
+    math.fsum tracks exact partial sums, so neither the length of the list
+    nor cancellation between large and small values adds rounding error
+    """
+    try:
+        total = math.fsum(operands)
+    except (ValueError, OverflowError):
+        # inf - inf and overflowing sums give nan or inf exactly as a fold does
+        return fold(operator.add, operands)
+    if total == 0.0 and all(math.copysign(1.0, operand) < 0 for operand in operands):
+        # fsum returns +0.0 for any zero sum, but adding only -0.0 gives -0.0
+        return -0.0
+    return total
+
+def _exact_integer_product(operands: Sequence[float]):
+    """
+    Return the correctly rounded product of integral operands, or None if it
+    would overflow or the operands are not all non-zero integers
+    """
+    try:
+        if 0.0 in operands or not all(map(float.is_integer, operands)):
+            return None
+    except TypeError:
+        # Non-float operands (e.g. ints from code) take the general path
+        return None
+    product = 1
+    for operand in operands:
+        product *= int(operand)
+        if product.bit_length() > _MAX_PRODUCT_BITS:
+            return None
+    try:
+        return float(product)
+    except OverflowError:
+        return None
+
+def _scaled_product(operands: Sequence[float]) -> float:
+    """
+    Multiply in chunks with math.prod, keeping the running product as a
+    mantissa and a separate binary exponent so that intermediate results
+    cannot overflow or underflow when the final product is representable
+    """
+    if len(operands) <= PRODUCT_CHUNK:
+        product = math.prod(operands)
+        if math.isfinite(product) and abs(product) >= sys.float_info.min:
+            # Short products rarely leave the float range, so they are only
+            # rescaled when the direct product over- or underflowed
+            return product
+    mantissa, exponent = 1.0, 0
+    for start in range(0, len(operands), PRODUCT_CHUNK):
+        chunk = operands[start:start + PRODUCT_CHUNK]
+        partial = math.prod(chunk)
+        if partial == 0.0 or not math.isfinite(partial):
+            # The chunk itself over- or underflowed (or holds 0, inf or nan):
+            # rescale after every value instead
+            for operand in chunk:
+                mantissa, shift = math.frexp(mantissa * operand)
+                exponent += shift
+                if mantissa == 0.0 or not math.isfinite(mantissa):
+                    return math.prod(operands)
+            continue
+        partial, shift = math.frexp(partial)
+        mantissa, scale = math.frexp(mantissa * partial)
+        exponent += shift + scale
+    try:
+        return math.ldexp(mantissa, exponent)
+    except OverflowError:
+        return math.copysign(math.inf, mantissa)
+
+def reduce_product(operands: Sequence[float]) -> float:
+    """
+    Return the product of the operands
+    All-integer inputs are multiplied exactly and rounded once; other inputs
+    are multiplied in rescaled chunks
+    """
+    exact = _exact_integer_product(operands)
+    if exact is not None:
+        return exact
+    return _scaled_product(operands)
+
+# Reducers for associative operations, used while the registry holds the
+# default implementation the reducer is equivalent to
+_REDUCERS: Dict[str, tuple] = {
+    'add': (operator.add, reduce_sum),
+    'multiply': (operator.mul, reduce_product),
+}
+
+def reduce_operands(operation: str, func: BinaryOperation, operands: Sequence[float]) -> float:
+    """
+    Apply an operation across two or more operands
+    Sums and products use the reducers above; other operations, and
+    operations replaced through register_operation, are folded left to right
+    """
+    if len(operands) == 2:
+        return func(operands[0], operands[1])
+    reducer = _REDUCERS.get(operation)
+    if reducer is not None and reducer[0] is func:
+        return reducer[1](operands)
+    return fold(func, operands)
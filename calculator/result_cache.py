@@ -0,0 +1,284 @@
+"""
+Result cache module memoizing the results of pure commands
+"""
+import math
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Sequence, Tuple
+
+# Returned by ResultCache.get when a key is not cached, since None is a valid result
+MISSING = object()
+
+# Stands in for -0.0 in keys, which would otherwise equal 0.0 and share its
+# entry although e.g. multiply -0 5 and multiply 0 5 print differently
+NEGATIVE_ZERO = '-0.0'
+
+def call_key(command_name: str, nums: Sequence[float]) -> Tuple:
+    """Build the cache key for a command call from its parsed operands"""
+    operands = tuple(nums)
+    if 0.0 in operands:
+        operands = tuple(NEGATIVE_ZERO if num == 0.0 and math.copysign(1.0, num) < 0 else num
+                         for num in operands)
+    return (command_name, operands)
+
+class ResultCache:
+    """
+    ResultCache class holding a bounded number of command results with
+    least-recently-used eviction, plus hit, miss and eviction counters
+    """
+    def __init__(self, max_size: int):
+        """Initialize an empty cache holding at most max_size results"""
+        if max_size <= 0:
+            raise ValueError("Result cache size must be positive")
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(command_name: str, args: Sequence[Any]) -> Optional[Tuple]:
+        """
+        Build the cache key for a command call from its numeric arguments, so
+        '2', '2.0' and 2 share an entry
+        Returns None if an argument is not numeric; such calls are not cached
+        """
+        try:
+            return call_key(command_name, [float(arg) for arg in args])
+        except (TypeError, ValueError):
+            return None
+
+    def get(self, key: Hashable) -> Any:
+        """Return the cached result for key, or MISSING"""
+        with self._lock:
+            try:
+                result = self._entries[key]
+            except KeyError:
+                result = MISSING
+            else:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return result
+
+        result = self._load(key)
+        with self._lock:
+            if result is MISSING:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self._store(key, result)
+        return result
+
+    def put(self, key: Hashable, result: Any) -> None:
+        """Store a result, evicting the least recently used entry when full"""
+        with self._lock:
+            self._store(key, result)
+
+    def _store(self, key: Hashable, result: Any) -> None:
+        """Insert an entry and evict the oldest one if needed; the lock must be held"""
+        self._entries[key] = result
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def _load(self, key: Hashable) -> Any:
+        """Look up a key missing from memory in a backing store; none by default"""
+        return MISSING
+
+    def clear(self) -> None:
+        """Remove all cached results and reset the counters"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the cache counters, size and hit rate"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
+
+    def counters(self) -> Dict[str, int]:
+        """Return the lookup counters, e.g. to combine the caches of several processes"""
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions}
+
+    def add_counters(self, counters: Dict[str, int]) -> None:
+        """Add counters reported by another cache, e.g. a worker process's, to this one"""
+        with self._lock:
+            for name, value in counters.items():
+                setattr(self, name, getattr(self, name) + value)
+
+    def __len__(self) -> int:
+        """Return the number of cached results"""
+        return len(self._entries)
+
+
+_SCHEMA = (
+    """CREATE TABLE IF NOT EXISTS results (
+        command TEXT NOT NULL,
+        args TEXT NOT NULL,
+        result REAL NOT NULL,
+        uses INTEGER NOT NULL,
+        PRIMARY KEY (command, args)
+    )""",
+    "CREATE INDEX IF NOT EXISTS idx_results_uses ON results (uses)",
+)
+
+# New results are inserted; known ones only have their use count increased
+_UPSERT = ("INSERT INTO results (command, args, result, uses) VALUES (?, ?, ?, ?) "
+           "ON CONFLICT (command, args) DO UPDATE SET uses = uses + excluded.uses")
+
+class PersistentResultCache(ResultCache):
+    """
+    Result cache backed by a local SQLite database shared across runs and
+    processes. Memory holds the hottest max_size results; misses fall back
+    to the database, and new results and use counts are written in batches.
+    warm() preloads the most frequently used results, so a restarted
+    process starts with a hot cache.
+    """
+    def __init__(self, max_size: int, path: str, batch_size: int = 1000):
+        """Open or create the cache database at path"""
+        super().__init__(max_size)
+        self.path = path
+        self.batch_size = max(batch_size, 1)
+        self.disk_hits = 0
+        # key -> [result, uses] waiting to be written
+        self._pending: Dict[Tuple, List] = {}
+        self._db_lock = threading.Lock()
+        self._connection = sqlite3.connect(path, timeout=10, check_same_thread=False)
+        # WAL lets other processes read while one of them writes
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        with self._connection:
+            for statement in _SCHEMA:
+                self._connection.execute(statement)
+
+    @staticmethod
+    def _encode_args(args: Tuple[float, ...]) -> str:
+        """Serialize normalized arguments to the text stored in the database"""
+        return " ".join(repr(float(arg)) for arg in args)
+
+    @staticmethod
+    def _decode_args(text: str) -> Tuple[float, ...]:
+        """Parse arguments stored by _encode_args"""
+        return call_key('', [float(arg) for arg in text.split()])[1]
+
+    @staticmethod
+    def _persistable(result: Any) -> bool:
+        """Only finite or infinite floats round-trip through a REAL column"""
+        return isinstance(result, float) and result == result
+
+    def _count_use(self, key: Tuple, result: Any) -> None:
+        """Record one use of a result, flushing when the batch is full"""
+        if not self._persistable(result):
+            return
+        with self._db_lock:
+            entry = self._pending.get(key)
+            if entry is None:
+                self._pending[key] = [result, 1]
+            else:
+                entry[1] += 1
+            full = len(self._pending) >= self.batch_size
+        if full:
+            self.flush()
+
+    def get(self, key: Hashable) -> Any:
+        """Return the cached result for key from memory or disk, or MISSING"""
+        result = super().get(key)
+        if result is not MISSING:
+            self._count_use(key, result)
+        return result
+
+    def put(self, key: Hashable, result: Any) -> None:
+        """Store a result in memory and queue it for the database"""
+        super().put(key, result)
+        self._count_use(key, result)
+
+    def _load(self, key: Hashable) -> Any:
+        """Look up a result in the database"""
+        command, args = key
+        with self._db_lock:
+            pending = self._pending.get(key)
+            if pending is not None:
+                return pending[0]
+            if self._connection is None:
+                return MISSING
+            row = self._connection.execute(
+                "SELECT result FROM results WHERE command = ? AND args = ?",
+                (command, self._encode_args(args))).fetchone()
+        if row is None:
+            return MISSING
+        with self._lock:
+            self.disk_hits += 1
+        return row[0]
+
+    def warm(self, limit: Optional[int] = None) -> int:
+        """
+        Preload the most used results into memory, at most limit (default
+        max_size) entries. Returns the number of results loaded
+        """
+        limit = self.max_size if limit is None else min(limit, self.max_size)
+        if limit <= 0:
+            return 0
+        self.flush()
+        with self._db_lock:
+            rows = self._connection.execute(
+                "SELECT command, args, result FROM results ORDER BY uses DESC LIMIT ?",
+                (limit,)).fetchall()
+        with self._lock:
+            # Insert the coldest first so the hottest are the last to be evicted
+            for command, args, result in reversed(rows):
+                self._store((command, self._decode_args(args)), result)
+        return len(rows)
+
+    def flush(self) -> None:
+        """Write queued results and use counts in a single transaction"""
+        with self._db_lock:
+            if not self._pending or self._connection is None:
+                return
+            rows = [(command, self._encode_args(args), result, uses)
+                    for (command, args), (result, uses) in self._pending.items()]
+            with self._connection:
+                self._connection.executemany(_UPSERT, rows)
+            self._pending.clear()
+
+    def clear(self) -> None:
+        """Remove all cached results from memory and disk and reset the counters"""
+        super().clear()
+        with self._lock:
+            self.disk_hits = 0
+        with self._db_lock:
+            self._pending.clear()
+            if self._connection is not None:
+                with self._connection:
+                    self._connection.execute("DELETE FROM results")
+
+    def close(self) -> None:
+        """Flush queued writes and close the database connection"""
+        self.flush()
+        with self._db_lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the cache counters, including hits served from disk"""
+        stats = super().stats()
+        stats['disk_hits'] = self.disk_hits
+        return stats
+
+    def counters(self) -> Dict[str, int]:
+        """Return the lookup counters, including hits served from disk"""
+        counters = super().counters()
+        with self._lock:
+            counters['disk_hits'] = self.disk_hits
+        return counters
@@ -0,0 +1,127 @@
+"""
+Session module providing per-user calculator state for multi-tenant serving
+"""
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Callable, Optional
+from calculator.calculations import CalculationHistory, Calculations
+from calculator.variables import VariableTable
+from utils.env_config import EnvConfig
+
+class Session:
+    """
+    Session class owning the state of one user: calculation history and variables.
+    Sessions are cheap to create, so a server can host one per client.
+    """
+    def __init__(self, session_id: Optional[str] = None,
+                 history: Optional[CalculationHistory] = None):
+        """Initialize the session with its own in-memory history unless one is given"""
+        self.id = session_id or uuid.uuid4().hex
+        self.history = history if history is not None else CalculationHistory()
+        self.variables = VariableTable()
+
+    def close(self) -> None:
+        """Release the session's state"""
+        self.history.clear_history()
+        self.variables.clear()
+
+    def __repr__(self) -> str:
+        """Return string representation of the session"""
+        return f"Session({self.id})"
+
+# Session backed by the process-wide history, used when no session is given
+DEFAULT_SESSION = Session('default', Calculations)
+
+
+class SessionManager:
+    """
+    SessionManager class creating, looking up and closing sessions by id.
+    The registry is bounded: sessions idle for longer than idle_timeout
+    seconds expire, and once max_sessions are registered the least recently
+    used one is dropped to make room. Dropped sessions are not closed, so a
+    connection still holding its session keeps working; the rest are freed.
+    """
+    def __init__(self, max_sessions: Optional[int] = None, idle_timeout: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize an empty session registry
+        Limits default to SESSION_MAX and SESSION_IDLE_TIMEOUT; 0 disables a limit
+        """
+        self.max_sessions = EnvConfig.SESSION_MAX if max_sessions is None else max_sessions
+        self.idle_timeout = (EnvConfig.SESSION_IDLE_TIMEOUT if idle_timeout is None
+                             else idle_timeout)
+        self.expired = 0
+        self.evicted = 0
+        self._clock = clock
+        # session id -> (session, last use), least recently used first
+        self._sessions: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _expire(self, now: float) -> None:
+        """Drop sessions idle for longer than the timeout; the lock must be held"""
+        if self.idle_timeout <= 0:
+            return
+        while self._sessions:
+            session_id, (_, last_used) = next(iter(self._sessions.items()))
+            if now - last_used <= self.idle_timeout:
+                break
+            del self._sessions[session_id]
+            self.expired += 1
+
+    def _register(self, session: Session, now: float) -> None:
+        """Add a session, dropping the least recently used one when full; the lock must be held"""
+        self._sessions[session.id] = (session, now)
+        self._sessions.move_to_end(session.id)
+        if self.max_sessions > 0:
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+                self.evicted += 1
+
+    def _touch(self, session_id: str, now: float) -> Optional[Session]:
+        """Return a live session and mark it used; the lock must be held"""
+        self._expire(now)
+        entry = self._sessions.get(session_id)
+        if entry is None:
+            return None
+        self._sessions[session_id] = (entry[0], now)
+        self._sessions.move_to_end(session_id)
+        return entry[0]
+
+    def create(self, session_id: Optional[str] = None) -> Session:
+        """Create and register a new session"""
+        session = Session(session_id)
+        with self._lock:
+            now = self._clock()
+            self._expire(now)
+            self._register(session, now)
+        return session
+
+    def get(self, session_id: str) -> Optional[Session]:
+        """Get a session by id or None if it does not exist or has expired"""
+        with self._lock:
+            return self._touch(session_id, self._clock())
+
+    def get_or_create(self, session_id: str) -> Session:
+        """Get a session by id, creating it on first use"""
+        with self._lock:
+            now = self._clock()
+            session = self._touch(session_id, now)
+            if session is None:
+                session = Session(session_id)
+                self._register(session, now)
+            return session
+
+    def close(self, session_id: str) -> bool:
+        """Close and remove a session; returns False if it did not exist"""
+        with self._lock:
+            entry = self._sessions.pop(session_id, None)
+        if entry is None:
+            return False
+        entry[0].close()
+        return True
+
+    def __len__(self) -> int:
+        """Return the number of registered sessions"""
+        return len(self._sessions)
@@ -0,0 +1,207 @@
+"""
+SQLite history module providing a queryable, file-backed calculation history
+"""
+import sqlite3
+import time
+from typing import Dict, Iterator, List, Optional, Tuple
+from calculator.calculation import Calculation
+from calculator.result_cache import MISSING
+
+_SCHEMA = (
+    """CREATE TABLE IF NOT EXISTS calculations (
+        id INTEGER PRIMARY KEY,
+        a REAL NOT NULL,
+        b REAL NOT NULL,
+        operation TEXT NOT NULL,
+        result REAL,
+        created_at REAL NOT NULL,
+        rest TEXT
+    )""",
+    "CREATE INDEX IF NOT EXISTS idx_calculations_operation ON calculations (operation)",
+    "CREATE INDEX IF NOT EXISTS idx_calculations_result ON calculations (result)",
+    "CREATE INDEX IF NOT EXISTS idx_calculations_created_at ON calculations (created_at)",
+)
+
+_INSERT = ("INSERT INTO calculations (id, a, b, operation, result, created_at, rest) "
+           "VALUES (?, ?, ?, ?, ?, ?, ?)")
+_SELECT = "SELECT a, b, operation, rest FROM calculations"
+
+# Columns that may be aggregated, guarding the dynamically built SQL
+AGGREGATE_COLUMNS = ('a', 'b', 'result')
+
+class SQLiteHistory:
+    """
+    History store backed by a local SQLite database. Appends are buffered and
+    inserted in batches inside a single transaction, and queries are pushed
+    down into indexed SQL instead of scanning calculations in Python.
+    Row ids equal history position + 1, so positional reads are key lookups.
+    """
+    supports_queries = True
+
+    def __init__(self, path: str, batch_size: int = 1000):
+        """Open or create the database at path"""
+        self.path = path
+        self.batch_size = max(batch_size, 1)
+        self._pending: List[Tuple] = []
+        # Incremented by clear() so views can detect it
+        self.generation = 0
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._connection:
+            for statement in _SCHEMA:
+                self._connection.execute(statement)
+            columns = [row[1] for row in
+                       self._connection.execute("PRAGMA table_info(calculations)")]
+            if 'rest' not in columns:
+                # Databases created before variadic calculations were stored
+                self._connection.execute("ALTER TABLE calculations ADD COLUMN rest TEXT")
+        self._persisted = self._connection.execute(
+            "SELECT COUNT(*) FROM calculations").fetchone()[0]
+
+    @staticmethod
+    def _result(calculation: Calculation) -> Optional[float]:
+        """Compute the stored result, or None if the calculation fails"""
+        try:
+            return calculation.perform()
+        except (ValueError, ArithmeticError):
+            return None
+
+    @staticmethod
+    def _encode_rest(rest: Tuple[float, ...]) -> Optional[str]:
+        """Encode operands beyond the second as space-separated text, or None"""
+        if not rest:
+            return None
+        return " ".join(repr(float(operand)) for operand in rest)
+
+    def append(self, calculation: Calculation, result: Optional[float] = MISSING) -> None:
+        """
+        Buffer a calculation, inserting the batch when it is full
+        The result (None if the calculation failed) is computed unless it is given
+        """
+        if result is MISSING:
+            result = self._result(calculation)
+        position = len(self)
+        self._pending.append((position + 1, calculation.a, calculation.b, calculation.operation,
+                              result, time.time(), self._encode_rest(calculation.rest)))
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Insert buffered calculations in a single transaction"""
+        if not self._pending:
+            return
+        with self._connection:
+            self._connection.executemany(_INSERT, self._pending)
+        self._persisted += len(self._pending)
+        self._pending.clear()
+
+    def clear(self) -> None:
+        """Delete all stored calculations"""
+        self._pending.clear()
+        with self._connection:
+            self._connection.execute("DELETE FROM calculations")
+        self._persisted = 0
+        self.generation += 1
+
+    def close(self) -> None:
+        """Flush pending inserts and close the database connection"""
+        if self._connection is None:
+            return
+        self.flush()
+        self._connection.close()
+        self._connection = None
+
+    def _query(self, sql: str, params: Tuple = ()) -> List[Calculation]:
+        """Run a SELECT returning calculations, after flushing pending inserts"""
+        self.flush()
+        return [Calculation(a, b, operation, () if rest is None else map(float, rest.split()))
+                for a, b, operation, rest in self._connection.execute(sql, params)]
+
+    def __len__(self) -> int:
+        """Return the number of stored and buffered calculations"""
+        return self._persisted + len(self._pending)
+
+    def __getitem__(self, index):
+        """Return the calculation at an index, or a list for a slice"""
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step == 1:
+                return list(self.iter_range(start, stop))
+            return [self[i] for i in range(start, stop, step)]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("history index out of range")
+        return self._query(f"{_SELECT} WHERE id = ?", (index + 1,))[0]
+
+    def __iter__(self) -> Iterator[Calculation]:
+        """Iterate calculations in insertion order"""
+        return self.iter_range(0, len(self))
+
+    def iter_range(self, start: int, stop: int) -> Iterator[Calculation]:
+        """Iterate calculations in [start, stop) with a single range query"""
+        return iter(self._query(f"{_SELECT} WHERE id > ? AND id <= ? ORDER BY id",
+                                (start, stop)))
+
+    def find_by_operation(self, operation: str) -> List[Calculation]:
+        """Find all calculations with the specified operation"""
+        return self._query(f"{_SELECT} WHERE operation = ? ORDER BY id", (operation,))
+
+    def find_by_operand(self, value: float) -> List[Calculation]:
+        """Find all calculations involving the given value as an operand"""
+        return self._query(f"{_SELECT} WHERE a = ? OR b = ? "
+                           "OR instr(' ' || rest || ' ', ?) > 0 ORDER BY id",
+                           (value, value, f" {float(value)!r} "))
+
+    def find_by_result_range(self, low: float, high: float) -> List[Calculation]:
+        """Find all calculations whose result lies between low and high, ordered by result"""
+        return self._query(f"{_SELECT} WHERE result BETWEEN ? AND ? ORDER BY result, id",
+                           (low, high))
+
+    def filter(self, operation: Optional[str] = None, since: Optional[float] = None,
+               until: Optional[float] = None, min_result: Optional[float] = None,
+               max_result: Optional[float] = None) -> List[Calculation]:
+        """
+        Find calculations matching all given criteria
+        since and until are Unix timestamps of when calculations were recorded
+        """
+        clauses, params = self._where(operation, since, until, min_result, max_result)
+        return self._query(f"{_SELECT}{clauses} ORDER BY id", params)
+
+    def aggregate(self, column: str = 'result', operation: Optional[str] = None,
+                  since: Optional[float] = None,
+                  until: Optional[float] = None) -> Dict[str, Optional[float]]:
+        """
+        Compute count, sum, average, minimum and maximum of a column in SQL
+        Raises ValueError if the column cannot be aggregated
+        """
+        if column not in AGGREGATE_COLUMNS:
+            raise ValueError(f"Cannot aggregate column: {column}")
+        self.flush()
+        clauses, params = self._where(operation, since, until)
+        row = self._connection.execute(
+            f"SELECT COUNT({column}), SUM({column}), AVG({column}), MIN({column}), "
+            f"MAX({column}) FROM calculations{clauses}", params).fetchone()
+        return dict(zip(('count', 'sum', 'avg', 'min', 'max'), row))
+
+    def count_by_operation(self) -> Dict[str, int]:
+        """Count stored calculations per operation"""
+        self.flush()
+        return dict(self._connection.execute(
+            "SELECT operation, COUNT(*) FROM calculations GROUP BY operation"))
+
+    @staticmethod
+    def _where(operation: Optional[str] = None, since: Optional[float] = None,
+               until: Optional[float] = None, min_result: Optional[float] = None,
+               max_result: Optional[float] = None) -> Tuple[str, Tuple]:
+        """Build a WHERE clause and its parameters from optional criteria"""
+        conditions = []
+        params = []
+        for condition, value in (("operation = ?", operation), ("created_at >= ?", since),
+                                 ("created_at <= ?", until), ("result >= ?", min_result),
+                                 ("result <= ?", max_result)):
+            if value is not None:
+                conditions.append(condition)
+                params.append(value)
+        if not conditions:
+            return "", ()
+        return " WHERE " + " AND ".join(conditions), tuple(params)
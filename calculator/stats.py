@@ -0,0 +1,94 @@
+"""
+Stats module providing constant-time running statistics over calculation history
+"""
+import math
+from typing import Dict, Optional
+from calculator.calculation import Calculation
+
+class RunningStat:
+    """
+    Running count, mean, variance, minimum and maximum of a stream of values
+    using Welford's online algorithm
+    """
+    def __init__(self):
+        """Initialize an empty accumulator"""
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def add(self, value: float) -> None:
+        """Add a value to the accumulator"""
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    @property
+    def variance(self) -> float:
+        """Return the sample variance, or 0.0 for fewer than two values"""
+        if self.count < 2:
+            return 0.0
+        return self._m2 / (self.count - 1)
+
+    def as_dict(self) -> Dict[str, Optional[float]]:
+        """Return the statistics as a dictionary"""
+        return {
+            'count': self.count,
+            'mean': self.mean if self.count else None,
+            'variance': self.variance,
+            'min': self.min,
+            'max': self.max,
+        }
+
+
+def _is_finite(value) -> bool:
+    """Return True for finite real numbers"""
+    return isinstance(value, (int, float)) and math.isfinite(value)
+
+
+class HistoryStats:
+    """
+    Aggregate statistics over a calculation history, updated incrementally
+    as calculations are added
+    """
+    def __init__(self):
+        """Initialize empty statistics"""
+        self.count = 0
+        self.operation_counts: Dict[str, int] = {}
+        self.results = RunningStat()
+        self.operands = RunningStat()
+
+    def add(self, calculation: Calculation, result: Optional[float]) -> None:
+        """Add a calculation and its result (None if it failed) to the statistics"""
+        self.count += 1
+        self.operation_counts[calculation.operation] = \
+            self.operation_counts.get(calculation.operation, 0) + 1
+        # A single NaN or infinity would make the running mean and variance
+        # NaN for good, so non-finite values are left out of both
+        for operand in calculation.operands:
+            if _is_finite(operand):
+                self.operands.add(operand)
+        if _is_finite(result):
+            self.results.add(result)
+
+    def clear(self) -> None:
+        """Reset all statistics"""
+        self.count = 0
+        self.operation_counts.clear()
+        self.results = RunningStat()
+        self.operands = RunningStat()
+
+    def summary(self) -> Dict:
+        """Return a dictionary with counts per operation and result/operand statistics"""
+        return {
+            'count': self.count,
+            'operations': dict(self.operation_counts),
+            'results': self.results.as_dict(),
+            'operands': self.operands.as_dict(),
+        }
@@ -0,0 +1,180 @@
+"""
+Variables module providing per-session named values with reactive recomputation
+"""
+import math
+import re
+import threading
+from collections.abc import MutableMapping
+from typing import Dict, Iterator, List, Optional, Set
+from calculator.expression import CompiledExpression, ExpressionError
+
+_NAME = re.compile(r'[A-Za-z_]\w*\Z')
+
+def validate_name(name: str) -> str:
+    """
+    Return name if it can be used as a variable
+    Raises ValueError for names that are not identifiers or read as numbers (e.g. inf)
+    """
+    if not _NAME.match(name):
+        raise ValueError(f"Invalid variable name: {name!r}")
+    try:
+        float(name)
+    except ValueError:
+        return name
+    raise ValueError(f"Invalid variable name: {name!r}")
+
+
+class VariableTable(MutableMapping):
+    """
+    VariableTable class holding a session's variables like a small spreadsheet.
+    Inputs are set directly; derived variables are defined by a compiled
+    expression over other variables. A dependency graph links them, so
+    changing a value recomputes only the derived variables downstream of it,
+    in dependency order. A derived variable whose expression fails (e.g. a
+    division by zero) becomes NaN and its error is kept until it recomputes.
+    Changes are serialized by a lock, since one session may be used by
+    several server threads at once.
+    """
+    def __init__(self):
+        """Initialize an empty table"""
+        self._values: Dict[str, float] = {}
+        self._definitions: Dict[str, CompiledExpression] = {}
+        # name -> variables whose definitions read it
+        self._dependents: Dict[str, Set[str]] = {}
+        self.errors: Dict[str, str] = {}
+        self._lock = threading.RLock()
+
+    def set(self, name: str, value: float) -> List[str]:
+        """
+        Set an input variable, replacing any definition it had
+        Returns the derived variables recomputed as a result, in order
+        """
+        validate_name(name)
+        with self._lock:
+            self._undefine(name)
+            self._values[name] = value
+            return self._propagate(name)
+
+    def define(self, name: str, expression: CompiledExpression) -> List[str]:
+        """
+        Define a derived variable as an expression over other variables
+        Returns the derived variables recomputed as a result, starting with name
+        Raises ExpressionError for unknown variables or circular definitions
+        """
+        validate_name(name)
+        dependencies = expression.variables
+        with self._lock:
+            missing = sorted(dep for dep in dependencies if dep not in self._values)
+            if missing:
+                raise ExpressionError(f"Unknown variable: {', '.join(missing)}")
+            if name in dependencies or not self._downstream_set([name]).isdisjoint(dependencies):
+                raise ExpressionError(f"Circular definition of {name}")
+
+            self._undefine(name)
+            self._definitions[name] = expression
+            for dependency in dependencies:
+                self._dependents.setdefault(dependency, set()).add(name)
+            self._recompute(name)
+            return [name] + self._propagate(name)
+
+    def definition(self, name: str) -> Optional[str]:
+        """Return the expression text defining a derived variable, or None for inputs"""
+        expression = self._definitions.get(name)
+        return expression.text if expression is not None else None
+
+    def _undefine(self, name: str) -> None:
+        """Drop the definition of a variable and its dependency edges"""
+        expression = self._definitions.pop(name, None)
+        if expression is None:
+            return
+        self.errors.pop(name, None)
+        for dependency in expression.variables:
+            dependents = self._dependents.get(dependency)
+            if dependents is not None:
+                dependents.discard(name)
+                if not dependents:
+                    del self._dependents[dependency]
+
+    def _downstream_set(self, names) -> Set[str]:
+        """Return every variable that transitively depends on one of names"""
+        seen: Set[str] = set()
+        stack = list(names)
+        while stack:
+            for dependent in self._dependents.get(stack.pop(), ()):
+                if dependent not in seen:
+                    seen.add(dependent)
+                    stack.append(dependent)
+        return seen
+
+    def _propagate(self, name: str) -> List[str]:
+        """Recompute the variables downstream of name in dependency order"""
+        order: List[str] = []
+        visited: Set[str] = set()
+        # Iterative depth-first search, so long chains do not hit the recursion limit
+        stack = [(name, iter(self._dependents.get(name, ())))]
+        while stack:
+            node, dependents = stack[-1]
+            for dependent in dependents:
+                if dependent not in visited:
+                    visited.add(dependent)
+                    stack.append((dependent, iter(self._dependents.get(dependent, ()))))
+                    break
+            else:
+                stack.pop()
+                if node != name:
+                    order.append(node)
+        # Reverse post-order is a topological order of the affected subgraph
+        order.reverse()
+        for dependent in order:
+            self._recompute(dependent)
+        return order
+
+    def _recompute(self, name: str) -> None:
+        """Evaluate the definition of a derived variable"""
+        try:
+            self._values[name] = self._definitions[name].evaluate(self._values)
+            self.errors.pop(name, None)
+        except (ValueError, ArithmeticError) as e:
+            self._values[name] = math.nan
+            self.errors[name] = str(e)
+
+    def __getitem__(self, name: str) -> float:
+        """Return the value of a variable"""
+        return self._values[name]
+
+    def __setitem__(self, name: str, value: float) -> None:
+        """Set an input variable"""
+        self.set(name, value)
+
+    def __delitem__(self, name: str) -> None:
+        """
+        Remove a variable
+        Raises ValueError if other variables are defined in terms of it
+        """
+        with self._lock:
+            dependents = self._dependents.get(name)
+            if dependents:
+                raise ValueError(f"Variable {name} is used by: {', '.join(sorted(dependents))}")
+            del self._values[name]
+            self._undefine(name)
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate variable names in definition order, over a snapshot of the names"""
+        with self._lock:
+            return iter(list(self._values))
+
+    def __len__(self) -> int:
+        """Return the number of variables"""
+        return len(self._values)
+
+    def __contains__(self, name) -> bool:
+        """Check whether a variable exists"""
+        return name in self._values
+
+    def clear(self) -> None:
+        """Remove all variables and definitions"""
+        with self._lock:
+            self._values.clear()
+            self._definitions.clear()
+            self._dependents.clear()
+            self.errors.clear()
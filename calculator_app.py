@@ -3,20 +3,63 @@ Calculator Application with REPL interface and command pattern
 Enhanced with logging and environment variables
 """
 import sys
+import atexit
 import shlex
 import os
-from typing import Dict, List, Optional
+import re
+import threading
+import time
+import argparse
+from typing import Any, Callable, Dict, List, Optional, TextIO, Tuple
 
-from commands.command_interface import Command
+from commands.command_interface import Command, NumericCommand
 from commands.calculator_commands import (
     AddCommand, SubtractCommand, MultiplyCommand, 
-    DivideCommand, MenuCommand, ExitCommand
+    DivideCommand, MenuCommand, ExitCommand, StatsCommand, CacheCommand, EvalCommand,
+    SetCommand, LetCommand, VarsCommand
 )
 from plugins.plugin_manager import PluginManager
-from calculator.calculations import Calculations
+from calculator.session import Session, DEFAULT_SESSION
+from calculator.result_cache import ResultCache, PersistentResultCache, MISSING, call_key
+from calculator.calculation import Calculation
+from calculator.expression import ExpressionEngine
 from utils.logger import get_logger
 from utils.env_config import EnvConfig
 
+# Lines containing quotes, backslashes or whitespace other than what shlex splits
+# on need full shlex parsing; anything else splits identically with str.split
+_NEEDS_SHLEX = re.compile(r'[\'"\\]|[^\S \t\r\n]')
+
+def _split_stages(user_input: str) -> List[str]:
+    """
+    Split a line on the '|' characters that are neither quoted nor escaped,
+    following the quoting rules of shlex in POSIX mode
+    """
+    stages = []
+    current: List[str] = []
+    quote = None
+    escaped = False
+    for char in user_input:
+        if escaped:
+            escaped = False
+        elif char == '\\' and quote != "'":
+            escaped = True
+        elif quote is not None:
+            if char == quote:
+                quote = None
+        elif char in '"\'':
+            quote = char
+        elif char == '|':
+            stages.append(''.join(current))
+            current = []
+            continue
+        current.append(char)
+    stages.append(''.join(current))
+    return stages
+
+class UnknownCommandError(LookupError):
+    """Raised when a command name is not registered with the application"""
+
 class CalculatorApp:
     """
     Calculator Application implementing a REPL interface with the command pattern
@@ -24,15 +67,28 @@ class CalculatorApp:
     Enhanced with logging and environment variable support.
     """
     
-    def __init__(self):
-        """Initialize the calculator application with commands and plugins"""
+    def __init__(self, session: Optional[Session] = None, cache_size: Optional[int] = None,
+                 cache_file: Optional[str] = None):
+        """
+        Initialize the calculator application with commands and plugins
+        Commands run in the given session unless another one is passed per call;
+        by default the process-wide history is used. Results of pure commands
+        are memoized in an LRU cache of cache_size entries, defaulting to
+        RESULT_CACHE_SIZE (0 disables caching), and persisted to cache_file
+        (default RESULT_CACHE_FILE) when one is set
+        """
         # Set up logger
         self.logger = get_logger(__name__)
         self.logger.info("Initializing Calculator Application")
         self.logger.debug(f"Application environment: {EnvConfig.APP_ENV}")
         
         self.commands: Dict[str, Command] = {}
+        self.session = session or DEFAULT_SESSION
+        self.result_cache = self._create_result_cache(cache_size, cache_file)
+        self.expressions = ExpressionEngine(EnvConfig.EXPRESSION_CACHE_SIZE)
         self.running = True
+        self.error_count = 0
+        self._error_lock = threading.Lock()
         
         # Register core commands
         self._register_core_commands()
@@ -45,6 +101,25 @@ class CalculatorApp:
         
         self.logger.info("Calculator Application initialized successfully")
         
+    def _create_result_cache(self, cache_size: Optional[int],
+                             cache_file: Optional[str]) -> Optional[ResultCache]:
+        """Create the configured result cache, warming a persistent one from disk"""
+        if cache_size is None:
+            cache_size = EnvConfig.RESULT_CACHE_SIZE
+        if cache_size <= 0:
+            return None
+        if cache_file is None:
+            cache_file = EnvConfig.RESULT_CACHE_FILE
+        if not cache_file:
+            return ResultCache(cache_size)
+        
+        cache = PersistentResultCache(cache_size, cache_file)
+        # Write out the last batch of results and use counts when the process exits
+        atexit.register(cache.close)
+        loaded = cache.warm(EnvConfig.RESULT_CACHE_WARMUP)
+        self.logger.info(f"Warmed result cache with {loaded} entries from {cache_file}")
+        return cache
+    
     def _register_core_commands(self) -> None:
         """Register core calculator commands"""
         self.logger.debug("Registering core commands")
@@ -52,6 +127,13 @@ class CalculatorApp:
         self.commands['subtract'] = SubtractCommand()
         self.commands['multiply'] = MultiplyCommand()
         self.commands['divide'] = DivideCommand()
+        self.commands['stats'] = StatsCommand()
+        self.commands['cache'] = CacheCommand(self.result_cache)
+        self.commands['eval'] = EvalCommand(self.expressions)
+        self.commands['expr'] = self.commands['eval']
+        self.commands['set'] = SetCommand()
+        self.commands['let'] = LetCommand(self.expressions)
+        self.commands['vars'] = VarsCommand()
         self.commands['exit'] = ExitCommand()
         self.commands['quit'] = ExitCommand()
         self.logger.debug(f"Registered {len(self.commands)} core commands")
@@ -71,36 +153,101 @@ class CalculatorApp:
         else:
             self.logger.info("No plugin commands were loaded")
     
-    def execute_command(self, command_name: str, args: List[str]) -> Optional[str]:
+    def run_command(self, command_name: str, args: List[Any],
+                    session: Optional[Session] = None) -> Any:
         """
-        Execute the specified command with given arguments
-        Returns command result or None if command not found
+        Execute the specified command in a session, record calculations in the
+        session's history and return the command's native result
+        Arguments of numeric commands are parsed once and the numbers are
+        reused for the cache key and the history record.
+        Raises UnknownCommandError if the command is not registered; errors
+        raised by the command, including invalid numbers, propagate to the caller
         """
         command_name_lower = command_name.lower()
         command = self.commands.get(command_name_lower)
         
         if command is None:
-            self.logger.warning(f"Unknown command attempted: {command_name}")
-            return f"Unknown command: {command_name}. Type 'menu' to see available commands."
+            raise UnknownCommandError(command_name)
         
-        try:
-            self.logger.info(f"Executing command: {command_name_lower} with args: {args}")
-            result = command.execute(*args)
+        session = session or self.session
+        self.logger.info(f"Executing command: {command_name_lower} with args: {args}")
+        if isinstance(command, NumericCommand):
+            nums = command.parse_args(args, session.variables)
+            result = self.compute(command_name_lower, command, nums)
             
-            # If it's a calculation command, store in history
-            if command_name_lower in ['add', 'subtract', 'multiply', 'divide']:
-                # Convert string args to float
-                float_args = [float(arg) for arg in args]
-                if len(float_args) >= 2:
-                    from calculator.calculator import Calculator
-                    from calculator.calculation import Calculation
-                    
-                    # Create and store calculation in history
-                    calculation = Calculator.create_calculation(
-                        float_args[0], float_args[1], command_name_lower
-                    )
-                    Calculations.add_calculation(calculation)
-                    self.logger.debug(f"Added calculation to history: {calculation}")
+            # Calculation commands store one history record with all operands
+            if command.operation is not None:
+                calculation = Calculation.from_operands(command.operation, nums)
+                session.history.add_calculation(calculation, result)
+                self.logger.debug(f"Added calculation to history: {calculation}")
+        elif command.uses_session:
+            result = command.execute(*args, session=session)
+        else:
+            result = command.execute(*args)
+        
+        self.logger.debug(f"Command result: {result}")
+        return result
+    
+    def compute(self, command_name: str, command: NumericCommand, nums: List[float]) -> Any:
+        """
+        Compute a numeric command, serving pure commands from the result cache
+        Failed calls are not cached, so errors are raised on every call
+        """
+        if self.result_cache is None or not command.pure:
+            return command.compute(nums)
+        
+        key = call_key(command_name, nums)
+        result = self.result_cache.get(key)
+        if result is MISSING:
+            result = command.compute(nums)
+            self.result_cache.put(key, result)
+        return result
+    
+    def run_pipeline(self, stages: List[Tuple[str, List[Any]]],
+                     session: Optional[Session] = None) -> Any:
+        """
+        Execute commands connected by pipes, passing the native result of each
+        stage as the first operand of the next, and return the last result
+        Each stage is recorded in history like a separate command
+        Raises ValueError if a stage does not produce a number
+        """
+        result = None
+        for index, (command_name, args) in enumerate(stages):
+            if index:
+                if isinstance(result, bool):
+                    # exit ends the pipeline
+                    return result
+                if not isinstance(result, (int, float)):
+                    raise ValueError(f"Cannot pipe the output of {stages[index - 1][0]} "
+                                     f"into {command_name}")
+                args = [result, *args]
+            result = self.run_command(command_name, args, session)
+        return result
+    
+    def execute_command(self, command_name: str, args: List[str],
+                        session: Optional[Session] = None) -> str:
+        """
+        Execute the specified command with given arguments
+        Returns the formatted result, or an error message for unknown commands and
+        failed calculations; use run_command to get the raw result or exception
+        """
+        return self._report(command_name, lambda: self.run_command(command_name, args, session))
+    
+    def execute_pipeline(self, stages: List[Tuple[str, List[Any]]],
+                         session: Optional[Session] = None) -> str:
+        """
+        Execute a pipeline of commands
+        Returns the result of the last stage, or the first error
+        """
+        label = " | ".join(command_name for command_name, _ in stages)
+        return self._report(label, lambda: self.run_pipeline(stages, session))
+    
+    def _report(self, command_name: str, run: Callable[[], Any]) -> str:
+        """Run a command and format its result or error for display"""
+        command_name_lower = command_name.lower()
+        
+        try:
+            result = run()
             
             # Check for exit command
             if isinstance(result, bool) and not result:
@@ -108,26 +255,42 @@ class CalculatorApp:
                 self.running = False
                 return "Exiting calculator application. Goodbye!"
             
-            self.logger.debug(f"Command result: {result}")
             return str(result)
             
+        except UnknownCommandError as e:
+            unknown = e.args[0]
+            self.logger.warning(f"Unknown command attempted: {unknown}")
+            self._count_error()
+            return f"Unknown command: {unknown}. Type 'menu' to see available commands."
         except ValueError as e:
             self.logger.error(f"ValueError during execution of {command_name_lower}: {e}")
+            self._count_error()
             return f"Error: {e}"
         except ZeroDivisionError as e:
             self.logger.error(f"ZeroDivisionError during execution of {command_name_lower}: {e}")
+            self._count_error()
             return f"Error: {e}"
         except Exception as e:
             self.logger.error(f"Unexpected error during execution of {command_name_lower}", exc_info=True)
+            self._count_error()
             return f"Unexpected error: {e}"
     
+    def _count_error(self) -> None:
+        """Count a failed command; commands may run on several threads at once"""
+        with self._error_lock:
+            self.error_count += 1
+    
     def parse_input(self, user_input: str) -> tuple:
         """
         Parse user input into command name and arguments
         Returns tuple of (command_name, args)
         """
-        # Use shlex to handle quoted arguments correctly
-        parts = shlex.split(user_input)
+        if _NEEDS_SHLEX.search(user_input) is None:
+            # Plain 'op num num ...' lines are split without the shlex lexer
+            parts = user_input.split()
+        else:
+            # Use shlex to handle quoted arguments correctly
+            parts = shlex.split(user_input)
         
         if not parts:
             return ('', [])
@@ -137,6 +300,25 @@ class CalculatorApp:
         
         return (command_name, args)
     
+    def parse_pipeline(self, user_input: str) -> List[Tuple[str, List[str]]]:
+        """
+        Parse user input into (command_name, args) stages separated by '|'
+        Returns an empty list for blank input
+        Raises ValueError for malformed quoting or an empty stage
+        """
+        if '|' not in user_input:
+            command_name, args = self.parse_input(user_input)
+            return [(command_name, args)] if command_name else []
+        
+        if _NEEDS_SHLEX.search(user_input) is None:
+            segments = [segment.split() for segment in user_input.split('|')]
+        else:
+            segments = [shlex.split(stage) for stage in _split_stages(user_input)]
+        
+        if not all(segments):
+            raise ValueError("Empty pipeline stage")
+        return [(segment[0].lower(), segment[1:]) for segment in segments]
+    
     def run(self) -> None:
         """Run the calculator REPL loop"""
         # Display welcome message with environment info
@@ -161,14 +343,10 @@ class CalculatorApp:
                 user_input = input("calculator> ")
                 self.logger.debug(f"User input: {user_input}")
                 
-                # Parse
-                command_name, args = self.parse_input(user_input)
-                
-                if not command_name:
+                # Parse, Evaluate and Print
+                result = self.execute_line(user_input)
+                if result is None:
                     continue
-                
-                # Evaluate and Print
-                result = self.execute_command(command_name, args)
                 print(result)
                 
             except KeyboardInterrupt:
@@ -183,8 +361,103 @@ class CalculatorApp:
                 self.logger.error(f"Unexpected error in REPL loop: {e}", exc_info=True)
                 print(f"Error: {e}")
 
-def main():
+    def execute_line(self, line: str, session: Optional[Session] = None) -> Optional[str]:
+        """
+        Parse and execute a single line of input
+        Returns the command result, or None if the line is blank
+        """
+        try:
+            stages = self.parse_pipeline(line)
+        except ValueError as e:
+            # Malformed quoting is reported like any other command error
+            self.logger.error(f"Could not parse input {line!r}: {e}")
+            self._count_error()
+            return f"Error: {e}"
+        
+        if not stages:
+            return None
+        if len(stages) > 1:
+            return self.execute_pipeline(stages, session)
+        command_name, args = stages[0]
+        return self.execute_command(command_name, args, session)
+    
+    def run_script(self, stream: TextIO, output: TextIO, buffer_lines: int = 1024,
+                   optimize: bool = False) -> Dict[str, float]:
+        """
+        Execute commands streamed line by line from a file or stdin
+        Prompts and banners are suppressed; results are written to output in
+        buffered chunks and a throughput summary is written to stderr.
+        With optimize the whole script is read and planned first: each distinct
+        pure calculation is computed once, and lines making a folded call are
+        answered from the plan without being dispatched again. Outputs and
+        history are the same as without it.
+        Returns a dictionary with the command count, error count and elapsed time
+        """
+        self.logger.info("Starting calculator script execution")
+        errors_before = self.error_count
+        commands = 0
+        pending: List[str] = []
+        start = time.perf_counter()
+        
+        planner = None
+        if optimize:
+            from script_planner import ScriptPlanner
+            stream = list(stream)
+            planner = ScriptPlanner(self)
+            plan = planner.plan(stream)
+        
+        for index, line in enumerate(stream):
+            result = planner.run_line(plan, index) if planner is not None else None
+            if result is None:
+                result = self.execute_line(line)
+            if result is None:
+                continue
+            
+            commands += 1
+            pending.append(result)
+            if len(pending) >= buffer_lines:
+                output.write("\n".join(pending) + "\n")
+                pending.clear()
+            if not self.running:
+                break
+        
+        if pending:
+            output.write("\n".join(pending) + "\n")
+        output.flush()
+        
+        elapsed = time.perf_counter() - start
+        summary = {
+            'commands': commands,
+            'errors': self.error_count - errors_before,
+            'elapsed': elapsed,
+        }
+        rate = commands / elapsed if elapsed > 0 else 0.0
+        print(f"Processed {commands} commands in {elapsed:.3f}s ({rate:,.0f} commands/s), "
+              f"{summary['errors']} errors", file=sys.stderr)
+        if optimize:
+            plan_summary = plan.summary()
+            summary['unique_calls'] = plan_summary['unique_calls']
+            print(f"Planned {plan_summary['pure_calls']} pure calls as "
+                  f"{plan_summary['unique_calls']} distinct calculations", file=sys.stderr)
+        self.logger.info(f"Script execution finished: {summary}")
+        return summary
+
+def main(argv: Optional[List[str]] = None):
     """Main entry point for the calculator application"""
+    parser = argparse.ArgumentParser(description="Calculator Application")
+    parser.add_argument('--script', metavar='FILE',
+                        help="run commands from FILE ('-' for stdin) without the interactive prompt")
+    parser.add_argument('--workers', type=int, default=1, metavar='N',
+                        help="execute the script on N worker processes")
+    parser.add_argument('--chunk-size', type=int, default=1000, metavar='LINES',
+                        help="lines per chunk sent to a worker process (default: 1000)")
+    parser.add_argument('--optimize', action='store_true',
+                        help="plan the whole script first, computing each distinct pure "
+                             "calculation once")
+    options = parser.parse_args(argv)
+    if options.optimize and options.workers > 1:
+        parser.error("--optimize cannot be combined with --workers")
+    
     # Set up root logger
     logger = get_logger('calculator_app')
     
@@ -193,8 +466,17 @@ def main():
     logger.info(f"Environment: {EnvConfig.APP_ENV}")
     
     try:
-        app = CalculatorApp()
-        app.run()
+        if options.script is None:
+            CalculatorApp().run()
+        else:
+            script = sys.stdin if options.script == '-' else \
+                open(options.script, 'r', encoding='utf-8')
+            with script:
+                if options.workers > 1:
+                    from parallel_runner import ParallelScriptRunner
+                    ParallelScriptRunner(options.workers, options.chunk_size).run(script, sys.stdout)
+                else:
+                    CalculatorApp().run_script(script, sys.stdout, optimize=options.optimize)
     except Exception as e:
         logger.critical(f"Unhandled exception in main: {e}", exc_info=True)
         print(f"Critical error: {e}")
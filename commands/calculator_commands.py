@@ -1,27 +1,16 @@
 """
 Calculator Commands module implementing concrete command classes
 """
-from typing import List, Any, Dict
-from commands.command_interface import Command
-from calculator.calculator import Calculator
+from typing import List, Any, Dict, Optional
+from commands.command_interface import Command, NumericCommand
+from calculator.calculations import Calculations
+from calculator.result_cache import ResultCache
+from calculator.expression import ExpressionEngine
 
-class AddCommand(Command):
+class AddCommand(NumericCommand):
     """Command class for addition operation"""
     
-    def execute(self, *args, **kwargs) -> float:
-        """Execute addition operation with provided arguments"""
-        if len(args) < 2:
-            raise ValueError("Add command requires at least 2 numeric arguments")
-        
-        # Convert string arguments to float
-        nums = [float(arg) for arg in args]
-        result = nums[0]
-        
-        # Add the rest of the numbers to the first one
-        for num in nums[1:]:
-            result = Calculator.add(result, num)
-            
-        return result
+    operation = 'add'
     
     @property
     def description(self) -> str:
@@ -34,23 +23,10 @@ class AddCommand(Command):
         return "add <number1> <number2> [number3 ...]"
 
 
-class SubtractCommand(Command):
+class SubtractCommand(NumericCommand):
     """Command class for subtraction operation"""
     
-    def execute(self, *args, **kwargs) -> float:
-        """Execute subtraction operation with provided arguments"""
-        if len(args) < 2:
-            raise ValueError("Subtract command requires at least 2 numeric arguments")
-        
-        # Convert string arguments to float
-        nums = [float(arg) for arg in args]
-        result = nums[0]
-        
-        # Subtract the rest of the numbers from the first one
-        for num in nums[1:]:
-            result = Calculator.subtract(result, num)
-            
-        return result
+    operation = 'subtract'
     
     @property
     def description(self) -> str:
@@ -63,23 +39,10 @@ class SubtractCommand(Command):
         return "subtract <number1> <number2> [number3 ...]"
 
 
-class MultiplyCommand(Command):
+class MultiplyCommand(NumericCommand):
     """Command class for multiplication operation"""
     
-    def execute(self, *args, **kwargs) -> float:
-        """Execute multiplication operation with provided arguments"""
-        if len(args) < 2:
-            raise ValueError("Multiply command requires at least 2 numeric arguments")
-        
-        # Convert string arguments to float
-        nums = [float(arg) for arg in args]
-        result = nums[0]
-        
-        # Multiply the rest of the numbers with the first one
-        for num in nums[1:]:
-            result = Calculator.multiply(result, num)
-            
-        return result
+    operation = 'multiply'
     
     @property
     def description(self) -> str:
@@ -92,23 +55,10 @@ class MultiplyCommand(Command):
         return "multiply <number1> <number2> [number3 ...]"
 
 
-class DivideCommand(Command):
+class DivideCommand(NumericCommand):
     """Command class for division operation"""
     
-    def execute(self, *args, **kwargs) -> float:
-        """Execute division operation with provided arguments"""
-        if len(args) < 2:
-            raise ValueError("Divide command requires at least 2 numeric arguments")
-        
-        # Convert string arguments to float
-        nums = [float(arg) for arg in args]
-        result = nums[0]
-        
-        # Divide the first number by the rest of the numbers
-        for num in nums[1:]:
-            result = Calculator.divide(result, num)
-            
-        return result
+    operation = 'divide'
     
     @property
     def description(self) -> str:
@@ -157,6 +107,221 @@ class MenuCommand(Command):
         return "menu"
 
 
+class StatsCommand(Command):
+    """Command class to display running statistics over the calculation history"""
+    
+    uses_session = True
+    
+    def execute(self, *args, session=None, **kwargs) -> str:
+        """
+        Execute the stats command for the session's history, or the
+        process-wide history when no session is given
+        Returns a formatted string with counts and result/operand statistics
+        """
+        history = session.history if session is not None else Calculations
+        stats = history.get_stats()
+        result = f"Calculations: {stats['count']}\n"
+        
+        operations = ", ".join(f"{name}={count}" for name, count
+                               in sorted(stats['operations'].items()))
+        result += f"Operations: {operations or 'none'}\n"
+        
+        for label in ('results', 'operands'):
+            values = stats[label]
+            result += (f"{label.capitalize()}: count={values['count']} mean={values['mean']} "
+                       f"variance={values['variance']} min={values['min']} max={values['max']}\n")
+        return result
+    
+    @property
+    def description(self) -> str:
+        """Return description of the stats command"""
+        return "Show statistics over the calculation history"
+    
+    @property
+    def usage(self) -> str:
+        """Return usage information for the stats command"""
+        return "stats"
+
+
+class CacheCommand(Command):
+    """Command class to display or clear the result cache"""
+    
+    def __init__(self, cache: Optional[ResultCache]):
+        """Initialize CacheCommand with the application's result cache, if enabled"""
+        self.cache = cache
+    
+    def execute(self, *args, **kwargs) -> str:
+        """
+        Execute the cache command, showing hit/miss/eviction counters, or
+        clearing the cache when called as 'cache clear'
+        """
+        if self.cache is None:
+            return "Result cache is disabled (set RESULT_CACHE_SIZE to enable it)"
+        if args:
+            if args[0].lower() != 'clear':
+                raise ValueError(f"Unknown cache action: {args[0]}")
+            self.cache.clear()
+            return "Result cache cleared"
+        
+        stats = self.cache.stats()
+        result = (f"Entries: {stats['size']}/{stats['max_size']}\n"
+                  f"Hits: {stats['hits']}, misses: {stats['misses']}, "
+                  f"evictions: {stats['evictions']}\n"
+                  f"Hit rate: {stats['hit_rate']:.1%}")
+        if 'disk_hits' in stats:
+            result += f"\nServed from disk: {stats['disk_hits']}"
+        return result
+    
+    @property
+    def description(self) -> str:
+        """Return description of the cache command"""
+        return "Show result cache statistics or clear the cache"
+    
+    @property
+    def usage(self) -> str:
+        """Return usage information for the cache command"""
+        return "cache [clear]"
+
+
+class EvalCommand(Command):
+    """Command class to evaluate an infix expression"""
+    
+    uses_session = True
+    
+    def __init__(self, engine: ExpressionEngine):
+        """Initialize EvalCommand with the application's expression engine"""
+        self.engine = engine
+    
+    def execute(self, *args, session=None, **kwargs) -> float:
+        """
+        Execute the eval command: the arguments are joined into one expression,
+        which may refer to the session's variables
+        Raises ValueError for invalid expressions or unknown variables
+        """
+        if not args:
+            raise ValueError("Eval command requires an expression")
+        variables = session.variables if session is not None else {}
+        return self.engine.evaluate(" ".join(str(arg) for arg in args), variables)
+    
+    @property
+    def description(self) -> str:
+        """Return description of the eval command"""
+        return "Evaluate an expression with + - * / ^, parentheses and operation calls"
+    
+    @property
+    def usage(self) -> str:
+        """Return usage information for the eval command"""
+        return "eval <expression>, e.g. eval (2 + 3) * power(2, 4) / 5"
+
+
+def _describe_update(name: str, updated: List[str], variables) -> str:
+    """Format the value of a changed variable and the derived values it updated"""
+    result = f"{name} = {variables[name]}"
+    if name in variables.errors:
+        result += f" (error: {variables.errors[name]})"
+    if updated:
+        result += f"; updated {', '.join(f'{dep} = {variables[dep]}' for dep in updated)}"
+    return result
+
+
+class SetCommand(Command):
+    """Command class to set an input variable in the session"""
+    
+    uses_session = True
+    
+    def execute(self, *args, session=None, **kwargs) -> str:
+        """
+        Execute the set command, recomputing the variables that depend on it
+        Raises ValueError for a missing or invalid name or value
+        """
+        if session is None:
+            raise ValueError("Set command requires a session")
+        if len(args) != 2:
+            raise ValueError("Set command requires a variable name and a value")
+        name = str(args[0])
+        value = NumericCommand.parse_args(args[1:], session.variables)[0]
+        updated = session.variables.set(name, value)
+        return _describe_update(name, updated, session.variables)
+    
+    @property
+    def description(self) -> str:
+        """Return description of the set command"""
+        return "Set a variable that other commands and definitions can use"
+    
+    @property
+    def usage(self) -> str:
+        """Return usage information for the set command"""
+        return "set <name> <value>"
+
+
+class LetCommand(Command):
+    """Command class to define a variable derived from an expression"""
+    
+    uses_session = True
+    
+    def __init__(self, engine: ExpressionEngine):
+        """Initialize LetCommand with the application's expression engine"""
+        self.engine = engine
+    
+    def execute(self, *args, session=None, **kwargs) -> str:
+        """
+        Execute the let command: the variable is kept up to date whenever a
+        variable its expression reads changes
+        Raises ValueError for invalid names, expressions or circular definitions
+        """
+        if session is None:
+            raise ValueError("Let command requires a session")
+        text = " ".join(str(arg) for arg in args)
+        name, equals, expression = text.partition('=')
+        name = name.strip()
+        if not equals or not name or not expression.strip():
+            raise ValueError("Let command requires: let <name> = <expression>")
+        updated = session.variables.define(name, self.engine.compile(expression))
+        return _describe_update(name, updated[1:], session.variables)
+    
+    @property
+    def description(self) -> str:
+        """Return description of the let command"""
+        return "Define a variable from an expression, recomputed when its inputs change"
+    
+    @property
+    def usage(self) -> str:
+        """Return usage information for the let command"""
+        return "let <name> = <expression>, e.g. let total = price * quantity"
+
+
+class VarsCommand(Command):
+    """Command class to list the session's variables"""
+    
+    uses_session = True
+    
+    def execute(self, *args, session=None, **kwargs) -> str:
+        """Execute the vars command, showing values and definitions"""
+        variables = session.variables if session is not None else {}
+        if not variables:
+            return "No variables defined"
+        lines = []
+        for name in variables:
+            definition = variables.definition(name)
+            line = f"{name} = {variables[name]}"
+            if definition is not None:
+                line = f"{name} = {definition} = {variables[name]}"
+            if name in variables.errors:
+                line += f" (error: {variables.errors[name]})"
+            lines.append(line)
+        return "\n".join(lines)
+    
+    @property
+    def description(self) -> str:
+        """Return description of the vars command"""
+        return "List variables with their values and definitions"
+    
+    @property
+    def usage(self) -> str:
+        """Return usage information for the vars command"""
+        return "vars"
+
+
 class ExitCommand(Command):
     """Command class to exit the application"""
     
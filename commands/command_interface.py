@@ -2,13 +2,19 @@
 Command Interface module defining the base Command abstract class
 """
 from abc import ABC, abstractmethod
-from typing import List, Any, Dict
+from typing import List, Any, Dict, Mapping, Optional, Sequence
+from calculator.operations import get_operation
+from calculator.reduction import reduce_operands
 
 class Command(ABC):
     """
     Abstract base class for command pattern implementation.
     All calculator commands must inherit from this class.
     """
+    # Commands that read or write per-user state set this to receive the
+    # active session as the 'session' keyword argument
+    uses_session = False
+
     @abstractmethod
     def execute(self, *args, **kwargs) -> Any:
         """
@@ -34,3 +40,56 @@ class Command(ABC):
         Must be implemented by all command subclasses
         """
         pass
+
+
+class NumericCommand(Command):
+    """
+    Base class for commands operating on numeric arguments.
+    The application parses arguments once with parse_args and passes the
+    numbers to compute, reusing them for the history record.
+    """
+    # The result depends only on the arguments, so the application may serve
+    # repeated calls from its result cache; set to False otherwise
+    pure = True
+    # Registered operation reduced over the arguments; commands with an
+    # operation are recorded in the calculation history
+    operation: Optional[str] = None
+    min_args = 2
+
+    @staticmethod
+    def parse_args(args: Sequence[Any],
+                   variables: Optional[Mapping[str, float]] = None) -> List[float]:
+        """
+        Convert command arguments to numbers; arguments naming one of the
+        given variables are replaced by its value
+        Raises ValueError naming the first argument that is neither
+        """
+        try:
+            return [float(arg) for arg in args]
+        except (TypeError, ValueError):
+            pass
+        
+        nums = []
+        for arg in args:
+            try:
+                nums.append(float(arg))
+            except (TypeError, ValueError):
+                if variables is None or arg not in variables:
+                    raise ValueError(f"Invalid number: {arg!r}") from None
+                nums.append(variables[arg])
+        return nums
+
+    def execute(self, *args, **kwargs) -> Any:
+        """Parse the arguments and compute the result"""
+        return self.compute(self.parse_args(args))
+
+    def compute(self, nums: List[float]) -> Any:
+        """
+        Compute the result from parsed arguments by reducing the operation
+        over them (see calculator.reduction)
+        Raises ValueError if too few arguments are given
+        """
+        if len(nums) < self.min_args:
+            raise ValueError(f"{self.operation.capitalize()} command requires at least "
+                             f"{self.min_args} numeric arguments")
+        return reduce_operands(self.operation, get_operation(self.operation), nums)
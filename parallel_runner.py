@@ -0,0 +1,173 @@
+"""
+Parallel script runner executing large command scripts across worker processes
+"""
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain, islice
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+from calculator.calculation import Calculation
+from calculator.calculations import Calculations
+from calculator.history import ListHistory
+from calculator_app import CalculatorApp
+from commands.calculator_commands import CacheCommand
+from utils.logger import get_logger
+
+# Calculator instance owned by each worker process, created once by the initializer
+_worker_app: Optional[CalculatorApp] = None
+
+ChunkResult = Tuple[List[str], List[Tuple[float, float, str, Tuple[float, ...]]], int, bool,
+                    Dict[str, int]]
+
+def _init_worker() -> None:
+    """Create the worker's CalculatorApp, loading plugins once per process"""
+    global _worker_app
+    # Keep worker history in memory; the parent merges it into its own store
+    Calculations.set_history_store(ListHistory())
+    _worker_app = CalculatorApp()
+
+def _run_chunk(lines: List[str]) -> ChunkResult:
+    """
+    Execute a chunk of script lines in a worker process
+    Returns the outputs, recorded history, error count, whether exit was reached
+    and the result cache counters added by the chunk
+    """
+    app = _worker_app
+    Calculations.clear_history()
+    errors_before = app.error_count
+    cache = app.result_cache
+    counters_before = cache.counters() if cache is not None else {}
+    outputs = []
+    for line in lines:
+        result = app.execute_line(line)
+        if result is None:
+            continue
+        outputs.append(result)
+        if not app.running:
+            break
+    history = [(calc.a, calc.b, calc.operation, calc.rest) for calc in Calculations.snapshot()]
+    counters = {name: value - counters_before[name]
+                for name, value in cache.counters().items()} if cache is not None else {}
+    return outputs, history, app.error_count - errors_before, not app.running, counters
+
+class ParallelScriptRunner:
+    """
+    Runs a stream of calculator commands on a pool of worker processes.
+    The stream is split into chunks that are executed concurrently; outputs are
+    written and worker histories merged into Calculations in script order.
+    Workers do not share session state, so from the first line using it
+    (set, let, vars, stats, eval, ...) the rest of the script runs in this
+    process after the chunks before it, exactly as a sequential run would.
+    The same applies from the first cache command; worker cache counters are
+    added to this process's cache first, so it reports totals for the run.
+    """
+    
+    def __init__(self, workers: Optional[int] = None, chunk_size: int = 1000):
+        """Initialize the runner with the number of worker processes and lines per chunk"""
+        self.logger = get_logger(__name__)
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = max(chunk_size, 1)
+        # Executes the sequential part of scripts and classifies their lines
+        self.app = CalculatorApp()
+        # Lines from the first one that must run here, set while chunking
+        self._remainder: List[str] = []
+    
+    def _runs_sequentially(self, line: str) -> bool:
+        """
+        Check whether a line runs a command that reads or writes session state,
+        or reports the result cache, whose counters are kept per process
+        """
+        try:
+            stages = self.app.parse_pipeline(line)
+        except ValueError:
+            return False
+        for command_name, _ in stages:
+            command = self.app.commands.get(command_name)
+            if getattr(command, 'uses_session', False) or isinstance(command, CacheCommand):
+                return True
+        return False
+    
+    def _chunks(self, lines: Iterator[str]) -> Iterator[List[str]]:
+        """
+        Split lines into lists of at most chunk_size lines, stopping before the
+        first line that must run sequentially; that line is kept in _remainder
+        and the lines after it stay in the iterator
+        """
+        while True:
+            chunk = list(islice(lines, self.chunk_size))
+            if not chunk:
+                return
+            for index, line in enumerate(chunk):
+                if self._runs_sequentially(line):
+                    self._remainder = chunk[index:]
+                    if index:
+                        yield chunk[:index]
+                    return
+            yield chunk
+    
+    def _ordered_results(self, executor: ProcessPoolExecutor,
+                         lines: Iterator[str]) -> Iterator[ChunkResult]:
+        """Yield chunk results in order, keeping a bounded number of chunks in flight"""
+        in_flight = deque()
+        chunks = self._chunks(lines)
+        for chunk in chunks:
+            in_flight.append(executor.submit(_run_chunk, chunk))
+            if len(in_flight) >= self.workers * 2:
+                yield in_flight.popleft().result()
+        while in_flight:
+            yield in_flight.popleft().result()
+    
+    def run(self, stream: Iterable[str], output: TextIO) -> Dict[str, float]:
+        """
+        Execute the script and write results to output in order
+        A summary is written to stderr.
+        Returns a dictionary with the command count, error count and elapsed time
+        """
+        self.logger.info(f"Starting parallel script execution with {self.workers} workers")
+        commands = errors = 0
+        exited = False
+        lines = iter(stream)
+        self._remainder = []
+        start = time.perf_counter()
+        
+        with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker) as executor:
+            for outputs, history, chunk_errors, exited, counters in \
+                    self._ordered_results(executor, lines):
+                if outputs:
+                    output.write("\n".join(outputs) + "\n")
+                for a, b, operation, rest in history:
+                    Calculations.add_calculation(Calculation(a, b, operation, rest))
+                if self.app.result_cache is not None:
+                    self.app.result_cache.add_counters(counters)
+                commands += len(outputs)
+                errors += chunk_errors
+                if exited:
+                    # Later chunks ran speculatively; discard them like the serial runner would
+                    executor.shutdown(wait=True, cancel_futures=True)
+                    break
+        
+        if self._remainder and not exited:
+            self.logger.info("Script uses session state or the result cache; "
+                             "running the rest sequentially")
+            errors_before = self.app.error_count
+            for line in chain(self._remainder, lines):
+                result = self.app.execute_line(line)
+                if result is None:
+                    continue
+                output.write(result + "\n")
+                commands += 1
+                if not self.app.running:
+                    break
+            errors += self.app.error_count - errors_before
+        output.flush()
+        
+        elapsed = time.perf_counter() - start
+        summary = {'commands': commands, 'errors': errors, 'elapsed': elapsed}
+        rate = commands / elapsed if elapsed > 0 else 0.0
+        print(f"Processed {commands} commands in {elapsed:.3f}s ({rate:,.0f} commands/s) "
+              f"on {self.workers} workers, {errors} errors", file=sys.stderr)
+        self.logger.info(f"Parallel script execution finished: {summary}")
+        return summary
@@ -74,9 +74,10 @@ class PluginManager:
                 # Find all Command subclasses in the module
                 commands_found = 0
                 for name, obj in inspect.getmembers(module):
+                    # Abstract bases such as an imported NumericCommand are skipped
                     if (inspect.isclass(obj) and 
                         issubclass(obj, Command) and 
-                        obj is not Command):
+                        not inspect.isabstract(obj)):
                         
                         # Extract command name from class name (remove 'Command' suffix)
                         command_name = name.lower()
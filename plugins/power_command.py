@@ -1,22 +1,24 @@
 """
 Sample plugin implementing a power command for the calculator
 """
-from commands.command_interface import Command
+import operator
+from typing import List
+from commands.command_interface import NumericCommand
+from calculator.operations import register_operation, get_operation
 
-class PowerCommand(Command):
+# Make power available to Calculation, Calculator.batch and other callers
+register_operation('power', operator.pow)
+
+class PowerCommand(NumericCommand):
     """Command class for calculating one number raised to the power of another"""
     
-    def execute(self, *args, **kwargs) -> float:
+    def compute(self, nums: List[float]) -> float:
         """Execute power operation with provided arguments"""
-        if len(args) != 2:
+        if len(nums) != 2:
             raise ValueError("Power command requires exactly 2 numeric arguments")
         
-        # Convert string arguments to float
-        base = float(args[0])
-        exponent = float(args[1])
-        
         # Calculate power
-        return base ** exponent
+        return get_operation('power')(nums[0], nums[1])
     
     @property
     def description(self) -> str:
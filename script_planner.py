@@ -0,0 +1,115 @@
+"""
+Script planner folding and deduplicating pure calculations in command scripts
+"""
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Tuple
+
+from calculator.calculation import Calculation
+from calculator.result_cache import MISSING, call_key
+from calculator_app import CalculatorApp
+from commands.calculator_commands import ExitCommand
+from commands.command_interface import NumericCommand
+from utils.logger import get_logger
+
+class ScriptPlan:
+    """
+    ScriptPlan class splitting a script into constant calls and ordered lines.
+    Pure numeric calls with literal operands depend on nothing, so they can be
+    evaluated once, ahead of execution, and shared by every line making the
+    same call. All other lines, including those reading variables, may read or
+    change state (history, variables, sessions) and are executed as written.
+    """
+    def __init__(self):
+        """Initialize an empty plan"""
+        # Distinct pure calls in order of first use: (command name, operands) -> command
+        self.calls: Dict[Hashable, NumericCommand] = {}
+        # Call key of each planned line, or None for lines executed as written
+        self.line_calls: List[Optional[Hashable]] = []
+        # Results of calls folded at plan time; failed calls are not folded
+        self.results: Dict[Hashable, Any] = {}
+
+    @property
+    def pure_lines(self) -> int:
+        """Return the number of lines that are pure calls"""
+        return sum(1 for key in self.line_calls if key is not None)
+
+    def summary(self) -> Dict[str, int]:
+        """Return counts of lines, pure calls, distinct calls and folded results"""
+        return {
+            'lines': len(self.line_calls),
+            'pure_calls': self.pure_lines,
+            'unique_calls': len(self.calls),
+            'folded': len(self.results),
+        }
+
+
+class ScriptPlanner:
+    """
+    ScriptPlanner class building a ScriptPlan for an application's commands,
+    folding its constant calls with the application's own compute path and
+    running the lines that make them
+    """
+    def __init__(self, app: CalculatorApp):
+        """Initialize the planner for an application"""
+        self.app = app
+        self.logger = get_logger(__name__)
+
+    def _call_key(self, line: str) -> Tuple[Optional[Hashable], bool]:
+        """
+        Classify a line as a pure call
+        Returns its call key (or None) and whether the line ends the script
+        """
+        try:
+            command_name, args = self.app.parse_input(line)
+        except ValueError:
+            return None, False
+        command = self.app.commands.get(command_name)
+        if isinstance(command, ExitCommand):
+            return None, True
+        if not isinstance(command, NumericCommand) or not command.pure:
+            return None, False
+        try:
+            nums = command.parse_args(args)
+        except ValueError:
+            # Operands that are not literal numbers are resolved at execution time
+            return None, False
+        return call_key(command_name, nums), False
+
+    def plan(self, lines: Iterable[str]) -> ScriptPlan:
+        """Build the plan for a script and fold every distinct pure call once"""
+        plan = ScriptPlan()
+        for line in lines:
+            key, ends = self._call_key(line)
+            plan.line_calls.append(key)
+            if ends:
+                # Nothing after exit runs, so it is not worth folding
+                break
+            if key is not None and key not in plan.calls:
+                plan.calls[key] = self.app.commands[key[0]]
+
+        for key, command in plan.calls.items():
+            command_name, operands = key
+            try:
+                plan.results[key] = self.app.compute(command_name, command,
+                                                     [float(num) for num in operands])
+            except Exception:
+                # Failing calls are executed per line so each reports its own error
+                continue
+        self.logger.info(f"Planned script: {plan.summary()}")
+        return plan
+
+    def run_line(self, plan: ScriptPlan, index: int) -> Optional[str]:
+        """
+        Run the line at index if its call was folded, recording the calculation
+        in the session history as execution would, and return its output
+        Returns None for lines that must be executed as written
+        """
+        key = plan.line_calls[index] if index < len(plan.line_calls) else None
+        result = plan.results.get(key, MISSING) if key is not None else MISSING
+        if result is MISSING:
+            return None
+        command = plan.calls[key]
+        if command.operation is not None:
+            calculation = Calculation.from_operands(command.operation,
+                                                    [float(num) for num in key[1]])
+            self.app.session.history.add_calculation(calculation, result)
+        return str(result)
@@ -0,0 +1,3 @@
+"""
+Server package initialization
+"""
@@ -0,0 +1,61 @@
+"""
+Reference client for the binary calculation protocol
+"""
+import socket
+from typing import Iterable, List, Optional, Tuple
+
+from server.binary_protocol import (
+    HEADER, RESPONSE_RECORD, Operation, encode_request, decode_response
+)
+
+class BinaryCalculatorClient:
+    """
+    Blocking client sending batches of operations as binary frames
+    """
+    
+    def __init__(self, host: str = '127.0.0.1', port: int = 8766,
+                 unix_path: Optional[str] = None, timeout: Optional[float] = None):
+        """Connect to a binary calculator server over TCP or a Unix socket"""
+        if unix_path:
+            self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self._socket.settimeout(timeout)
+            self._socket.connect(unix_path)
+        else:
+            self._socket = socket.create_connection((host, port), timeout=timeout)
+            self._socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    
+    def _receive_exactly(self, size: int) -> bytes:
+        """
+        Read exactly size bytes from the socket
+        Raises ConnectionError if the server closes the connection early
+        """
+        buffer = bytearray(size)
+        view = memoryview(buffer)
+        received = 0
+        while received < size:
+            count = self._socket.recv_into(view[received:])
+            if count == 0:
+                raise ConnectionError("Connection closed by server")
+            received += count
+        return bytes(buffer)
+    
+    def calculate(self, operations: Iterable[Operation]) -> List[Tuple[int, float]]:
+        """
+        Send one frame of (operation, a, b) tuples and return (status, value) results
+        Operations are given by name (e.g. 'add') or by opcode
+        """
+        self._socket.sendall(encode_request(operations))
+        (count,) = HEADER.unpack(self._receive_exactly(HEADER.size))
+        return decode_response(self._receive_exactly(count * RESPONSE_RECORD.size))
+    
+    def close(self) -> None:
+        """Close the connection"""
+        self._socket.close()
+    
+    def __enter__(self) -> 'BinaryCalculatorClient':
+        """Use the client as a context manager"""
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        """Close the connection when leaving the context"""
+        self.close()
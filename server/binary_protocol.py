@@ -0,0 +1,69 @@
+"""
+Binary protocol module defining compact frames for high-rate calculation requests
+
+A request frame is a little-endian uint32 operation count followed by that many
+records of (uint8 opcode, float64 a, float64 b). The response frame is a uint32
+count followed by (uint8 status, float64 value) records in request order.
+"""
+import struct
+from typing import Iterable, List, Tuple, Union
+
+HEADER = struct.Struct('<I')
+REQUEST_RECORD = struct.Struct('<Bdd')
+RESPONSE_RECORD = struct.Struct('<Bd')
+
+# Upper bound on operations per frame so a bad header cannot force a huge read
+MAX_FRAME_OPERATIONS = 1 << 20
+
+# Wire opcodes for operations in the shared operation registry
+OPCODES = {
+    'add': 0,
+    'subtract': 1,
+    'multiply': 2,
+    'divide': 3,
+    'power': 4,
+}
+OPERATION_NAMES = {code: name for name, code in OPCODES.items()}
+
+# Response status codes
+STATUS_OK = 0
+STATUS_DIVIDE_BY_ZERO = 1
+STATUS_UNSUPPORTED = 2
+STATUS_ERROR = 3
+
+Operation = Tuple[Union[str, int], float, float]
+
+def _opcode(operation: Union[str, int]) -> int:
+    """
+    Return the opcode for an operation name or code
+    Raises ValueError for unknown operation names
+    """
+    if isinstance(operation, int):
+        return operation
+    try:
+        return OPCODES[operation]
+    except KeyError:
+        raise ValueError(f"Operation has no binary opcode: {operation}") from None
+
+def encode_request(operations: Iterable[Operation]) -> bytes:
+    """
+    Encode (operation, a, b) tuples as a request frame
+    Raises ValueError for unknown operations or oversized frames
+    """
+    records = [REQUEST_RECORD.pack(_opcode(operation), a, b) for operation, a, b in operations]
+    if len(records) > MAX_FRAME_OPERATIONS:
+        raise ValueError(f"Frame exceeds {MAX_FRAME_OPERATIONS} operations")
+    return HEADER.pack(len(records)) + b''.join(records)
+
+def decode_request(payload: bytes) -> List[Tuple[int, float, float]]:
+    """Decode the records of a request frame payload (without its header)"""
+    return list(REQUEST_RECORD.iter_unpack(payload))
+
+def encode_response(results: Iterable[Tuple[int, float]]) -> bytes:
+    """Encode (status, value) tuples as a response frame"""
+    records = [RESPONSE_RECORD.pack(status, value) for status, value in results]
+    return HEADER.pack(len(records)) + b''.join(records)
+
+def decode_response(payload: bytes) -> List[Tuple[int, float]]:
+    """Decode the records of a response frame payload (without its header)"""
+    return list(RESPONSE_RECORD.iter_unpack(payload))
@@ -0,0 +1,140 @@
+"""
+Asyncio server for the binary calculation protocol
+"""
+import argparse
+import asyncio
+import math
+import struct
+from typing import List, Optional
+
+from calculator.calculation import Calculation
+from calculator.calculations import Calculations, CalculationHistory
+from calculator.operations import get_operation
+from server.binary_protocol import (
+    HEADER, REQUEST_RECORD, RESPONSE_RECORD, MAX_FRAME_OPERATIONS, OPERATION_NAMES,
+    STATUS_OK, STATUS_DIVIDE_BY_ZERO, STATUS_UNSUPPORTED, STATUS_ERROR
+)
+from plugins.plugin_manager import PluginManager
+from utils.logger import get_logger
+
+class BinaryCalculatorServer:
+    """
+    Asyncio server decoding binary request frames straight into the operation
+    registry, without text parsing. Each connection may send any number of
+    frames; each is answered with one response frame in order.
+    """
+    
+    def __init__(self, record_history: bool = False):
+        """
+        Initialize the server
+        Plugins are loaded so their registered operations can be dispatched;
+        record_history stores every operation in the connection history at extra cost
+        """
+        self.logger = get_logger(__name__)
+        PluginManager().load_plugins()
+        self.record_history = record_history
+        self._server: Optional[asyncio.AbstractServer] = None
+    
+    async def start_tcp(self, host: str = '127.0.0.1', port: int = 8766) -> asyncio.AbstractServer:
+        """Start listening on a TCP address"""
+        self._server = await asyncio.start_server(self.handle_client, host, port)
+        self.logger.info(f"Binary calculator server listening on {host}:{port}")
+        return self._server
+    
+    async def start_unix(self, path: str) -> asyncio.AbstractServer:
+        """Start listening on a Unix domain socket"""
+        self._server = await asyncio.start_unix_server(self.handle_client, path)
+        self.logger.info(f"Binary calculator server listening on unix:{path}")
+        return self._server
+    
+    async def close(self) -> None:
+        """Stop accepting connections"""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+    
+    def process_frame(self, payload: bytes,
+                      history: Optional[CalculationHistory] = None) -> bytes:
+        """
+        Execute every operation in a request payload and return the response frame
+        Operations are recorded in history (the process-wide one by default)
+        when record_history is enabled
+        """
+        history = history if history is not None else Calculations
+        count = len(payload) // REQUEST_RECORD.size
+        response = bytearray(HEADER.size + count * RESPONSE_RECORD.size)
+        HEADER.pack_into(response, 0, count)
+        
+        # Resolve each opcode once per frame instead of once per operation
+        dispatch = {code: get_operation(name) for code, name in OPERATION_NAMES.items()}
+        pack_into = RESPONSE_RECORD.pack_into
+        offset = HEADER.size
+        nan = math.nan
+        for code, a, b in REQUEST_RECORD.iter_unpack(payload):
+            func = dispatch.get(code)
+            if func is None:
+                pack_into(response, offset, STATUS_UNSUPPORTED, nan)
+            else:
+                try:
+                    pack_into(response, offset, STATUS_OK, func(a, b))
+                    if self.record_history:
+                        history.add_calculation(Calculation(a, b, OPERATION_NAMES[code]))
+                except ZeroDivisionError:
+                    pack_into(response, offset, STATUS_DIVIDE_BY_ZERO, nan)
+                except (ArithmeticError, ValueError, TypeError, struct.error):
+                    pack_into(response, offset, STATUS_ERROR, nan)
+            offset += RESPONSE_RECORD.size
+        return bytes(response)
+    
+    async def handle_client(self, reader: asyncio.StreamReader,
+                            writer: asyncio.StreamWriter) -> None:
+        """Serve frames from one connection until it closes"""
+        peer = writer.get_extra_info('peername')
+        self.logger.info(f"Binary client connected: {peer}")
+        try:
+            while True:
+                try:
+                    header = await reader.readexactly(HEADER.size)
+                except asyncio.IncompleteReadError:
+                    break
+                (count,) = HEADER.unpack(header)
+                if count > MAX_FRAME_OPERATIONS:
+                    self.logger.warning(f"Rejected oversized frame of {count} operations from {peer}")
+                    break
+                payload = await reader.readexactly(count * REQUEST_RECORD.size)
+                writer.write(self.process_frame(payload))
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            self.logger.info(f"Binary client connection lost: {peer}")
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+async def serve(host: str, port: int, unix_path: Optional[str] = None,
+                record_history: bool = False) -> None:
+    """Run a binary calculator server until cancelled"""
+    server = BinaryCalculatorServer(record_history)
+    listener = await (server.start_unix(unix_path) if unix_path else server.start_tcp(host, port))
+    async with listener:
+        await listener.serve_forever()
+
+def main(argv: Optional[List[str]] = None):
+    """Command-line entry point for the binary calculator server"""
+    parser = argparse.ArgumentParser(description="Binary protocol calculator server")
+    parser.add_argument('--host', default='127.0.0.1', help="TCP host (default: 127.0.0.1)")
+    parser.add_argument('--port', type=int, default=8766, help="TCP port (default: 8766)")
+    parser.add_argument('--unix', metavar='PATH', help="listen on a Unix socket instead of TCP")
+    parser.add_argument('--record-history', action='store_true',
+                        help="store every operation in the calculation history")
+    options = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(options.host, options.port, options.unix, options.record_history))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
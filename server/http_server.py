@@ -0,0 +1,184 @@
+"""
+HTTP JSON API exposing the calculator command registry, built on the standard library
+"""
+import argparse
+import json
+import math
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+
+from calculator.session import Session, SessionManager
+from calculator_app import CalculatorApp, UnknownCommandError
+from server.text_server import DISCONNECT_COMMANDS
+from utils.logger import get_logger
+
+# Largest accepted request body, guarding against unbounded reads
+MAX_BODY_BYTES = 8 * 1024 * 1024
+
+class CalculatorHTTPServer(ThreadingHTTPServer):
+    """
+    HTTP server handling connections on a bounded pool of worker threads.
+    Each persistent (keep-alive) connection occupies one worker while open.
+    """
+    
+    def __init__(self, address: Tuple[str, int], app: Optional[CalculatorApp] = None,
+                 workers: int = 16):
+        """Initialize the server with the application whose commands are served"""
+        self.app = app or CalculatorApp()
+        self.sessions = SessionManager()
+        self.logger = get_logger(__name__)
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='calculator-http')
+        super().__init__(address, CalculatorRequestHandler)
+    
+    def process_request(self, request, client_address) -> None:
+        """Handle the connection on the worker pool instead of a new thread"""
+        self._pool.submit(self.process_request_thread, request, client_address)
+    
+    def server_close(self) -> None:
+        """Close the listening socket and wait for the worker pool"""
+        super().server_close()
+        self._pool.shutdown(wait=True)
+
+
+class CalculatorRequestHandler(BaseHTTPRequestHandler):
+    """
+    Request handler for the calculator JSON API:
+    GET /commands lists commands, POST /commands/<name> runs one command with
+    {"args": [...]}, and POST /batch runs a list of {"command", "args"} objects.
+    Requests carrying an X-Session-Id header run in that session, which is
+    created on first use and closed with DELETE /sessions/<id>.
+    """
+    # HTTP/1.1 keeps connections open between requests
+    protocol_version = 'HTTP/1.1'
+    # Idle keep-alive connections are closed so they release their worker
+    timeout = 30
+    
+    def log_message(self, format, *args) -> None:
+        """Send access logs to the application logger instead of stderr"""
+        self.server.logger.debug(f"{self.address_string()} - {format % args}")
+    
+    def _send_json(self, status: int, payload: Any) -> None:
+        """Write a JSON response with an explicit length so the connection can be reused"""
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        if self.close_connection:
+            self.send_header('Connection', 'close')
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def _read_json(self) -> Any:
+        """
+        Read and decode the JSON request body
+        Raises ValueError for missing, oversized or malformed bodies
+        """
+        length = int(self.headers.get('Content-Length') or 0)
+        if length <= 0:
+            raise ValueError("Request body is required")
+        if length > MAX_BODY_BYTES:
+            # The unread body would be parsed as the next request, so the
+            # connection cannot be kept alive
+            self.close_connection = True
+            raise ValueError("Request body too large")
+        return json.loads(self.rfile.read(length))
+    
+    def _session(self) -> Optional[Session]:
+        """Return the session named by the X-Session-Id header, if any"""
+        session_id = self.headers.get('X-Session-Id')
+        if not session_id:
+            return None
+        return self.server.sessions.get_or_create(session_id)
+    
+    def _run(self, command_name: str, args: Any,
+             session: Optional[Session] = None) -> Tuple[int, Dict[str, Any]]:
+        """Execute one command and return the HTTP status and JSON result object"""
+        if not isinstance(args, list):
+            return 400, {'error': "'args' must be a list"}
+        if command_name.lower() in DISCONNECT_COMMANDS:
+            return 400, {'error': f"Command not available over HTTP: {command_name}"}
+        try:
+            result = self.server.app.run_command(command_name, args, session)
+        except UnknownCommandError:
+            return 404, {'error': f"Unknown command: {command_name}"}
+        except (ValueError, ArithmeticError, TypeError) as e:
+            return 400, {'error': str(e)}
+        except Exception as e:
+            self.server.logger.error(f"Unexpected error in HTTP command {command_name}",
+                                     exc_info=True)
+            return 500, {'error': f"Unexpected error: {e}"}
+        if isinstance(result, complex):
+            # e.g. a fractional power of a negative number
+            return 400, {'error': f"Result is not a real number: {result}"}
+        if isinstance(result, float) and not math.isfinite(result):
+            # JSON has no representation for inf or NaN
+            result = str(result)
+        return 200, {'result': result}
+    
+    def do_GET(self) -> None:
+        """List the available commands"""
+        if self.path.rstrip('/') != '/commands':
+            self._send_json(404, {'error': f"Not found: {self.path}"})
+            return
+        commands = {name: {'description': command.description, 'usage': command.usage}
+                    for name, command in sorted(self.server.app.commands.items())
+                    if name not in DISCONNECT_COMMANDS}
+        self._send_json(200, {'commands': commands})
+    
+    def do_DELETE(self) -> None:
+        """Close a session"""
+        if not self.path.startswith('/sessions/'):
+            self._send_json(404, {'error': f"Not found: {self.path}"})
+            return
+        if self.server.sessions.close(self.path[len('/sessions/'):]):
+            self._send_json(200, {'closed': True})
+        else:
+            self._send_json(404, {'error': "Unknown session"})
+    
+    def do_POST(self) -> None:
+        """Execute a single command or a batch of commands"""
+        try:
+            body = self._read_json()
+        except (ValueError, UnicodeDecodeError) as e:
+            self._send_json(400, {'error': f"Invalid request body: {e}"})
+            return
+        
+        session = self._session()
+        if self.path.startswith('/commands/'):
+            args = body.get('args', []) if isinstance(body, dict) else None
+            status, payload = self._run(self.path[len('/commands/'):], args, session)
+            self._send_json(status, payload)
+        elif self.path.rstrip('/') == '/batch':
+            if not isinstance(body, list):
+                self._send_json(400, {'error': "Batch body must be a list of operations"})
+                return
+            results = []
+            for item in body:
+                if not isinstance(item, dict) or not isinstance(item.get('command'), str):
+                    results.append({'error': "Each operation needs a 'command' string"})
+                    continue
+                _, payload = self._run(item['command'], item.get('args', []), session)
+                results.append(payload)
+            self._send_json(200, results)
+        else:
+            self._send_json(404, {'error': f"Not found: {self.path}"})
+
+def main(argv: Optional[List[str]] = None):
+    """Command-line entry point for the calculator HTTP server"""
+    parser = argparse.ArgumentParser(description="Calculator HTTP JSON API")
+    parser.add_argument('--host', default='127.0.0.1', help="host (default: 127.0.0.1)")
+    parser.add_argument('--port', type=int, default=8080, help="port (default: 8080)")
+    parser.add_argument('--workers', type=int, default=16, help="worker threads (default: 16)")
+    options = parser.parse_args(argv)
+    server = CalculatorHTTPServer((options.host, options.port), workers=options.workers)
+    server.logger.info(f"Calculator HTTP API listening on {options.host}:{options.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    main()
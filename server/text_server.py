@@ -0,0 +1,150 @@
+"""
+Asyncio server exposing the calculator command registry over TCP or Unix sockets
+"""
+import argparse
+import asyncio
+import re
+from typing import List, Optional
+
+from calculator.session import Session, SessionManager
+from calculator_app import CalculatorApp
+from utils.logger import get_logger
+
+# Commands that end the connection instead of stopping the shared application
+DISCONNECT_COMMANDS = ('exit', 'quit')
+
+# Multi-line replies (menu, stats, cache, vars) are sent on one line with their
+# line breaks escaped, so every command is still answered by exactly one line
+_REPLY_ESCAPES = str.maketrans({'\\': '\\\\', '\n': '\\n', '\r': '\\r'})
+_ESCAPED = re.compile(r'\\(.)')
+_UNESCAPES = {'n': '\n', 'r': '\r'}
+
+def escape_reply(reply: str) -> str:
+    """Encode a reply as a single line: backslash, newline and carriage return are escaped"""
+    return reply.translate(_REPLY_ESCAPES)
+
+def unescape_reply(line: str) -> str:
+    """Decode a reply line produced by escape_reply"""
+    if '\\' not in line:
+        return line
+    return _ESCAPED.sub(lambda match: _UNESCAPES.get(match.group(1), match.group(1)), line)
+
+class CalculatorServer:
+    """
+    Asyncio server accepting newline-delimited commands and answering each with
+    one line (see escape_reply). Clients may pipeline many commands without waiting for answers;
+    each connection is processed in order and stops reading while its replies
+    cannot be written, so fast senders are slowed down to the reply rate.
+    Every connection gets its own session with a private history.
+    """
+    
+    def __init__(self, app: Optional[CalculatorApp] = None, line_limit: int = 64 * 1024,
+                 write_high_water: int = 64 * 1024):
+        """Initialize the server with the application whose commands are served"""
+        self.logger = get_logger(__name__)
+        self.app = app or CalculatorApp()
+        self.sessions = SessionManager()
+        self.line_limit = line_limit
+        self.write_high_water = write_high_water
+        self.connections = 0
+        self._server: Optional[asyncio.AbstractServer] = None
+    
+    async def start_tcp(self, host: str = '127.0.0.1', port: int = 8765) -> asyncio.AbstractServer:
+        """Start listening on a TCP address"""
+        self._server = await asyncio.start_server(self.handle_client, host, port,
+                                                  limit=self.line_limit)
+        self.logger.info(f"Calculator server listening on {host}:{port}")
+        return self._server
+    
+    async def start_unix(self, path: str) -> asyncio.AbstractServer:
+        """Start listening on a Unix domain socket"""
+        self._server = await asyncio.start_unix_server(self.handle_client, path,
+                                                       limit=self.line_limit)
+        self.logger.info(f"Calculator server listening on unix:{path}")
+        return self._server
+    
+    async def close(self) -> None:
+        """Stop accepting connections"""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+    
+    def respond(self, line: str, session: Optional[Session] = None) -> Optional[str]:
+        """
+        Execute one command line in a session and return the reply
+        Returns None if the client asked to disconnect
+        """
+        try:
+            stages = self.app.parse_pipeline(line)
+        except ValueError as e:
+            return f"Error: {e}"
+        if not stages:
+            return ""
+        if any(command_name in DISCONNECT_COMMANDS for command_name, _ in stages):
+            return None
+        if len(stages) > 1:
+            return self.app.execute_pipeline(stages, session)
+        command_name, args = stages[0]
+        return self.app.execute_command(command_name, args, session)
+    
+    async def handle_client(self, reader: asyncio.StreamReader,
+                            writer: asyncio.StreamWriter) -> None:
+        """Serve commands from one connection until it closes"""
+        peer = writer.get_extra_info('peername')
+        session = self.sessions.create()
+        self.connections += 1
+        self.logger.info(f"Client connected: {peer}")
+        writer.transport.set_write_buffer_limits(high=self.write_high_water)
+        try:
+            while True:
+                try:
+                    data = await reader.readline()
+                except ValueError:
+                    # Line longer than the stream limit
+                    writer.write(b"Error: line too long\n")
+                    break
+                if not data:
+                    break
+                try:
+                    reply = self.respond(data.decode('utf-8'), session)
+                except UnicodeDecodeError:
+                    reply = "Error: input is not valid UTF-8"
+                if reply is None:
+                    break
+                writer.write(escape_reply(reply).encode('utf-8') + b"\n")
+                # Backpressure: wait while the client is not reading its replies
+                await writer.drain()
+        except ConnectionError:
+            self.logger.info(f"Client connection lost: {peer}")
+        finally:
+            self.connections -= 1
+            self.sessions.close(session.id)
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+            self.logger.info(f"Client disconnected: {peer}")
+
+async def serve(host: str, port: int, unix_path: Optional[str] = None) -> None:
+    """Run a calculator server until cancelled"""
+    server = CalculatorServer()
+    listener = await (server.start_unix(unix_path) if unix_path else server.start_tcp(host, port))
+    async with listener:
+        await listener.serve_forever()
+
+def main(argv: Optional[List[str]] = None):
+    """Command-line entry point for the calculator server"""
+    parser = argparse.ArgumentParser(description="Calculator TCP/Unix socket server")
+    parser.add_argument('--host', default='127.0.0.1', help="TCP host (default: 127.0.0.1)")
+    parser.add_argument('--port', type=int, default=8765, help="TCP port (default: 8765)")
+    parser.add_argument('--unix', metavar='PATH', help="listen on a Unix socket instead of TCP")
+    options = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(options.host, options.port, options.unix))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Tests for the binary calculation protocol, server and client
+"""
+import asyncio
+import math
+import threading
+import pytest
+from calculator.calculations import Calculations
+from server.binary_protocol import (
+    HEADER, encode_request, decode_request, encode_response, decode_response,
+    STATUS_OK, STATUS_DIVIDE_BY_ZERO, STATUS_UNSUPPORTED, OPCODES
+)
+from server.binary_server import BinaryCalculatorServer
+from server.binary_client import BinaryCalculatorClient
+
+class TestBinaryProtocol:
+    """Test class for frame encoding"""
+    
+    def test_request_round_trip(self):
+        """Test encoding and decoding request frames"""
+        frame = encode_request([('add', 1.0, 2.0), (OPCODES['divide'], 3.0, 4.0)])
+        (count,) = HEADER.unpack_from(frame)
+        assert count == 2
+        assert decode_request(frame[HEADER.size:]) == [(0, 1.0, 2.0), (3, 3.0, 4.0)]
+        with pytest.raises(ValueError):
+            encode_request([('modulo', 1.0, 2.0)])
+    
+    def test_response_round_trip(self):
+        """Test encoding and decoding response frames"""
+        frame = encode_response([(STATUS_OK, 1.5), (STATUS_DIVIDE_BY_ZERO, math.nan)])
+        results = decode_response(frame[HEADER.size:])
+        assert results[0] == (STATUS_OK, 1.5)
+        assert results[1][0] == STATUS_DIVIDE_BY_ZERO
+    
+    def test_process_frame(self):
+        """Test executing a frame directly"""
+        server = BinaryCalculatorServer()
+        request = encode_request([('multiply', 6, 7), ('divide', 1, 0), (200, 1, 1),
+                                  ('power', 2, 10)])
+        results = decode_response(server.process_frame(request[HEADER.size:])[HEADER.size:])
+        assert results[0] == (STATUS_OK, 42.0)
+        assert results[1][0] == STATUS_DIVIDE_BY_ZERO
+        assert results[2][0] == STATUS_UNSUPPORTED
+        assert results[3] == (STATUS_OK, 1024.0)
+    
+    def test_record_history(self):
+        """Test that operations can be recorded in the calculation history"""
+        Calculations.clear_history()
+        server = BinaryCalculatorServer(record_history=True)
+        request = encode_request([('add', 1, 2), ('divide', 1, 0)])
+        server.process_frame(request[HEADER.size:])
+        assert [calc.operation for calc in Calculations.get_history()] == ['add']
+    
+    def test_client_server(self):
+        """Test the reference client against a running server"""
+        loop = asyncio.new_event_loop()
+        server = BinaryCalculatorServer()
+        listener = loop.run_until_complete(server.start_tcp('127.0.0.1', 0))
+        port = listener.sockets[0].getsockname()[1]
+        thread = threading.Thread(target=loop.run_forever, daemon=True)
+        thread.start()
+        try:
+            with BinaryCalculatorClient('127.0.0.1', port, timeout=5) as client:
+                results = client.calculate([('add', i, 1) for i in range(1000)])
+                assert [value for _, value in results] == [float(i + 1) for i in range(1000)]
+                assert client.calculate([('subtract', 5, 3)]) == [(STATUS_OK, 2.0)]
+                assert client.calculate([]) == []
+        finally:
+            asyncio.run_coroutine_threadsafe(server.close(), loop).result(5)
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join(5)
+            loop.close()
+    
+    def test_client_server_records_history(self):
+        """Test that --record-history records connection operations in the calculation history"""
+        Calculations.clear_history()
+        loop = asyncio.new_event_loop()
+        server = BinaryCalculatorServer(record_history=True)
+        listener = loop.run_until_complete(server.start_tcp('127.0.0.1', 0))
+        port = listener.sockets[0].getsockname()[1]
+        thread = threading.Thread(target=loop.run_forever, daemon=True)
+        thread.start()
+        try:
+            with BinaryCalculatorClient('127.0.0.1', port, timeout=5) as client:
+                client.calculate([('add', 1, 2), ('multiply', 3, 4)])
+            assert [calc.operation for calc in Calculations.get_history()] == ['add', 'multiply']
+        finally:
+            asyncio.run_coroutine_threadsafe(server.close(), loop).result(5)
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join(5)
+            loop.close()
+            Calculations.clear_history()
@@ -55,4 +55,16 @@ class TestCalculation:
     def test_perform_invalid_operation(self, setup_calculations):
         """Test invalid operation raises exception"""
         with pytest.raises(ValueError):
-            setup_calculations['invalid'].perform()
\ No newline at end of file
+            setup_calculations['invalid'].perform()
+    
+    def test_multi_operand_calculation(self):
+        """Test variadic calculations applying the operation left to right"""
+        calc = Calculation.from_operands('subtract', [10, 2, 3])
+        assert calc.operands == (10, 2, 3)
+        assert calc.perform() == 5
+        assert repr(calc) == "Calculation(10, 2, 3, subtract)"
+        assert calc != Calculation(10, 2, 'subtract')
+        assert calc == Calculation(10, 2, 'subtract', [3])
+        assert hash(calc) == hash(Calculation(10, 2, 'subtract', (3,)))
+        with pytest.raises(ValueError):
+            Calculation.from_operands('add', [1])
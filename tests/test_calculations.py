@@ -97,4 +97,209 @@ class TestCalculations:
         
         # Test finding non-existent operations
         power_operations = Calculations.find_by_operation('power')
-        assert len(power_operations) == 0
\ No newline at end of file
+        assert len(power_operations) == 0
+    def test_find_by_operand(self, setup_calculations):
+        """Test finding calculations involving an operand"""
+        for calc in setup_calculations.values():
+            Calculations.add_calculation(calc)
+
+        assert Calculations.find_by_operand(5) == [setup_calculations['subtract'],
+                                                   setup_calculations['divide']]
+        assert Calculations.find_by_operand(2) == [setup_calculations['add']]
+        assert Calculations.find_by_operand(99) == []
+
+    def test_find_by_result_range(self, setup_calculations):
+        """Test finding calculations by result range, ordered by result"""
+        for calc in setup_calculations.values():
+            Calculations.add_calculation(calc)
+        Calculations.add_calculation(Calculation(1, 0, 'divide'))
+
+        # Results: add=4, subtract=5, multiply=12, divide=4; 1/0 is not indexed
+        assert Calculations.find_by_result_range(4, 5) == [setup_calculations['add'],
+                                                           setup_calculations['divide'],
+                                                           setup_calculations['subtract']]
+        assert Calculations.find_by_result_range(10, 100) == [setup_calculations['multiply']]
+        assert Calculations.find_by_result_range(100, 200) == []
+
+    def test_result_range_after_interleaved_appends(self, setup_calculations):
+        """Test that results appended out of order are sorted for each range query"""
+        for value in (5, 1, 3):
+            Calculations.add_calculation(Calculation(value, 0, 'add'))
+        assert [calc.a for calc in Calculations.find_by_result_range(0, 10)] == [1, 3, 5]
+        for value in (4, 1, 2):
+            Calculations.add_calculation(Calculation(value, 0, 'add'))
+        assert [calc.a for calc in Calculations.find_by_result_range(1, 4)] == [1, 1, 2, 3, 4]
+
+    def test_clear_history_resets_indexes(self, setup_calculations):
+        """Test that clearing history also clears the indexes"""
+        for calc in setup_calculations.values():
+            Calculations.add_calculation(calc)
+        Calculations.clear_history()
+
+        assert Calculations.find_by_operation('add') == []
+        assert Calculations.find_by_operand(2) == []
+        assert Calculations.find_by_result_range(0, 100) == []
+
+        Calculations.add_calculation(setup_calculations['multiply'])
+        assert Calculations.find_by_operation('multiply') == [setup_calculations['multiply']]
+
+    def test_indexes_cover_unindexed_entries(self, setup_calculations):
+        """Test that entries appended directly to the store are indexed on query"""
+        Calculations.history.append(setup_calculations['add'])
+        Calculations.add_calculation(setup_calculations['subtract'])
+
+        assert Calculations.find_by_operation('add') == [setup_calculations['add']]
+        assert Calculations.find_by_operation('subtract') == [setup_calculations['subtract']]
+
+    def test_get_history_is_a_view(self, setup_calculations):
+        """Test that get_history returns a non-copying, bounded view"""
+        Calculations.add_calculation(setup_calculations['add'])
+        Calculations.add_calculation(setup_calculations['subtract'])
+
+        view = Calculations.get_history()
+        Calculations.add_calculation(setup_calculations['multiply'])
+
+        # Entries appended after the view was created are not part of it
+        assert len(view) == 2
+        assert list(view) == [setup_calculations['add'], setup_calculations['subtract']]
+        assert view[-1] == setup_calculations['subtract']
+        assert not hasattr(view, 'append')
+
+    def test_pagination(self, setup_calculations):
+        """Test offset/limit, page and tail views"""
+        for calc in setup_calculations.values():
+            Calculations.add_calculation(calc)
+
+        assert Calculations.get_history(1, 2) == [setup_calculations['subtract'],
+                                                  setup_calculations['multiply']]
+        assert Calculations.page(1, 3) == [setup_calculations['divide']]
+        assert Calculations.page(5, 3) == []
+        assert Calculations.tail(2) == [setup_calculations['multiply'],
+                                        setup_calculations['divide']]
+        assert Calculations.tail(10) == list(setup_calculations.values())
+        assert Calculations.get_history()[1:3][0] == setup_calculations['subtract']
+
+    def test_reverse_iteration(self, setup_calculations):
+        """Test iterating history newest first"""
+        for calc in setup_calculations.values():
+            Calculations.add_calculation(calc)
+
+        assert list(Calculations.iter_history(reverse=True)) == \
+            list(reversed(list(setup_calculations.values())))
+        assert list(Calculations.iter_history()) == list(setup_calculations.values())
+
+    def test_iterate_while_appending(self, setup_calculations):
+        """Test that appending during iteration is safe"""
+        Calculations.add_calculation(setup_calculations['add'])
+        seen = []
+        for calc in Calculations.iter_history():
+            seen.append(calc)
+            Calculations.add_calculation(setup_calculations['subtract'])
+        assert seen == [setup_calculations['add']]
+
+    def test_snapshot(self, setup_calculations):
+        """Test that snapshot returns an independent copy"""
+        Calculations.add_calculation(setup_calculations['add'])
+        snapshot = Calculations.snapshot()
+        Calculations.add_calculation(setup_calculations['subtract'])
+        assert snapshot == [setup_calculations['add']]
+
+    def test_get_stats(self, setup_calculations):
+        """Test running statistics over the history"""
+        for calc in setup_calculations.values():
+            Calculations.add_calculation(calc)
+        Calculations.add_calculation(Calculation(1, 0, 'divide'))
+
+        stats = Calculations.get_stats()
+        assert stats['count'] == 5
+        assert stats['operations'] == {'add': 1, 'subtract': 1, 'multiply': 1, 'divide': 2}
+        # Results 4, 5, 12, 4; the division by zero has no result
+        assert stats['results']['count'] == 4
+        assert stats['results']['mean'] == 6.25
+        assert stats['results']['variance'] == pytest.approx(44.75 / 3)
+        assert stats['results']['min'] == 4
+        assert stats['results']['max'] == 12
+        assert stats['operands']['count'] == 10
+        assert stats['operands']['min'] == 0
+        assert stats['operands']['max'] == 20
+
+        Calculations.clear_history()
+        stats = Calculations.get_stats()
+        assert stats['count'] == 0
+        assert stats['results']['mean'] is None
+
+    def test_get_stats_skips_non_finite_values(self, setup_calculations):
+        """Test that NaN and infinite operands do not poison the running statistics"""
+        Calculations.add_calculation(Calculation(float('nan'), 1.0, 'add'))
+        Calculations.add_calculation(Calculation(float('inf'), 2.0, 'add', (float('-inf'),)))
+        Calculations.add_calculation(Calculation(2.0, 4.0, 'add'))
+
+        stats = Calculations.get_stats()
+        assert stats['count'] == 3
+        # Finite operands 1, 2, 2 and 4; the only finite result is 6
+        assert stats['operands']['count'] == 4
+        assert stats['operands']['mean'] == 2.25
+        assert stats['operands']['variance'] == pytest.approx(1.5833333)
+        assert stats['results']['count'] == 1
+        assert stats['results']['mean'] == 6.0
+
+    def test_concurrent_add_calculation(self, setup_calculations):
+        """Test that concurrent appends are all recorded in a consistent order"""
+        import threading
+
+        def worker(operation):
+            for i in range(200):
+                Calculations.add_calculation(Calculation(i, 1, operation))
+
+        threads = [threading.Thread(target=worker, args=(operation,))
+                   for operation in ['add', 'subtract', 'multiply', 'divide']]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(Calculations.get_history()) == 800
+        assert Calculations.get_stats()['count'] == 800
+        for operation in ['add', 'subtract', 'multiply', 'divide']:
+            found = Calculations.find_by_operation(operation)
+            # Each thread's calculations keep the order in which it added them
+            assert [calc.a for calc in found] == list(range(200))
+
+    def test_view_reads_take_the_history_lock(self, setup_calculations):
+        """Test that reading a view waits for a writer holding the history lock"""
+        import threading
+        Calculations.add_calculation(setup_calculations['add'])
+        view = Calculations.get_history()
+        done = threading.Event()
+        reader = threading.Thread(target=lambda: (list(view), done.set()))
+        with Calculations._lock:
+            reader.start()
+            assert not done.wait(0.1)
+        reader.join()
+        assert done.is_set()
+
+    def test_iterate_while_flushing_from_threads(self, tmp_path):
+        """Test that views over a mapped log stay consistent while another thread appends"""
+        import threading
+        from calculator.calculations import CalculationHistory
+        from calculator.history_log import MappedHistory
+        history = CalculationHistory(MappedHistory(str(tmp_path / "history.bin"),
+                                                   fsync='never', flush_every=7))
+        errors = []
+
+        def writer():
+            for i in range(3000):
+                history.add_calculation(Calculation(i, i, 'add'), i * 2)
+
+        thread = threading.Thread(target=writer)
+        thread.start()
+        while thread.is_alive():
+            try:
+                entries = list(history.get_history())
+                assert [calc.a for calc in entries] == list(range(len(entries)))
+            except Exception as e:
+                errors.append(e)
+                break
+        thread.join()
+        history.history.close()
+        assert errors == []
@@ -41,4 +41,54 @@ class TestCalculator:
         calc = Calculator.create_calculation(5, 2, "add")
         assert calc.a == 5
         assert calc.b == 2
-        assert calc.operation == "add"
\ No newline at end of file
+        assert calc.operation == "add"
+
+class TestCalculatorBatch:
+    """Test cases for the vectorized Calculator.batch API"""
+
+    def test_batch_sequences(self):
+        """Test element-wise operations over plain sequences"""
+        assert Calculator.batch('add', [1, 2, 3], [4, 5, 6]) == [5, 7, 9]
+        assert Calculator.batch('subtract', [5, 5], [1, 2]) == [4, 3]
+        assert Calculator.batch('multiply', (2, 3), (4, 5)) == [8, 15]
+        assert Calculator.batch('divide', [10, 9], [2, 3]) == [5.0, 3.0]
+
+    def test_batch_broadcasts_scalars(self):
+        """Test that scalar operands are broadcast against sequences"""
+        assert Calculator.batch('multiply', [1, 2, 3], 2) == [2, 4, 6]
+        assert Calculator.batch('subtract', 10, [1, 2]) == [9, 8]
+        assert Calculator.batch('add', 1, 2) == [3]
+
+    def test_batch_array_input(self):
+        """Test that array.array input returns a compact double array"""
+        from array import array
+        result = Calculator.batch('add', array('d', [1.0, 2.0]), 1.5)
+        assert isinstance(result, array)
+        assert result.typecode == 'd'
+        assert list(result) == [2.5, 3.5]
+
+    def test_batch_divide_by_zero_per_element(self):
+        """Test that division by zero yields NaN and is reported in the mask"""
+        import math
+        results, zero_mask = Calculator.batch('divide', [1, 2, 3], [1, 0, 3], mask=True)
+        assert results[0] == 1.0
+        assert math.isnan(results[1])
+        assert results[2] == 1.0
+        assert zero_mask == [False, True, False]
+
+    def test_batch_errors(self):
+        """Test invalid operations and mismatched lengths"""
+        with pytest.raises(ValueError):
+            Calculator.batch('modulo', [1], [1])
+        with pytest.raises(ValueError):
+            Calculator.batch('add', [1, 2], [1])
+
+    def test_batch_numpy(self):
+        """Test the NumPy vectorized path when NumPy is installed"""
+        np = pytest.importorskip("numpy")
+        results, zero_mask = Calculator.batch(
+            'divide', np.array([4.0, 1.0]), np.array([2.0, 0.0]), mask=True
+        )
+        assert results[0] == 2.0
+        assert np.isnan(results[1])
+        assert zero_mask.tolist() == [False, True]
@@ -46,6 +46,18 @@ class TestCalculatorApp:
         assert cmd == "divide"
         assert args == ["10", "2.5"]
     
+    def test_parse_input_matches_shlex(self):
+        """Test that the fast path and the shlex fallback agree"""
+        import shlex
+        app = CalculatorApp()
+        lines = ["add 2 3", "  multiply\t4  5\n", "divide 1e3 -2.5", "menu", "   ",
+                 "add 'a b' 2", 'add "1" 2', "add 1\\ 2 3", "add 1\x0b2", "add 1\xa02"]
+        for line in lines:
+            parts = shlex.split(line)
+            expected = (parts[0].lower(), parts[1:]) if parts else ('', [])
+            assert app.parse_input(line) == expected
+        assert app.parse_input("ADD 1 2") == ("add", ["1", "2"])
+    
     def test_execute_command_valid(self):
         """Test execution of valid commands"""
         app = CalculatorApp()
@@ -89,6 +101,67 @@ class TestCalculatorApp:
         assert "Error" in result
         assert "divide by zero" in result.lower()
     
+    def test_variadic_calls_record_all_operands(self):
+        """Test that a variadic call is stored as one multi-operand record"""
+        from calculator.calculation import Calculation
+        from calculator.calculations import Calculations
+        
+        Calculations.clear_history()
+        app = CalculatorApp()
+        assert app.execute_command("subtract", ["10", "2", "3"]) == "5.0"
+        assert list(Calculations.get_history()) == [Calculation(10, 2, 'subtract', (3,))]
+        assert Calculations.get_stats()['results']['mean'] == 5.0
+        assert Calculations.find_by_operand(3) == [Calculation(10, 2, 'subtract', (3,))]
+        Calculations.clear_history()
+    
+    def test_invalid_number_is_reported(self):
+        """Test that arguments are validated once with a clear message"""
+        from calculator.calculations import Calculations
+        
+        Calculations.clear_history()
+        app = CalculatorApp()
+        assert app.execute_command("add", ["1", "two"]) == "Error: Invalid number: 'two'"
+        assert app.execute_command("power", ["x", "2"]) == "Error: Invalid number: 'x'"
+        assert len(Calculations.get_history()) == 0
+    
+    def test_pipeline(self):
+        """Test that stages pass native results and are recorded separately"""
+        from calculator.calculation import Calculation
+        from calculator.session import Session
+        
+        app = CalculatorApp()
+        session = Session()
+        assert app.execute_line("add 1 2 | multiply 3 | divide 4", session) == "2.25"
+        assert list(session.history.get_history()) == [
+            Calculation(1, 2, 'add'), Calculation(3, 3, 'multiply'), Calculation(9, 4, 'divide')]
+        # The exact quotient is passed on, not its printed form
+        assert app.execute_line("divide 1 3 | subtract 0", session) == str(1 / 3)
+        assert session.history.get_latest().a == 1 / 3
+        assert app.run_pipeline([('divide', ['2', '3']), ('multiply', ['3'])], session) == 2.0
+    
+    def test_pipeline_errors(self):
+        """Test malformed and failing pipelines"""
+        app = CalculatorApp()
+        assert app.execute_line("add 1 2 |") == "Error: Empty pipeline stage"
+        assert app.execute_line("add 1 2 || multiply 2") == "Error: Empty pipeline stage"
+        assert app.execute_line("add 1 2 | divide 0") == "Error: Cannot divide by zero"
+        assert app.execute_line("stats | add 1") == "Error: Cannot pipe the output of stats into add"
+        assert app.execute_line("add 1 1 | bogus").startswith("Unknown command: bogus")
+        assert app.execute_line('add "1" 2 | multiply "2"') == "6.0"
+        assert app.parse_pipeline("  ") == []
+    
+    def test_quoted_pipe_is_an_argument(self):
+        """Test that only unquoted, unescaped '|' characters separate stages"""
+        app = CalculatorApp()
+        assert app.parse_pipeline('add "|" 2') == [('add', ['|', '2'])]
+        assert app.execute_line('add "|" 2') == "Error: Invalid number: '|'"
+        assert app.execute_line("add 1 '2|3'") == "Error: Invalid number: '2|3'"
+        assert app.parse_pipeline('add 1 \\| 2') == [('add', ['1', '|', '2'])]
+        assert app.parse_pipeline("add 'a\\' | multiply 2") == [('add', ['a\\']),
+                                                                 ('multiply', ['2'])]
+        assert app.execute_line('add "1" 2 |') == "Error: Empty pipeline stage"
+        assert app.execute_line('add "1 | 2') == "Error: No closing quotation"
+    
     def test_exit_command(self):
         """Test exit command functionality"""
         app = CalculatorApp()
@@ -118,3 +191,90 @@ class TestCalculatorApp:
         
         # Verify the app tried to process the command
         assert mock_print.call_count > 2  # Welcome message + menu + result
+    
+    def test_stats_command(self):
+        """Test that the stats command reflects executed calculations"""
+        from calculator.calculations import Calculations
+        Calculations.clear_history()
+        app = CalculatorApp()
+        app.execute_command("add", ["2", "3"])
+        result = app.execute_command("stats", [])
+        assert "Calculations: 1" in result
+        assert "add=1" in result
+    
+    def test_execute_command_from_threads(self):
+        """Test executing calculation commands from worker threads"""
+        import threading
+        from calculator.calculations import Calculations
+        Calculations.clear_history()
+        app = CalculatorApp()
+        results = []
+        
+        def worker():
+            for _ in range(50):
+                results.append(app.execute_command("multiply", ["2", "3"]))
+        
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        assert results == ["6.0"] * 200
+        assert len(Calculations.find_by_operation('multiply')) == 200
+    
+    def test_error_count_from_threads(self):
+        """Test that errors raised on several threads are all counted"""
+        import threading
+        app = CalculatorApp()
+        
+        def worker():
+            for _ in range(500):
+                app.execute_command("divide", ["1", "0"])
+        
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        assert app.error_count == 2000
+    
+    def test_run_script(self, capsys):
+        """Test non-interactive script execution from a stream"""
+        import io
+        app = CalculatorApp()
+        script = io.StringIO("add 2 3\n\nmultiply 2 4\nunknown 1\ndivide 1 0\nadd \"1\n")
+        output = io.StringIO()
+        
+        summary = app.run_script(script, output, buffer_lines=2)
+        
+        lines = output.getvalue().splitlines()
+        assert lines[0] == "5.0"
+        assert lines[1] == "8.0"
+        assert "Unknown command" in lines[2]
+        assert "Error" in lines[3]
+        assert lines[4].startswith("Error")
+        assert "Welcome" not in output.getvalue()
+        assert summary['commands'] == 5
+        assert summary['errors'] == 3
+        assert "Processed 5 commands" in capsys.readouterr().err
+    
+    def test_run_script_stops_at_exit(self):
+        """Test that the exit command ends script execution"""
+        import io
+        app = CalculatorApp()
+        output = io.StringIO()
+        summary = app.run_script(io.StringIO("add 1 1\nexit\nadd 2 2\n"), output)
+        assert output.getvalue().splitlines() == ["2.0", "Exiting calculator application. Goodbye!"]
+        assert summary['commands'] == 2
+    
+    def test_main_script_option(self, tmp_path, capsys):
+        """Test running a script file through the command-line entry point"""
+        from calculator_app import main
+        script = tmp_path / "commands.txt"
+        script.write_text("subtract 10 4\nmultiply 3 3\n")
+        main(["--script", str(script)])
+        out = capsys.readouterr().out
+        assert out.splitlines()[-2:] == ["6.0", "9.0"]
+        assert "calculator>" not in out
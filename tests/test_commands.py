@@ -4,8 +4,9 @@ Tests for the calculator commands implementation
 import pytest
 from commands.calculator_commands import (
     AddCommand, SubtractCommand, MultiplyCommand, 
-    DivideCommand, MenuCommand, ExitCommand
+    DivideCommand, MenuCommand, ExitCommand, StatsCommand, CacheCommand
 )
+from calculator.result_cache import ResultCache
 from commands.command_interface import Command
 
 class TestCalculatorCommands:
@@ -146,3 +147,45 @@ class TestCalculatorCommands:
         assert len(command.description) > 0
         assert isinstance(command.usage, str)
         assert len(command.usage) > 0
+    
+    def test_stats_command(self):
+        """Test stats command output"""
+        from calculator.calculation import Calculation
+        from calculator.calculations import Calculations
+        
+        Calculations.clear_history()
+        Calculations.add_calculation(Calculation(2, 4, 'add'))
+        Calculations.add_calculation(Calculation(6, 3, 'divide'))
+        
+        command = StatsCommand()
+        result = command.execute()
+        assert "Calculations: 2" in result
+        assert "add=1, divide=1" in result
+        assert "Results: count=2 mean=4.0" in result
+        assert "min=2.0 max=6" in result
+        
+        Calculations.clear_history()
+        assert "Operations: none" in command.execute()
+        assert len(command.description) > 0
+        assert command.usage == "stats"
+    
+    def test_cache_command(self):
+        """Test cache command output and clearing"""
+        assert "disabled" in CacheCommand(None).execute()
+        
+        cache = ResultCache(2)
+        key = ResultCache.make_key('add', ['1', '2'])
+        cache.get(key)
+        cache.put(key, 3.0)
+        cache.get(key)
+        command = CacheCommand(cache)
+        result = command.execute()
+        assert "Entries: 1/2" in result
+        assert "Hits: 1, misses: 1, evictions: 0" in result
+        assert "Hit rate: 50.0%" in result
+        
+        assert command.execute('clear') == "Result cache cleared"
+        assert len(cache) == 0
+        with pytest.raises(ValueError):
+            command.execute('bogus')
+        assert command.usage == "cache [clear]"
@@ -0,0 +1,104 @@
+"""
+Tests for the infix expression engine
+"""
+import re
+import pytest
+import plugins.power_command  # registers the power operation used by '^'
+from calculator.expression import (
+    CompiledExpression, ExpressionEngine, ExpressionError, tokenize
+)
+from calculator.session import Session
+from calculator_app import CalculatorApp
+
+class TestExpression:
+    """Test class for expression parsing, compilation and caching"""
+    
+    @pytest.mark.parametrize("text, expected", [
+        ("1 + 2 * 3", 7.0),
+        ("(1 + 2) * 3", 9.0),
+        ("10 - 4 - 3", 3.0),
+        ("2 ^ 3 ^ 2", 512.0),
+        ("-2 ^ 2", -4.0),
+        ("1 - -1", 2.0),
+        ("+3 * -(1 + 1)", -6.0),
+        ("1.5e2 / .5", 300.0),
+        ("power(2, 3) + add(1, 2, 3)", 14.0),
+        ("subtract(10, 2, 3)", 5.0),
+    ])
+    def test_evaluate(self, text, expected):
+        """Test precedence, associativity, unary operators and calls"""
+        assert CompiledExpression(text).evaluate() == expected
+    
+    def test_variables(self):
+        """Test evaluating a compiled expression with new bindings"""
+        compiled = CompiledExpression("(a + b) * c / d")
+        assert compiled.variables == frozenset({'a', 'b', 'c', 'd'})
+        assert compiled.evaluate({'a': 1, 'b': 2, 'c': 3, 'd': 4}) == 2.25
+        assert compiled.evaluate({'a': 2, 'b': 2, 'c': 1, 'd': 8}) == 0.5
+        with pytest.raises(ExpressionError, match="Unknown variable: c, d"):
+            compiled.evaluate({'a': 1, 'b': 2})
+    
+    @pytest.mark.parametrize("text, message", [
+        ("", "end of expression"),
+        ("1 +", "end of expression at position 3"),
+        ("(1", "expected ')'"),
+        ("1 2", "Unexpected '2' at position 2"),
+        ("1 $ 2", "Unexpected character '$' at position 2"),
+        ("foo(1, 2)", "Unknown function: foo"),
+        ("add(1)", "requires at least 2 arguments"),
+    ])
+    def test_syntax_errors(self, text, message):
+        """Test that malformed expressions raise ExpressionError with a position"""
+        with pytest.raises(ExpressionError, match=re.escape(message)):
+            CompiledExpression(text)
+    
+    def test_runtime_errors_are_deferred(self):
+        """Test that constant subexpressions failing to fold raise when evaluated"""
+        compiled = CompiledExpression("1 / 0")
+        with pytest.raises(ZeroDivisionError):
+            compiled.evaluate()
+    
+    def test_tokenize(self):
+        """Test token kinds and positions"""
+        assert tokenize("a*(2)") == [('name', 'a', 0), ('symbol', '*', 1), ('symbol', '(', 2),
+                                     ('number', '2', 3), ('symbol', ')', 4), ('end', '', 5)]
+    
+    def test_engine_caches_compiled_expressions(self):
+        """Test that repeated expressions are compiled once and the cache is bounded"""
+        engine = ExpressionEngine(cache_size=2)
+        first = engine.compile("x * 2")
+        assert engine.compile(" x * 2 ") is first
+        assert engine.evaluate("x * 2", {'x': 4}) == 8.0
+        engine.compile("1 + 1")
+        engine.compile("2 + 2")
+        assert engine.compile("x * 2") is not first
+        assert engine.cache.evictions >= 1
+        assert ExpressionEngine(cache_size=0).evaluate("1 + 1") == 2.0
+    
+    def test_eval_command(self):
+        """Test the eval and expr commands through the application"""
+        app = CalculatorApp()
+        session = Session()
+        session.variables['rate'] = 0.5
+        assert app.execute_line("eval (2 + 3) * power(2, 4) / 5") == "16.0"
+        assert app.execute_line("expr 100 * rate", session) == "50.0"
+        assert app.execute_line("eval 1 / 0") == "Error: Cannot divide by zero"
+        assert app.execute_line("eval rate") == "Error: Unknown variable: rate"
+        assert app.execute_line("eval") == "Error: Eval command requires an expression"
+    
+    @pytest.mark.parametrize("operation, operands", [
+        ("add", "0.1 0.2 0.3"),
+        ("multiply", "1e200 1e200 1e-200"),
+        ("subtract", "10 1 2 3"),
+    ])
+    def test_eval_matches_commands(self, operation, operands):
+        """Test that variadic calls reduce their arguments exactly like the commands"""
+        app = CalculatorApp()
+        session = Session()
+        names = []
+        for i, operand in enumerate(operands.split()):
+            session.variables[f"v{i}"] = float(operand)
+            names.append(f"v{i}")
+        expected = app.execute_line(f"{operation} {operands}")
+        assert app.execute_line(f"eval {operation}({operands.replace(' ', ', ')})") == expected
+        assert app.execute_line(f"eval {operation}({', '.join(names)})", session) == expected
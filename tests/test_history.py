@@ -0,0 +1,323 @@
+"""
+Tests for the calculation history storage backends
+"""
+import pytest
+from calculator.calculation import Calculation
+from calculator.calculations import Calculations, CalculationHistory, create_history_store
+from calculator.history import (ColumnarHistory, HistoryChangedError, HistoryView,
+                                RingBufferHistory)
+
+class TestColumnarHistory:
+    """Test cases for ColumnarHistory"""
+
+    @pytest.fixture
+    def store(self):
+        """Fixture providing a columnar store with a few entries"""
+        store = ColumnarHistory()
+        store.append(Calculation(1, 2, 'add'))
+        store.append(Calculation(6, 3, 'divide'))
+        store.append(Calculation(4, 5, 'add'))
+        return store
+
+    def test_append_and_read(self, store):
+        """Test that entries are materialized as equal Calculation objects"""
+        assert len(store) == 3
+        assert store[0] == Calculation(1.0, 2.0, 'add')
+        assert store[-1] == Calculation(4.0, 5.0, 'add')
+        assert store[1].perform() == 2.0
+        assert store[0:2] == [Calculation(1, 2, 'add'), Calculation(6, 3, 'divide')]
+        with pytest.raises(IndexError):
+            store[3]
+
+    def test_iteration(self, store):
+        """Test lazy iteration in insertion order"""
+        assert [calc.operation for calc in store] == ['add', 'divide', 'add']
+
+    def test_find_by_operation(self, store):
+        """Test searching the operation-code column"""
+        assert store.find_by_operation('add') == [Calculation(1, 2, 'add'), Calculation(4, 5, 'add')]
+        assert store.find_by_operation('power') == []
+
+    def test_clear(self, store):
+        """Test clearing all columns"""
+        store.clear()
+        assert len(store) == 0
+        assert store.nbytes == 0
+
+    def test_compact_memory(self, store):
+        """Test that each entry uses two doubles and one code byte"""
+        assert store.nbytes == 3 * 17
+
+    def test_multi_operand_entries(self, store):
+        """Test that operands beyond the second are stored and materialized"""
+        store.append(Calculation(1, 2, 'add', (3, 4)))
+        assert store[3] == Calculation(1.0, 2.0, 'add', (3.0, 4.0))
+        assert store[3].perform() == 10.0
+        assert store[0].rest == ()
+
+    def test_calculation_has_no_dict(self):
+        """Test that Calculation instances are slotted"""
+        assert not hasattr(Calculation(1, 2, 'add'), '__dict__')
+
+
+class TestHistoryBackends:
+    """Test cases for selecting the Calculations history backend"""
+
+    def test_create_history_store(self):
+        """Test creating stores by backend name"""
+        assert create_history_store('list') == []
+        assert isinstance(create_history_store('columnar'), ColumnarHistory)
+        with pytest.raises(ValueError):
+            create_history_store('unknown')
+
+    def test_calculations_with_columnar_store(self):
+        """Test the Calculations API on top of a columnar store"""
+        original = Calculations.history
+        Calculations.set_history_store(ColumnarHistory())
+        try:
+            Calculations.add_calculation(Calculation(2, 3, 'multiply'))
+            Calculations.add_calculation(Calculation(2, 3, 'add'))
+            assert Calculations.get_history() == [Calculation(2, 3, 'multiply'),
+                                                  Calculation(2, 3, 'add')]
+            assert Calculations.get_latest() == Calculation(2, 3, 'add')
+            assert Calculations.find_by_operation('add') == [Calculation(2, 3, 'add')]
+            Calculations.clear_history()
+            assert Calculations.get_latest() is None
+        finally:
+            Calculations.set_history_store(original)
+
+
+class TestRingBufferHistory:
+    """Test cases for RingBufferHistory"""
+
+    def test_bounded_without_spill(self):
+        """Test that only the newest entries are kept without a spill file"""
+        store = RingBufferHistory(2)
+        for i in range(5):
+            store.append(Calculation(i, i, 'add'))
+        assert len(store) == 2
+        assert list(store) == [Calculation(3, 3, 'add'), Calculation(4, 4, 'add')]
+        assert store[-1] == Calculation(4, 4, 'add')
+
+    def test_spill_to_disk(self, tmp_path):
+        """Test that evicted entries are readable from the spill file"""
+        store = RingBufferHistory(2, str(tmp_path / "spill.log"))
+        for i in range(5):
+            store.append(Calculation(i, i + 1, 'add' if i % 2 == 0 else 'multiply'))
+        assert len(store) == 5
+        assert store[0] == Calculation(0.0, 1.0, 'add')
+        assert store[2] == Calculation(2, 3, 'add')
+        assert store[4] == Calculation(4, 5, 'add')
+        assert store[1:3] == [Calculation(1, 2, 'multiply'), Calculation(2, 3, 'add')]
+        assert [calc.a for calc in store] == [0, 1, 2, 3, 4]
+        store.close()
+
+    def test_spill_multi_operand_entries(self, tmp_path):
+        """Test that spilled entries keep all their operands"""
+        store = RingBufferHistory(1, str(tmp_path / "spill.csv"))
+        store.append(Calculation(10, 2, 'subtract', (3,)))
+        store.append(Calculation(1, 2, 'add'))
+        assert store[0] == Calculation(10, 2, 'subtract', (3,))
+        assert list(store)[1] == Calculation(1, 2, 'add')
+        store.close()
+
+    def test_random_access_across_checkpoints(self, tmp_path):
+        """Test indexed reads of spilled entries through the sparse offset index"""
+        store = RingBufferHistory(3, str(tmp_path / "spill.log"))
+        for i in range(300):
+            store.append(Calculation(i, -i, 'add', (i,) if i % 7 == 0 else ()))
+        assert len(store._checkpoints) == -(-297 // RingBufferHistory.SPILL_INDEX_STRIDE)
+        for i in (296, 0, 130, 63, 64, 65, 297, 299, 7):
+            assert store[i] == Calculation(i, -i, 'add', (i,) if i % 7 == 0 else ())
+        assert [calc.a for calc in store[62:67]] == [62, 63, 64, 65, 66]
+        assert [calc.a for calc in store.iter_range(190, 200)] == list(range(190, 200))
+        store.close()
+
+    def test_existing_spill_contents_are_skipped(self, tmp_path):
+        """Test that lines already in the spill file are not part of a new store"""
+        spill_path = tmp_path / "spill.log"
+        spill_path.write_text("9.0,9.0,add\n")
+        store = RingBufferHistory(1, str(spill_path))
+        store.append(Calculation(1, 1, 'add'))
+        store.append(Calculation(2, 2, 'add'))
+        assert list(store) == [Calculation(1, 1, 'add'), Calculation(2, 2, 'add')]
+        assert store[0] == Calculation(1, 1, 'add')
+        store.close()
+
+    def test_clear_closes_spill_file(self, tmp_path):
+        """Test that clearing releases the spill file handles"""
+        store = RingBufferHistory(1, str(tmp_path / "spill.log"))
+        for i in range(3):
+            store.append(Calculation(i, i, 'add'))
+        assert store[0] == Calculation(0, 0, 'add')
+        spill_file, reader = store._spill_file, store._spill_reader
+        store.clear()
+        assert spill_file.closed and reader.closed
+        assert store._spill_file is None and store._spill_reader is None
+
+    def test_clear_keeps_audit_file(self, tmp_path):
+        """Test that clearing empties the history but keeps the spill file"""
+        spill_path = tmp_path / "spill.log"
+        store = RingBufferHistory(1, str(spill_path))
+        store.append(Calculation(1, 1, 'add'))
+        store.append(Calculation(2, 2, 'add'))
+        store.clear()
+        assert len(store) == 0
+        assert list(store) == []
+        store.append(Calculation(3, 3, 'add'))
+        store.append(Calculation(4, 4, 'add'))
+        assert list(store) == [Calculation(3, 3, 'add'), Calculation(4, 4, 'add')]
+        store.close()
+        assert spill_path.read_text().count('\n') == 2
+
+    def test_invalid_capacity(self):
+        """Test that a non-positive capacity is rejected"""
+        with pytest.raises(ValueError):
+            RingBufferHistory(0)
+
+    def test_calculations_with_ring_buffer(self, tmp_path):
+        """Test the Calculations API covering both tiers"""
+        original = Calculations.history
+        Calculations.set_history_store(
+            create_history_store(capacity=2, spill_path=str(tmp_path / "spill.log"))
+        )
+        try:
+            Calculations.add_calculation(Calculation(1, 2, 'add'))
+            Calculations.add_calculation(Calculation(3, 4, 'subtract'))
+            Calculations.add_calculation(Calculation(5, 6, 'add'))
+            assert len(Calculations.get_history()) == 3
+            assert Calculations.get_latest() == Calculation(5, 6, 'add')
+            assert Calculations.find_by_operation('add') == [Calculation(1, 2, 'add'),
+                                                             Calculation(5, 6, 'add')]
+        finally:
+            Calculations.history.close()
+            Calculations.set_history_store(original)
+
+    def test_indexes_skip_evicted_entries(self):
+        """Test that indexed queries ignore entries dropped from a bounded store"""
+        original = Calculations.history
+        Calculations.set_history_store(create_history_store(capacity=2))
+        try:
+            Calculations.add_calculation(Calculation(1, 2, 'add'))
+            Calculations.add_calculation(Calculation(3, 4, 'subtract'))
+            Calculations.add_calculation(Calculation(5, 6, 'add'))
+            assert Calculations.find_by_operation('add') == [Calculation(5, 6, 'add')]
+            assert Calculations.find_by_result_range(-10, 100) == [Calculation(3, 4, 'subtract'),
+                                                                   Calculation(5, 6, 'add')]
+        finally:
+            Calculations.set_history_store(original)
+
+    def test_index_of_bounded_store_stays_bounded(self):
+        """Test that positions evicted from a bounded store are pruned from the indexes"""
+        history = CalculationHistory(create_history_store(capacity=10))
+        for i in range(1000):
+            history.add_calculation(Calculation(i, i + 0.5, 'add' if i % 2 else 'subtract'))
+        index = history._index
+        indexed = sum(len(positions) for positions in index._by_operand.values())
+        assert indexed <= 2 * 2 * 10
+        assert len(index._results) <= 2 * 10
+        assert [calc.a for calc in history.find_by_operation('add')] == [991, 993, 995, 997, 999]
+        # Equal results are returned in insertion order
+        assert [calc.a for calc in history.find_by_result_range(-1, 0)] == \
+            [990, 992, 994, 996, 998]
+
+    def test_index_of_spilling_store_stays_bounded(self, tmp_path):
+        """Test that spilled positions leave the indexes and are found by scanning the spill file"""
+        history = CalculationHistory(
+            create_history_store(capacity=10, spill_path=str(tmp_path / "spill.log")))
+        calculations = [Calculation(i, i % 7, 'add' if i % 2 else 'subtract') for i in range(1000)]
+        for calculation in calculations:
+            history.add_calculation(calculation)
+        index = history._index
+        assert sum(len(positions) for positions in index._by_operation.values()) <= 2 * 10
+        assert len(index._results) <= 2 * 10
+        assert history.find_by_operation('add') == calculations[1::2]
+        assert history.find_by_operand(3) == [calc for calc in calculations if 3 in calc.operands]
+        expected = sorted((calc for calc in calculations if 0 <= calc.perform() <= 50),
+                          key=lambda calc: calc.perform())
+        assert history.find_by_result_range(0, 50) == expected
+        history.history.close()
+
+    def test_capacity_requires_list_backend(self):
+        """Test that a capacity does not silently replace an explicit backend"""
+        with pytest.raises(ValueError, match="only supported by the list backend"):
+            create_history_store('sqlite', capacity=5)
+        assert isinstance(create_history_store('list', capacity=5), RingBufferHistory)
+
+    def test_view_over_spill_tier(self, tmp_path):
+        """Test views reading across the spill file and the ring buffer"""
+        store = RingBufferHistory(2, str(tmp_path / "spill.log"))
+        for i in range(5):
+            store.append(Calculation(i, i, 'add'))
+        view = HistoryView(store, 1, 4)
+        assert [calc.a for calc in view] == [1, 2, 3]
+        assert [calc.a for calc in reversed(view)] == [3, 2, 1]
+        assert [calc.a for calc in HistoryView(store, 3)] == [3, 4]
+        store.close()
+
+
+class TestHistoryView:
+    """Test cases for HistoryView over changing stores"""
+
+    def test_iterate_while_evicting(self):
+        """Test that appends evicting from a bounded store do not shift the view"""
+        history = CalculationHistory(RingBufferHistory(5))
+        for i in range(5):
+            history.add_calculation(Calculation(i, i, 'add'))
+        seen = []
+        for calc in history.get_history(0, 3):
+            seen.append(calc.a)
+            history.add_calculation(Calculation(10 + calc.a, 0, 'add'))
+        assert seen == [0, 1, 2]
+
+    def test_positions_follow_evictions(self):
+        """Test that later chunks are located after entries were evicted"""
+        store = RingBufferHistory(1000)
+        for i in range(1000):
+            store.append(Calculation(i, i, 'add'))
+        view = HistoryView(store, 700)
+        seen = []
+        for calc in view:
+            seen.append(calc.a)
+            store.append(Calculation(-1, -1, 'add'))
+        assert seen == list(range(700, 1000))
+        assert view[0] == Calculation(700, 700, 'add')
+
+    def test_evicted_entries_raise(self):
+        """Test that reading entries evicted since the view was created raises"""
+        store = RingBufferHistory(3)
+        for i in range(3):
+            store.append(Calculation(i, i, 'add'))
+        view = HistoryView(store)
+        store.append(Calculation(3, 3, 'add'))
+        assert view[2] == Calculation(2, 2, 'add')
+        with pytest.raises(HistoryChangedError):
+            view[0]
+        with pytest.raises(HistoryChangedError):
+            list(view)
+
+    def test_cleared_history_raises(self):
+        """Test that a view created before clear_history is reported as stale"""
+        history = CalculationHistory()
+        history.add_calculation(Calculation(1, 2, 'add'))
+        view = history.get_history()
+        history.clear_history()
+        with pytest.raises(HistoryChangedError):
+            list(view)
+        history.add_calculation(Calculation(3, 4, 'add'))
+        with pytest.raises(HistoryChangedError):
+            view[0]
+        assert list(history.get_history()) == [Calculation(3, 4, 'add')]
+
+    def test_reverse_over_spill_reads_sequentially(self, tmp_path, monkeypatch):
+        """Test that reverse iteration reads the spill file in chunks, not per entry"""
+        store = RingBufferHistory(4, str(tmp_path / "spill.log"))
+        for i in range(600):
+            store.append(Calculation(i, i, 'add'))
+
+        def fail(position):
+            raise AssertionError("spilled entry read individually")
+        monkeypatch.setattr(store, '_read_spilled', fail)
+        assert [calc.a for calc in reversed(HistoryView(store))] == list(range(599, -1, -1))
+        assert [calc.a for calc in reversed(HistoryView(store, 10, 20))] == list(range(19, 9, -1))
+        store.close()
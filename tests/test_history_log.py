@@ -0,0 +1,150 @@
+"""
+Tests for the persistent memory-mapped history log
+"""
+import pytest
+from calculator.calculation import Calculation
+from calculator.calculations import Calculations
+from calculator.history import HistoryChangedError, HistoryView
+from calculator.history_log import MappedHistory, MAGIC, RECORD
+
+class TestMappedHistory:
+    """Test cases for MappedHistory"""
+
+    @pytest.fixture
+    def log_path(self, tmp_path):
+        """Fixture providing a path for the history log"""
+        return str(tmp_path / "history.bin")
+
+    def test_append_and_read(self, log_path):
+        """Test reading buffered and persisted entries"""
+        store = MappedHistory(log_path, flush_every=2)
+        store.append(Calculation(1, 2, 'add'))
+        store.append(Calculation(3, 4, 'divide'))
+        store.append(Calculation(5, 6, 'power'))
+        assert len(store) == 3
+        assert store[0] == Calculation(1.0, 2.0, 'add')
+        assert store[-1] == Calculation(5, 6, 'power')
+        assert list(store) == [Calculation(1, 2, 'add'), Calculation(3, 4, 'divide'),
+                               Calculation(5, 6, 'power')]
+        assert [calc.a for calc in HistoryView(store, 1, 3)] == [3, 5]
+        store.close()
+
+    def test_reload(self, log_path):
+        """Test that a reopened log contains all previously written entries"""
+        store = MappedHistory(log_path, flush_every=100)
+        for i in range(250):
+            store.append(Calculation(i, i + 1, 'multiply'))
+        store.close()
+
+        reloaded = MappedHistory(log_path)
+        assert len(reloaded) == 250
+        assert reloaded[249] == Calculation(249, 250, 'multiply')
+        assert sum(1 for _ in reloaded) == 250
+        reloaded.close()
+
+    def test_multi_operand_entries(self, log_path):
+        """Test that further operands survive flushing, reloading and clearing"""
+        store = MappedHistory(log_path, flush_every=2)
+        store.append(Calculation(1, 2, 'add', (3, 4)))
+        store.append(Calculation(5, 6, 'multiply'))
+        store.append(Calculation(10, 2, 'subtract', (3,)))
+        assert store[2] == Calculation(10, 2, 'subtract', (3,))
+        store.close()
+        
+        reopened = MappedHistory(log_path)
+        assert list(reopened) == [Calculation(1, 2, 'add', (3, 4)), Calculation(5, 6, 'multiply'),
+                                  Calculation(10, 2, 'subtract', (3,))]
+        assert reopened[0].perform() == 10
+        reopened.clear()
+        reopened.append(Calculation(1, 2, 'add'))
+        reopened.close()
+        assert list(MappedHistory(log_path)) == [Calculation(1, 2, 'add')]
+
+    def test_fixed_size_records(self, log_path):
+        """Test the on-disk layout and the always fsync policy"""
+        store = MappedHistory(log_path, fsync='always')
+        store.append(Calculation(1, 2, 'add'))
+        with open(log_path, 'rb') as log:
+            assert len(log.read()) == len(MAGIC) + RECORD.size
+        store.close()
+
+    def test_truncated_record_is_ignored(self, log_path):
+        """Test that a partially written trailing record is skipped"""
+        store = MappedHistory(log_path, fsync='never')
+        store.append(Calculation(1, 2, 'add'))
+        store.close()
+        with open(log_path, 'ab') as log:
+            log.write(b'\x01\x02\x03')
+        reopened = MappedHistory(log_path, fsync='never')
+        assert len(reopened) == 1
+        reopened.append(Calculation(3, 4, 'multiply'))
+        reopened.close()
+        assert list(MappedHistory(log_path)) == [Calculation(1, 2, 'add'),
+                                                 Calculation(3, 4, 'multiply')]
+
+    def test_sidecar_ahead_of_log_is_dropped(self, log_path):
+        """Test that further operands of records lost in a crash are not reused"""
+        store = MappedHistory(log_path, flush_every=1)
+        store.append(Calculation(1, 2, 'add'))
+        store.close()
+        with open(log_path + '.rest', 'a', encoding='utf-8') as sidecar:
+            sidecar.write("1,7.0\n")
+        reopened = MappedHistory(log_path, flush_every=1)
+        reopened.append(Calculation(3, 4, 'add'))
+        reopened.close()
+        assert MappedHistory(log_path)[1] == Calculation(3, 4, 'add')
+
+    def test_clear_while_iterating(self, log_path):
+        """Test that an open iterator fails cleanly when the log is cleared"""
+        store = MappedHistory(log_path, flush_every=1)
+        for i in range(3000):
+            store.append(Calculation(i, i, 'add'))
+        iterator = iter(store)
+        assert next(iterator) == Calculation(0, 0, 'add')
+        store.clear()
+        with pytest.raises(HistoryChangedError):
+            list(iterator)
+        store.append(Calculation(5, 5, 'add'))
+        assert list(store) == [Calculation(5, 5, 'add')]
+        store.close()
+
+    def test_clear(self, log_path):
+        """Test that clearing truncates the log"""
+        store = MappedHistory(log_path, flush_every=1)
+        store.append(Calculation(1, 2, 'add'))
+        store.clear()
+        assert len(store) == 0
+        store.append(Calculation(3, 4, 'add'))
+        store.close()
+        assert list(MappedHistory(log_path)) == [Calculation(3, 4, 'add')]
+
+    def test_invalid_arguments(self, log_path, tmp_path):
+        """Test invalid fsync policies, foreign files and long operation names"""
+        with pytest.raises(ValueError):
+            MappedHistory(log_path, fsync='sometimes')
+        other = tmp_path / "other.bin"
+        other.write_bytes(b'not a log')
+        with pytest.raises(ValueError):
+            MappedHistory(str(other))
+        store = MappedHistory(log_path, fsync='always')
+        with pytest.raises(ValueError):
+            store.append(Calculation(1, 2, 'x' * 17))
+        store.close()
+
+    def test_calculations_with_mapped_store(self, log_path):
+        """Test indexed queries over a preloaded log"""
+        store = MappedHistory(log_path)
+        store.append(Calculation(1, 2, 'add'))
+        store.append(Calculation(3, 4, 'subtract'))
+        store.close()
+
+        original = Calculations.history
+        Calculations.set_history_store(MappedHistory(log_path))
+        try:
+            Calculations.add_calculation(Calculation(5, 6, 'add'))
+            assert Calculations.find_by_operation('add') == [Calculation(1, 2, 'add'),
+                                                             Calculation(5, 6, 'add')]
+            assert Calculations.get_latest() == Calculation(5, 6, 'add')
+        finally:
+            Calculations.history.close()
+            Calculations.set_history_store(original)
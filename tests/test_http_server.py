@@ -0,0 +1,157 @@
+"""
+Tests for the calculator HTTP JSON API
+"""
+import http.client
+import json
+import threading
+import pytest
+from server.http_server import CalculatorHTTPServer
+
+@pytest.fixture(scope="module")
+def http_server():
+    """Fixture running the HTTP server on an ephemeral port"""
+    server = CalculatorHTTPServer(('127.0.0.1', 0), workers=4)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+def _request(connection, method, path, payload=None, session_id=None):
+    """Send a request on a persistent connection and decode the JSON reply"""
+    body = None if payload is None else json.dumps(payload)
+    headers = {} if body is None else {'Content-Type': 'application/json'}
+    if session_id:
+        headers['X-Session-Id'] = session_id
+    connection.request(method, path, body=body, headers=headers)
+    response = connection.getresponse()
+    return response.status, json.loads(response.read())
+
+class TestCalculatorHTTPServer:
+    """Test class for the HTTP JSON API"""
+    
+    def test_keep_alive_requests(self, http_server):
+        """Test several requests over one persistent connection"""
+        connection = http.client.HTTPConnection('127.0.0.1', http_server.server_address[1],
+                                                timeout=5)
+        assert _request(connection, 'POST', '/commands/add', {'args': ['2', '3']}) == \
+            (200, {'result': 5.0})
+        assert _request(connection, 'POST', '/commands/multiply', {'args': [2, 4]}) == \
+            (200, {'result': 8.0})
+        status, payload = _request(connection, 'GET', '/commands')
+        assert status == 200
+        assert 'add' in payload['commands']
+        assert 'exit' not in payload['commands']
+        connection.close()
+    
+    def test_errors(self, http_server):
+        """Test error statuses for bad requests"""
+        connection = http.client.HTTPConnection('127.0.0.1', http_server.server_address[1],
+                                                timeout=5)
+        assert _request(connection, 'POST', '/commands/divide', {'args': ['1', '0']})[0] == 400
+        assert _request(connection, 'POST', '/commands/bogus', {'args': []})[0] == 404
+        assert _request(connection, 'POST', '/commands/exit', {'args': []})[0] == 400
+        assert _request(connection, 'POST', '/commands/add', {'args': 'oops'})[0] == 400
+        assert _request(connection, 'GET', '/missing')[0] == 404
+        connection.request('POST', '/batch', body='not json')
+        response = connection.getresponse()
+        assert response.status == 400
+        response.read()
+        assert http_server.app.running is True
+        connection.close()
+    
+    def test_batch(self, http_server):
+        """Test running many operations in one round trip"""
+        connection = http.client.HTTPConnection('127.0.0.1', http_server.server_address[1],
+                                                timeout=5)
+        status, results = _request(connection, 'POST', '/batch', [
+            {'command': 'add', 'args': [1, 2]},
+            {'command': 'divide', 'args': [1, 0]},
+            {'command': 'power', 'args': [2, 3]},
+            {'args': [1]},
+        ])
+        assert status == 200
+        assert results[0] == {'result': 3.0}
+        assert 'error' in results[1]
+        assert results[2] == {'result': 8.0}
+        assert 'error' in results[3]
+        connection.close()
+    
+    def test_complex_result(self, http_server):
+        """Test that a complex result is reported as an error instead of dropping the reply"""
+        connection = http.client.HTTPConnection('127.0.0.1', http_server.server_address[1],
+                                                timeout=5)
+        status, payload = _request(connection, 'POST', '/commands/power', {'args': [-8, 0.5]})
+        assert status == 400
+        assert 'not a real number' in payload['error']
+        status, results = _request(connection, 'POST', '/batch', [
+            {'command': 'eval', 'args': ['power(-8,0.5)']},
+            {'command': 'add', 'args': [1, 2]},
+        ])
+        assert status == 200
+        assert 'error' in results[0]
+        assert results[1] == {'result': 3.0}
+        connection.close()
+    
+    def test_oversized_body_closes_connection(self, http_server, monkeypatch):
+        """Test that an unread oversized body is not parsed as the next request"""
+        monkeypatch.setattr('server.http_server.MAX_BODY_BYTES', 16)
+        connection = http.client.HTTPConnection('127.0.0.1', http_server.server_address[1],
+                                                timeout=5)
+        connection.request('POST', '/commands/add', body=json.dumps({'args': [1, 2, 3, 4, 5]}))
+        response = connection.getresponse()
+        assert response.status == 400
+        assert response.getheader('Connection') == 'close'
+        response.read()
+        assert response.will_close
+        connection.close()
+    
+    def test_sessions(self, http_server):
+        """Test that requests with a session id record into that session"""
+        connection = http.client.HTTPConnection('127.0.0.1', http_server.server_address[1],
+                                                timeout=5)
+        _request(connection, 'POST', '/commands/add', {'args': [1, 2]}, 'alice')
+        _request(connection, 'POST', '/commands/add', {'args': [3, 4]}, 'alice')
+        _request(connection, 'POST', '/commands/add', {'args': [5, 6]}, 'bob')
+        assert len(http_server.sessions.get('alice').history.get_history()) == 2
+        assert len(http_server.sessions.get('bob').history.get_history()) == 1
+        assert _request(connection, 'DELETE', '/sessions/alice') == (200, {'closed': True})
+        assert _request(connection, 'DELETE', '/sessions/alice')[0] == 404
+        connection.close()
+    
+    def test_session_ids_are_bounded(self, http_server):
+        """Test that arbitrary session ids cannot grow the registry without limit"""
+        sessions = http_server.sessions
+        limit = sessions.max_sessions
+        sessions.max_sessions = 3
+        try:
+            connection = http.client.HTTPConnection('127.0.0.1', http_server.server_address[1],
+                                                    timeout=5)
+            for i in range(20):
+                status, _ = _request(connection, 'POST', '/commands/add', {'args': [1, i]},
+                                     f"client-{i}")
+                assert status == 200
+            connection.close()
+            assert len(sessions) == 3
+            assert sessions.get('client-19') is not None
+            assert sessions.get('client-0') is None
+        finally:
+            sessions.max_sessions = limit
+    
+    def test_concurrent_clients(self, http_server):
+        """Test clients served concurrently by the worker pool"""
+        results = []
+        
+        def client(value):
+            connection = http.client.HTTPConnection('127.0.0.1', http_server.server_address[1],
+                                                    timeout=5)
+            results.append(_request(connection, 'POST', '/commands/add',
+                                    {'args': [value, 1]})[1]['result'])
+            connection.close()
+        
+        threads = [threading.Thread(target=client, args=(i,)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert sorted(results) == [float(i + 1) for i in range(8)]
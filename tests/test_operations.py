@@ -0,0 +1,69 @@
+"""
+Tests for the shared operation registry
+"""
+import pytest
+from calculator.operations import (register_operation, unregister_operation, get_operation,
+                                   get_operations, divide)
+from calculator.calculation import Calculation
+from calculator.calculator import Calculator
+
+@pytest.fixture
+def restore_operations():
+    """Fixture removing operations registered by a test"""
+    before = get_operations()
+    yield
+    for name in set(get_operations()) - set(before):
+        unregister_operation(name)
+    for name, func in before.items():
+        register_operation(name, func)
+
+class TestOperations:
+    """Test cases for the operation registry"""
+
+    def test_core_operations_registered(self):
+        """Test that the core operations are available"""
+        operations = get_operations()
+        for name in ['add', 'subtract', 'multiply', 'divide']:
+            assert name in operations
+        assert get_operation('add')(2, 3) == 5
+        assert get_operation('unknown') is None
+
+    def test_divide_by_zero(self):
+        """Test that the registered divide rejects a zero divisor"""
+        with pytest.raises(ZeroDivisionError):
+            divide(1, 0)
+
+    @pytest.mark.usefixtures('restore_operations')
+    def test_register_operation(self):
+        """Test registering a new binary operation"""
+        register_operation('modulo', lambda a, b: a % b)
+        assert Calculation(7, 4, 'modulo').perform() == 3
+        assert Calculator.perform('modulo', 9, 4) == 1
+        assert Calculator.batch('modulo', [5, 6], 4) == [1, 2]
+
+    @pytest.mark.usefixtures('restore_operations')
+    def test_register_operation_after_construction(self):
+        """Test that a calculation resolves operations registered later"""
+        calc = Calculation(2, 5, 'maximum')
+        register_operation('maximum', max)
+        assert calc.perform() == 5
+
+    @pytest.mark.usefixtures('restore_operations')
+    def test_unregister_operation(self):
+        """Test that an unregistered operation is no longer available"""
+        register_operation('modulo', lambda a, b: a % b)
+        assert unregister_operation('modulo') is not None
+        assert get_operation('modulo') is None
+        assert unregister_operation('modulo') is None
+        with pytest.raises(ValueError):
+            Calculator.perform('modulo', 9, 4)
+
+    def test_register_non_callable(self):
+        """Test that non-callable operations are rejected"""
+        with pytest.raises(TypeError):
+            register_operation('bad', 42)
+
+    def test_calculator_perform_unknown(self):
+        """Test that Calculator.perform rejects unknown operations"""
+        with pytest.raises(ValueError):
+            Calculator.perform('unknown', 1, 2)
@@ -0,0 +1,82 @@
+"""
+Tests for the parallel script runner
+"""
+import io
+from calculator.calculations import Calculations
+from parallel_runner import ParallelScriptRunner
+
+class TestParallelScriptRunner:
+    """Test class for the parallel script runner"""
+    
+    def test_outputs_and_history_in_order(self, capsys):
+        """Test that outputs and merged history follow script order"""
+        Calculations.clear_history()
+        lines = [f"add {i} 1\n" for i in range(25)] + ["divide 1 0\n", "\n", "bogus\n"]
+        output = io.StringIO()
+        
+        summary = ParallelScriptRunner(workers=2, chunk_size=4).run(lines, output)
+        
+        results = output.getvalue().splitlines()
+        assert results[:25] == [str(float(i + 1)) for i in range(25)]
+        assert results[25].startswith("Error")
+        assert "Unknown command" in results[26]
+        assert summary['commands'] == 27
+        assert summary['errors'] == 2
+        assert [calc.a for calc in Calculations.find_by_operation('add')] == \
+            [float(i) for i in range(25)]
+        assert "on 2 workers" in capsys.readouterr().err
+    
+    def test_exit_discards_later_chunks(self):
+        """Test that lines after exit are not reported or recorded"""
+        Calculations.clear_history()
+        lines = ["add 1 1\n", "exit\n"] + ["multiply 2 2\n"] * 10
+        output = io.StringIO()
+        
+        summary = ParallelScriptRunner(workers=2, chunk_size=3).run(lines, output)
+        
+        assert output.getvalue().splitlines()[-1].startswith("Exiting")
+        assert summary['commands'] == 2
+        assert Calculations.find_by_operation('multiply') == []
+    
+    def test_session_state_matches_sequential_run(self):
+        """Test that scripts using variables and stats give the same output as a plain run"""
+        from calculator.session import DEFAULT_SESSION
+        from calculator_app import CalculatorApp
+        lines = ([f"add {i} 1\n" for i in range(6)] + ["set x 5\n", "add x 1\n"] +
+                 [f"multiply {i} 2\n" for i in range(6)] +
+                 ["let y = x * 2\n", "add y x | multiply 2\n", "stats\n", "vars\n"])
+        
+        Calculations.clear_history()
+        DEFAULT_SESSION.variables.clear()
+        expected = io.StringIO()
+        CalculatorApp().run_script(iter(lines), expected)
+        expected_history = Calculations.snapshot()
+        
+        Calculations.clear_history()
+        DEFAULT_SESSION.variables.clear()
+        output = io.StringIO()
+        summary = ParallelScriptRunner(workers=2, chunk_size=1).run(lines, output)
+        
+        assert output.getvalue() == expected.getvalue()
+        assert "6.0" in output.getvalue().splitlines()
+        assert summary['commands'] == len(lines)
+        assert summary['errors'] == 0
+        assert Calculations.snapshot() == expected_history
+        DEFAULT_SESSION.variables.clear()
+    
+    def test_cache_reports_totals_of_all_workers(self, monkeypatch):
+        """Test that the cache command counts lookups made by every worker"""
+        import re
+        from utils.env_config import EnvConfig
+        monkeypatch.setattr(EnvConfig, 'RESULT_CACHE_SIZE', 100)
+        Calculations.clear_history()
+        lines = ["add 1 1\n"] * 8 + ["cache\n"]
+        output = io.StringIO()
+        
+        ParallelScriptRunner(workers=2, chunk_size=2).run(lines, output)
+        
+        hits, misses = map(int, re.search(r"Hits: (\d+), misses: (\d+)",
+                                          output.getvalue()).groups())
+        assert hits + misses == 8
+        assert 1 <= misses <= 2
+        Calculations.clear_history()
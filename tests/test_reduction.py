@@ -0,0 +1,87 @@
+"""
+Tests for reducing operations over many operands
+"""
+import math
+import operator
+import pytest
+from calculator.calculation import Calculation
+from calculator.operations import get_operation, register_operation
+from calculator.reduction import fold, reduce_operands, reduce_product, reduce_sum
+from calculator_app import CalculatorApp
+
+class TestReduceSum:
+    """Test class for the summation path"""
+    
+    def test_sum_is_correctly_rounded(self):
+        """Test that rounding errors do not accumulate as in a left fold"""
+        values = [0.1] * 10
+        assert fold(operator.add, values) != 1.0
+        assert reduce_sum(values) == 1.0
+    
+    def test_cancellation(self):
+        """Test that small values survive between large ones that cancel"""
+        assert reduce_sum([1e100, 1.0, -1e100, 1.0]) == 2.0
+    
+    def test_infinities_and_overflow_match_fold(self):
+        """Test that inf, nan and overflowing sums behave like a fold"""
+        assert reduce_sum([1.0, math.inf, 2.0]) == math.inf
+        assert math.isnan(reduce_sum([math.inf, 1.0, -math.inf]))
+        assert reduce_sum([1e308, 1e308, 1.0]) == math.inf
+    
+    def test_negative_zero(self):
+        """Test that a sum of negative zeros keeps its sign"""
+        assert math.copysign(1.0, reduce_sum([-0.0, -0.0, -0.0])) == -1.0
+
+
+class TestReduceProduct:
+    """Test class for the product path"""
+    
+    def test_integer_product_is_exact(self):
+        """Test that all-integer products are rounded once"""
+        values = [float(n) for n in range(1, 26)]
+        assert reduce_product(values) == float(math.factorial(25))
+    
+    def test_intermediate_overflow_and_underflow(self):
+        """Test that products representable as floats are found despite extreme partials"""
+        assert reduce_product([1e200, 1e200, 1e-300, 1e-100]) == pytest.approx(1.0)
+        assert reduce_product([1e-200, 1e-200, 1e300, 1e100]) == pytest.approx(1.0)
+        assert reduce_product([1.5] * 2000) == math.inf
+        assert reduce_product([-1.5] * 2001) == -math.inf
+        assert reduce_product([0.5] * 2000) == 0.0
+    
+    def test_long_products_match_fold(self):
+        """Test that chunked products agree with a left fold"""
+        values = [1.0 + i / 1000 for i in range(1, 300)]
+        assert reduce_product(values) == pytest.approx(fold(operator.mul, values), rel=1e-12)
+    
+    def test_zero_infinity_and_nan(self):
+        """Test that zeros, infinities and nan keep IEEE semantics"""
+        assert math.copysign(1.0, reduce_product([2.0, -0.0, 3.0])) == -1.0
+        assert math.isnan(reduce_product([math.inf, 2.5, 0.0]))
+        assert reduce_product([math.inf, -2.5, 3.5]) == -math.inf
+        assert math.isnan(reduce_product([1.5, math.nan, 2.5]))
+
+
+class TestReduceOperands:
+    """Test class for selecting a reduction"""
+    
+    def test_non_associative_operations_fold(self):
+        """Test that subtract and divide are applied left to right"""
+        assert reduce_operands('subtract', get_operation('subtract'), [10, 2, 3]) == 5
+        assert reduce_operands('divide', get_operation('divide'), [100, 5, 2]) == 10
+    
+    def test_replaced_operation_folds(self):
+        """Test that an operation replaced by a plugin is not bypassed"""
+        original = get_operation('add')
+        register_operation('add', lambda a, b: a + b + 1)
+        try:
+            assert reduce_operands('add', get_operation('add'), [1, 2, 3]) == 8
+        finally:
+            register_operation('add', original)
+    
+    def test_commands_and_history_agree(self):
+        """Test that variadic commands and their history records use the same reduction"""
+        app = CalculatorApp()
+        args = ['0.1'] * 10
+        assert app.commands['add'].execute(*args) == 1.0
+        assert Calculation.from_operands('add', [0.1] * 10).perform() == 1.0
@@ -0,0 +1,138 @@
+"""
+Tests for the pure command result cache
+"""
+import pytest
+from calculator.result_cache import ResultCache, PersistentResultCache, MISSING
+from calculator.calculations import Calculations
+from calculator_app import CalculatorApp
+
+class TestResultCache:
+    """Test class for ResultCache and its use by CalculatorApp"""
+    
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted first"""
+        cache = ResultCache(2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        assert cache.get('a') == 1
+        cache.put('c', 3)
+        assert cache.get('b') is MISSING
+        assert cache.get('a') == 1
+        assert cache.get('c') == 3
+        stats = cache.stats()
+        assert (stats['hits'], stats['misses'], stats['evictions']) == (3, 1, 1)
+        assert stats['hit_rate'] == 0.75
+    
+    def test_make_key_normalizes_numbers(self):
+        """Test that equal numbers share a key and non-numbers are not cached"""
+        assert ResultCache.make_key('add', ['2', '3']) == ResultCache.make_key('add', [2.0, 3])
+        assert ResultCache.make_key('add', ['two', '3']) is None
+    
+    def test_invalid_size(self):
+        """Test that the cache requires a positive size"""
+        with pytest.raises(ValueError):
+            ResultCache(0)
+    
+    def test_app_serves_pure_commands_from_cache(self):
+        """Test that repeated pure calls hit the cache but are still recorded"""
+        Calculations.clear_history()
+        app = CalculatorApp(cache_size=8)
+        assert app.execute_command('divide', ['10', '4']) == "2.5"
+        assert app.execute_command('divide', ['10.0', '4']) == "2.5"
+        assert app.execute_command('power', ['2', '3']) == "8.0"
+        assert app.result_cache.hits == 1
+        assert app.result_cache.misses == 2
+        assert len(Calculations.get_history()) == 2
+        Calculations.clear_history()
+    
+    def test_app_does_not_cache_errors_or_impure_commands(self):
+        """Test that failures and impure commands bypass the cache"""
+        app = CalculatorApp(cache_size=8)
+        assert app.execute_command('divide', ['1', '0']).startswith("Error")
+        assert app.execute_command('divide', ['1', '0']).startswith("Error")
+        app.execute_command('menu', [])
+        assert len(app.result_cache) == 0
+        assert "Hits: 0, misses: 2" in app.execute_command('cache', [])
+    
+    def test_cache_disabled_by_default(self):
+        """Test that the cache is opt-in"""
+        app = CalculatorApp(cache_size=0)
+        assert app.result_cache is None
+        assert app.execute_command('add', ['1', '2']) == "3.0"
+
+
+class TestPersistentResultCache:
+    """Test class for the disk-backed result cache"""
+    
+    def test_results_survive_restart(self, tmp_path):
+        """Test that results written by one cache are served by the next"""
+        path = str(tmp_path / "results.db")
+        cache = PersistentResultCache(4, path)
+        key = ResultCache.make_key('divide', ['10', '4'])
+        cache.put(key, 2.5)
+        cache.close()
+        
+        reopened = PersistentResultCache(4, path)
+        assert reopened.get(key) == 2.5
+        assert reopened.stats()['disk_hits'] == 1
+        # The result is now in memory, so the next hit does not touch the disk
+        assert reopened.get(key) == 2.5
+        assert reopened.stats()['disk_hits'] == 1
+        assert reopened.get(ResultCache.make_key('divide', ['1', '4'])) is MISSING
+        reopened.close()
+    
+    def test_shared_between_open_caches(self, tmp_path):
+        """Test that flushed results are visible to another open cache"""
+        path = str(tmp_path / "results.db")
+        writer = PersistentResultCache(4, path)
+        reader = PersistentResultCache(4, path)
+        key = ResultCache.make_key('add', [1, 2])
+        writer.put(key, 3.0)
+        writer.flush()
+        assert reader.get(key) == 3.0
+        writer.close()
+        reader.close()
+    
+    def test_warm_loads_hottest_entries(self, tmp_path):
+        """Test that warm-up preloads the most used results"""
+        path = str(tmp_path / "results.db")
+        cache = PersistentResultCache(8, path)
+        for value, uses in ((1, 1), (2, 5), (3, 3)):
+            key = ResultCache.make_key('add', [value, value])
+            cache.put(key, value * 2.0)
+            for _ in range(uses - 1):
+                cache.get(key)
+        cache.close()
+        
+        warm = PersistentResultCache(2, path)
+        assert warm.warm() == 2
+        assert len(warm) == 2
+        assert warm.get(ResultCache.make_key('add', [2, 2])) == 4.0
+        assert warm.get(ResultCache.make_key('add', [3, 3])) == 6.0
+        assert warm.stats()['disk_hits'] == 0
+        warm.close()
+    
+    def test_clear_removes_persisted_results(self, tmp_path):
+        """Test that clearing the cache also empties the database"""
+        path = str(tmp_path / "results.db")
+        cache = PersistentResultCache(4, path)
+        key = ResultCache.make_key('add', [1, 2])
+        cache.put(key, 3.0)
+        cache.flush()
+        cache.clear()
+        assert cache.get(key) is MISSING
+        cache.close()
+    
+    def test_app_warms_from_previous_run(self, tmp_path):
+        """Test that a new application starts with results from an earlier one"""
+        path = str(tmp_path / "results.db")
+        first = CalculatorApp(cache_size=8, cache_file=path)
+        first.execute_command('power', ['2', '10'])
+        first.result_cache.close()
+        
+        second = CalculatorApp(cache_size=8, cache_file=path)
+        assert len(second.result_cache) == 1
+        assert second.execute_command('power', ['2', '10']) == "1024.0"
+        assert second.result_cache.hits == 1
+        assert "Served from disk: 0" in second.execute_command('cache', [])
+        second.result_cache.close()
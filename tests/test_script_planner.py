@@ -0,0 +1,75 @@
+"""
+Tests for the script planner
+"""
+import io
+from calculator.calculations import Calculations
+from calculator_app import CalculatorApp
+from script_planner import ScriptPlanner
+
+SCRIPT = [
+    "add 1 2\n",
+    "multiply 3 4\n",
+    "add 1.0 2\n",
+    "stats\n",
+    "divide 1 0\n",
+    "divide 1 0\n",
+    "multiply -0 5\n",
+    "multiply 0 5\n",
+    "bogus 1\n",
+    "add 1 two\n",
+    "\n",
+    "power 2 10\n",
+    "add 1 2\n",
+    "exit\n",
+    "add 9 9\n",
+]
+
+def _run(optimize):
+    """Run SCRIPT and return the outputs, summary and history"""
+    Calculations.clear_history()
+    app = CalculatorApp(cache_size=0)
+    output = io.StringIO()
+    summary = app.run_script(list(SCRIPT), output, optimize=optimize)
+    history = Calculations.snapshot()
+    Calculations.clear_history()
+    return output.getvalue(), summary, history
+
+class TestScriptPlanner:
+    """Test class for the script planner"""
+    
+    def test_plan_deduplicates_pure_calls(self):
+        """Test that identical pure calls become one folded node"""
+        plan = ScriptPlanner(CalculatorApp(cache_size=0)).plan(SCRIPT)
+        assert plan.summary() == {'lines': 14, 'pure_calls': 9, 'unique_calls': 6, 'folded': 5}
+        assert plan.results[('add', (1.0, 2.0))] == 3.0
+        assert ('divide', (1.0, 0.0)) not in plan.results
+    
+    def test_optimized_run_matches_naive_run(self, capsys):
+        """Test that planning does not change outputs, errors or history"""
+        naive_output, naive_summary, naive_history = _run(optimize=False)
+        optimized_output, optimized_summary, optimized_history = _run(optimize=True)
+        assert optimized_output == naive_output
+        assert "-0.0\n0.0\n" in optimized_output
+        assert optimized_summary['commands'] == naive_summary['commands']
+        assert optimized_summary['errors'] == naive_summary['errors'] == 4
+        assert optimized_history == naive_history
+        assert optimized_summary['unique_calls'] == 6
+        assert "as 6 distinct calculations" in capsys.readouterr().err
+    
+    def test_folded_lines_are_not_dispatched(self, monkeypatch):
+        """Test that lines making a folded call are answered from the plan"""
+        Calculations.clear_history()
+        app = CalculatorApp(cache_size=0)
+        executed = []
+        execute_line = app.execute_line
+        
+        def counting_execute_line(line, session=None):
+            executed.append(line)
+            return execute_line(line, session)
+        
+        monkeypatch.setattr(app, 'execute_line', counting_execute_line)
+        app.run_script(list(SCRIPT), io.StringIO(), optimize=True)
+        # 7 of the 14 lines up to exit make a call folded at plan time
+        assert executed == ["stats\n", "divide 1 0\n", "divide 1 0\n", "bogus 1\n",
+                            "add 1 two\n", "\n", "exit\n"]
+        Calculations.clear_history()
@@ -0,0 +1,92 @@
+"""
+Tests for per-user sessions
+"""
+from calculator.calculation import Calculation
+from calculator.calculations import Calculations
+from calculator.session import DEFAULT_SESSION, Session, SessionManager
+from calculator_app import CalculatorApp
+
+class TestSession:
+    """Test class for Session and SessionManager"""
+    
+    def test_sessions_are_isolated(self):
+        """Test that each session owns its own history"""
+        first, second = Session(), Session()
+        first.history.add_calculation(Calculation(1, 2, 'add'))
+        assert len(first.history.get_history()) == 1
+        assert len(second.history.get_history()) == 0
+        assert first.id != second.id
+    
+    def test_default_session_uses_global_history(self):
+        """Test that the default session shares the process-wide history"""
+        assert DEFAULT_SESSION.history is Calculations
+    
+    def test_manager_lifecycle(self):
+        """Test creating, looking up and closing sessions"""
+        manager = SessionManager()
+        session = manager.create()
+        assert manager.get(session.id) is session
+        assert manager.get_or_create('named') is manager.get_or_create('named')
+        assert len(manager) == 2
+        session.history.add_calculation(Calculation(1, 2, 'add'))
+        assert manager.close(session.id) is True
+        assert manager.close(session.id) is False
+        assert manager.get(session.id) is None
+        assert len(session.history.get_history()) == 0
+    
+    def test_least_recently_used_sessions_are_dropped(self):
+        """Test that the registry keeps at most max_sessions sessions"""
+        manager = SessionManager(max_sessions=2, idle_timeout=0)
+        first = manager.get_or_create('first')
+        manager.get_or_create('second')
+        assert manager.get('first') is first
+        manager.get_or_create('third')
+        assert len(manager) == 2
+        assert manager.get('second') is None
+        assert manager.get('first') is first
+        assert manager.evicted == 1
+        for i in range(100):
+            manager.get_or_create(f"client-{i}")
+        assert len(manager) == 2
+    
+    def test_idle_sessions_expire(self):
+        """Test that sessions unused for longer than the timeout are dropped"""
+        now = [0.0]
+        manager = SessionManager(max_sessions=0, idle_timeout=60, clock=lambda: now[0])
+        idle = manager.get_or_create('idle')
+        active = manager.get_or_create('active')
+        now[0] = 50
+        assert manager.get('active') is active
+        now[0] = 100
+        assert manager.get('idle') is None
+        assert manager.get('active') is active
+        assert manager.expired == 1
+        assert manager.get_or_create('idle') is not idle
+        assert len(manager) == 2
+    
+    def test_dropped_session_keeps_working(self):
+        """Test that a session dropped from the registry is not cleared under its holder"""
+        manager = SessionManager(max_sessions=1, idle_timeout=0)
+        held = manager.create()
+        held.history.add_calculation(Calculation(1, 2, 'add'))
+        manager.create()
+        assert manager.get(held.id) is None
+        assert len(held.history.get_history()) == 1
+        assert manager.close(held.id) is False
+    
+    def test_app_records_into_session(self):
+        """Test that commands run in a session record into its history"""
+        Calculations.clear_history()
+        app = CalculatorApp()
+        session = Session()
+        assert app.run_command('add', ['2', '3'], session) == 5.0
+        assert app.execute_command('stats', [], session).startswith("Calculations: 1")
+        assert len(session.history.get_history()) == 1
+        assert len(Calculations.get_history()) == 0
+    
+    def test_app_session_default(self):
+        """Test that the app falls back to its own session"""
+        session = Session()
+        app = CalculatorApp(session)
+        app.run_command('multiply', ['2', '3'])
+        assert session.history.get_latest().operation == 'multiply'
@@ -0,0 +1,127 @@
+"""
+Tests for the SQLite-backed history store
+"""
+import time
+import pytest
+from calculator.calculation import Calculation
+from calculator.calculations import Calculations
+from calculator.sqlite_history import SQLiteHistory
+
+class TestSQLiteHistory:
+    """Test cases for SQLiteHistory"""
+
+    @pytest.fixture
+    def store(self, tmp_path):
+        """Fixture providing a store with a few calculations"""
+        store = SQLiteHistory(str(tmp_path / "history.db"), batch_size=2)
+        store.append(Calculation(2, 3, 'add'))
+        store.append(Calculation(10, 4, 'subtract'))
+        store.append(Calculation(6, 3, 'divide'))
+        store.append(Calculation(1, 0, 'divide'))
+        store.append(Calculation(4, 5, 'add'))
+        yield store
+        store.close()
+
+    def test_sequence_access(self, store):
+        """Test positional reads across inserted and buffered rows"""
+        assert len(store) == 5
+        assert store[0] == Calculation(2, 3, 'add')
+        assert store[-1] == Calculation(4, 5, 'add')
+        assert store[1:3] == [Calculation(10, 4, 'subtract'), Calculation(6, 3, 'divide')]
+        assert [calc.operation for calc in store] == ['add', 'subtract', 'divide',
+                                                      'divide', 'add']
+        with pytest.raises(IndexError):
+            store[5]
+
+    def test_query_pushdown(self, store):
+        """Test operation, operand and result queries"""
+        assert store.find_by_operation('add') == [Calculation(2, 3, 'add'),
+                                                  Calculation(4, 5, 'add')]
+        assert store.find_by_operand(3) == [Calculation(2, 3, 'add'),
+                                            Calculation(6, 3, 'divide')]
+        assert store.find_by_result_range(2, 6) == [Calculation(6, 3, 'divide'),
+                                                    Calculation(2, 3, 'add'),
+                                                    Calculation(10, 4, 'subtract')]
+
+    def test_filter_and_aggregate(self, store):
+        """Test filters and SQL aggregates"""
+        assert store.filter(operation='divide', min_result=0) == [Calculation(6, 3, 'divide')]
+        assert store.filter(since=time.time() + 60) == []
+        assert len(store.filter(until=time.time() + 60)) == 5
+
+        stats = store.aggregate('result', operation='add')
+        assert stats == {'count': 2, 'sum': 14.0, 'avg': 7.0, 'min': 5.0, 'max': 9.0}
+        # The failed division has no result and is not counted
+        assert store.aggregate()['count'] == 4
+        assert store.count_by_operation() == {'add': 2, 'subtract': 1, 'divide': 2}
+        with pytest.raises(ValueError):
+            store.aggregate('operation')
+
+    def test_persistence(self, store, tmp_path):
+        """Test that calculations survive reopening the database"""
+        store.close()
+        reopened = SQLiteHistory(str(tmp_path / "history.db"))
+        assert len(reopened) == 5
+        reopened.append(Calculation(7, 7, 'multiply'))
+        assert reopened[5] == Calculation(7, 7, 'multiply')
+        reopened.clear()
+        assert len(reopened) == 0
+        reopened.close()
+
+    def test_multi_operand_entries(self, store):
+        """Test storing and querying further operands"""
+        store.append(Calculation(1, 2, 'add', (7.5, 4)))
+        assert store[5] == Calculation(1, 2, 'add', (7.5, 4))
+        assert store.find_by_result_range(14.5, 14.5) == [Calculation(1, 2, 'add', (7.5, 4))]
+        assert store.find_by_operand(7.5) == [Calculation(1, 2, 'add', (7.5, 4))]
+        assert store.find_by_operand(7) == []
+
+    def test_adds_rest_column_to_old_database(self, tmp_path):
+        """Test opening a database created without the rest column"""
+        import sqlite3
+        path = str(tmp_path / "old.db")
+        connection = sqlite3.connect(path)
+        connection.execute("CREATE TABLE calculations (id INTEGER PRIMARY KEY, a REAL NOT NULL, "
+                           "b REAL NOT NULL, operation TEXT NOT NULL, result REAL, "
+                           "created_at REAL NOT NULL)")
+        connection.execute("INSERT INTO calculations VALUES (1, 2, 3, 'add', 5, 0)")
+        connection.commit()
+        connection.close()
+        store = SQLiteHistory(path)
+        store.append(Calculation(1, 2, 'add', (3,)))
+        assert list(store) == [Calculation(2, 3, 'add'), Calculation(1, 2, 'add', (3,))]
+        store.close()
+
+    def test_calculations_with_sqlite_store(self, store):
+        """Test that Calculations pushes queries down to the store"""
+        original = Calculations.history
+        Calculations.set_history_store(store)
+        try:
+            Calculations.add_calculation(Calculation(9, 1, 'add'))
+            assert len(Calculations.find_by_operation('add')) == 3
+            assert Calculations.find_by_operand(9) == [Calculation(9, 1, 'add')]
+            assert Calculations.find_by_result_range(10, 10) == [Calculation(9, 1, 'add')]
+            assert Calculations.get_latest() == Calculation(9, 1, 'add')
+        finally:
+            Calculations.set_history_store(original)
+
+    def test_calculations_store_result_computed_once(self, store, monkeypatch):
+        """Test that the result computed by add_calculation is stored without performing again"""
+        original = Calculations.history
+        Calculations.set_history_store(store)
+        performed = []
+        perform = Calculation.perform
+
+        def counting_perform(calculation):
+            performed.append(calculation)
+            return perform(calculation)
+
+        monkeypatch.setattr(Calculation, 'perform', counting_perform)
+        try:
+            Calculations.add_calculation(Calculation(20, 2, 'multiply'))
+            Calculations.add_calculation(Calculation(5, 5, 'add'), 10.0)
+            assert len(performed) == 1
+            assert Calculations.find_by_result_range(10, 40) == [Calculation(5, 5, 'add'),
+                                                                 Calculation(20, 2, 'multiply')]
+        finally:
+            Calculations.set_history_store(original)
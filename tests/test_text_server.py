@@ -0,0 +1,115 @@
+"""
+Tests for the asyncio calculator server
+"""
+import asyncio
+import pytest
+from server.text_server import CalculatorServer, escape_reply, unescape_reply
+
+async def _start(server):
+    """Start the server on an ephemeral port and return the port"""
+    listener = await server.start_tcp('127.0.0.1', 0)
+    return listener.sockets[0].getsockname()[1]
+
+class TestCalculatorServer:
+    """Test class for the calculator server"""
+    
+    def test_respond(self):
+        """Test replies to individual command lines"""
+        server = CalculatorServer()
+        assert server.respond("add 2 3\n") == "5.0"
+        assert server.respond("\n") == ""
+        assert "Unknown command" in server.respond("bogus 1")
+        assert server.respond('add "1').startswith("Error")
+        assert server.respond("exit") is None
+        assert server.respond("add 1 2 | multiply 3") == "9.0"
+        assert server.respond("add 1 2 | quit") is None
+        assert server.app.running is True
+    
+    def test_pipelined_clients(self):
+        """Test concurrent clients sending pipelined commands"""
+        async def scenario():
+            server = CalculatorServer()
+            port = await _start(server)
+            
+            async def client(offset):
+                reader, writer = await asyncio.open_connection('127.0.0.1', port)
+                # Send every command before reading any reply
+                writer.write("".join(f"add {offset} {i}\n" for i in range(50)).encode())
+                await writer.drain()
+                replies = [(await reader.readline()).decode().strip() for _ in range(50)]
+                writer.write(b"exit\n")
+                await writer.drain()
+                assert await reader.read() == b""
+                writer.close()
+                return replies
+            
+            results = await asyncio.gather(*(client(offset * 100) for offset in range(5)))
+            await server.close()
+            return results
+        
+        results = asyncio.run(scenario())
+        for offset, replies in enumerate(results):
+            assert replies == [str(float(offset * 100 + i)) for i in range(50)]
+    
+    def test_reply_escaping(self):
+        """Test that replies are encoded as one line and decoded back"""
+        for reply in ("5.0", "Calculations: 1\nadd=1", "a\\nb", "x\r\n\\"):
+            line = escape_reply(reply)
+            assert "\n" not in line and "\r" not in line
+            assert unescape_reply(line) == reply
+    
+    def test_multi_line_replies_stay_in_sync(self):
+        """Test that multi-line replies occupy one line when commands are pipelined"""
+        async def scenario():
+            server = CalculatorServer()
+            port = await _start(server)
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            writer.write(b"add 1 2\nstats\nmenu\nadd 2 2\nexit\n")
+            await writer.drain()
+            replies = (await reader.read()).decode().split("\n")
+            writer.close()
+            await server.close()
+            return replies
+        
+        replies = asyncio.run(scenario())
+        assert replies[-1] == ""
+        replies = replies[:-1]
+        assert len(replies) == 4
+        assert replies[0] == "3.0" and replies[3] == "4.0"
+        stats = unescape_reply(replies[1])
+        assert "Calculations: 1" in stats and "\n" in stats
+        menu = unescape_reply(replies[2])
+        assert len(menu.splitlines()) > 1 and "add" in menu
+    
+    def test_unix_socket(self, tmp_path):
+        """Test serving over a Unix domain socket"""
+        if not hasattr(asyncio, 'start_unix_server'):
+            pytest.skip("Unix sockets are not supported on this platform")
+        path = str(tmp_path / "calc.sock")
+        
+        async def scenario():
+            server = CalculatorServer()
+            await server.start_unix(path)
+            reader, writer = await asyncio.open_unix_connection(path)
+            writer.write(b"multiply 6 7\n")
+            reply = await reader.readline()
+            writer.close()
+            await server.close()
+            return reply
+        
+        assert asyncio.run(scenario()) == b"42.0\n"
+    
+    def test_line_too_long(self):
+        """Test that overlong lines are rejected and the connection closed"""
+        async def scenario():
+            server = CalculatorServer(line_limit=64)
+            port = await _start(server)
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            writer.write(b"add " + b"1" * 200 + b"\n")
+            await writer.drain()
+            reply = await reader.read()
+            writer.close()
+            await server.close()
+            return reply
+        
+        assert asyncio.run(scenario()) == b"Error: line too long\n"
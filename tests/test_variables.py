@@ -0,0 +1,158 @@
+"""
+Tests for session variables and reactive recomputation
+"""
+import math
+import pytest
+from calculator.expression import CompiledExpression, ExpressionError
+from calculator.session import Session
+from calculator.variables import VariableTable
+from calculator_app import CalculatorApp
+
+class TestVariableTable:
+    """Test class for VariableTable"""
+    
+    @pytest.fixture
+    def table(self):
+        """Fixture providing a small spreadsheet of inputs and derived values"""
+        table = VariableTable()
+        table.set('price', 4)
+        table.set('quantity', 3)
+        table.set('rate', 0.25)
+        table.define('subtotal', CompiledExpression('price * quantity'))
+        table.define('tax', CompiledExpression('subtotal * rate'))
+        table.define('total', CompiledExpression('subtotal + tax'))
+        table.define('discount', CompiledExpression('rate * 2'))
+        return table
+    
+    def test_define_evaluates(self, table):
+        """Test that derived values are computed when defined"""
+        assert (table['subtotal'], table['tax'], table['total']) == (12, 3, 15)
+        assert table.definition('total') == 'subtotal + tax'
+        assert table.definition('price') is None
+    
+    def test_only_downstream_values_recompute(self, table):
+        """Test that a change updates exactly the affected values in dependency order"""
+        assert table.set('quantity', 5) == ['subtotal', 'tax', 'total']
+        assert table['total'] == 25
+        updated = table.set('rate', 0.5)
+        assert sorted(updated) == ['discount', 'tax', 'total']
+        assert updated.index('tax') < updated.index('total')
+        assert table['total'] == 30
+        assert table.set('price', 4) == ['subtotal', 'tax', 'total']
+    
+    def test_redefine_and_replace(self, table):
+        """Test redefining a derived value and turning it into an input"""
+        assert table.define('tax', CompiledExpression('subtotal / 10')) == ['tax', 'total']
+        assert table['total'] == 13.2
+        assert table.set('tax', 0) == ['total']
+        assert table.set('price', 1) == ['subtotal', 'total']
+        assert table['total'] == 3
+    
+    def test_invalid_definitions(self, table):
+        """Test unknown variables, cycles and invalid names"""
+        with pytest.raises(ExpressionError, match="Unknown variable: missing"):
+            table.define('x', CompiledExpression('missing + 1'))
+        with pytest.raises(ExpressionError, match="Circular definition of subtotal"):
+            table.define('subtotal', CompiledExpression('total * 2'))
+        with pytest.raises(ExpressionError, match="Circular definition"):
+            table.define('price', CompiledExpression('price + 1'))
+        for name in ('1x', 'inf', 'a-b'):
+            with pytest.raises(ValueError, match="Invalid variable name"):
+                table.set(name, 1)
+        assert table['subtotal'] == 12
+    
+    def test_errors_become_nan_until_fixed(self, table):
+        """Test that failing definitions are reported and recover"""
+        table.set('zero', 0)
+        table.define('ratio', CompiledExpression('total / zero'))
+        assert math.isnan(table['ratio'])
+        assert table.errors['ratio'] == "Cannot divide by zero"
+        table.set('zero', 5)
+        assert table['ratio'] == 3
+        assert 'ratio' not in table.errors
+    
+    def test_delete(self, table):
+        """Test that only variables nothing depends on can be removed"""
+        with pytest.raises(ValueError, match="used by"):
+            del table['price']
+        del table['total']
+        assert 'total' not in table
+        assert table.set('quantity', 1) == ['subtotal', 'tax']
+        table.clear()
+        assert len(table) == 0
+    
+    def test_long_chain(self):
+        """Test that long dependency chains do not recurse"""
+        table = VariableTable()
+        table.set('v0', 0)
+        for i in range(1, 3000):
+            table.define(f'v{i}', CompiledExpression(f'v{i - 1} + 1'))
+        assert len(table.set('v0', 1)) == 2999
+        assert table['v2999'] == 3000
+    
+    def test_concurrent_changes(self):
+        """Test that concurrent set and let calls on one table keep derived values current"""
+        import threading
+        table = VariableTable()
+        table.set('x', 0)
+        errors = []
+        
+        def define(worker):
+            try:
+                for i in range(200):
+                    table.define(f'y{worker}_{i % 20}', CompiledExpression(f'x + {i % 20}'))
+            except Exception as e:  # pylint: disable=broad-except
+                errors.append(e)
+        
+        def assign():
+            try:
+                for i in range(500):
+                    table.set('x', i)
+                    list(table)
+            except Exception as e:  # pylint: disable=broad-except
+                errors.append(e)
+        
+        threads = [threading.Thread(target=define, args=(worker,)) for worker in range(4)]
+        threads += [threading.Thread(target=assign) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert not errors
+        for name in table:
+            if name != 'x':
+                assert table[name] == table['x'] + int(name.split('_')[1])
+
+
+class TestVariableCommands:
+    """Test class for the set, let and vars commands"""
+    
+    def test_spreadsheet_session(self):
+        """Test variables used by commands and recomputed on change"""
+        app = CalculatorApp()
+        session = Session()
+        assert app.execute_line("set x 5", session) == "x = 5.0"
+        assert app.execute_line("let y = x * 2", session) == "y = 10.0"
+        assert app.execute_line("set x 10", session) == "x = 10.0; updated y = 20.0"
+        assert app.execute_line("add x y 1", session) == "31.0"
+        assert session.history.get_latest().operands == (10.0, 20.0, 1.0)
+        assert app.execute_line("eval y / x", session) == "2.0"
+        assert app.execute_line("vars", session) == "x = 10.0\ny = x * 2 = 20.0"
+    
+    def test_errors(self):
+        """Test invalid set and let commands"""
+        app = CalculatorApp()
+        session = Session()
+        assert app.execute_line("set x", session).startswith("Error")
+        assert app.execute_line("set x abc", session) == "Error: Invalid number: 'abc'"
+        assert app.execute_line("let y 2", session).startswith("Error: Let command requires")
+        assert app.execute_line("let y = z", session) == "Error: Unknown variable: z"
+        assert app.execute_line("add x 1", session) == "Error: Invalid number: 'x'"
+        assert app.execute_line("vars", session) == "No variables defined"
+    
+    def test_sessions_do_not_share_variables(self):
+        """Test that variables are scoped to a session"""
+        app = CalculatorApp()
+        first, second = Session(), Session()
+        app.execute_line("set x 1", first)
+        assert app.execute_line("add x 1", second) == "Error: Invalid number: 'x'"
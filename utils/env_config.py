@@ -20,6 +20,41 @@ class EnvConfig:
     # Feature flags
     ENABLE_ADVANCED_OPERATIONS = os.getenv('ENABLE_ADVANCED_OPERATIONS', 'false').lower() == 'true'
     
+    # Calculation history storage ('list', 'columnar', 'mmap' or 'sqlite')
+    HISTORY_BACKEND = os.getenv('HISTORY_BACKEND', 'list').lower()
+    
+    # Persistent history log used by the 'mmap' backend
+    HISTORY_LOG_FILE = os.getenv('HISTORY_LOG_FILE', 'calculator_history.bin')
+    HISTORY_FSYNC = os.getenv('HISTORY_FSYNC', 'batch').lower()
+    HISTORY_FLUSH_EVERY = int(os.getenv('HISTORY_FLUSH_EVERY', '1024'))
+    
+    # SQLite database used by the 'sqlite' backend
+    HISTORY_DB_FILE = os.getenv('HISTORY_DB_FILE', 'calculator_history.db')
+    
+    # Bounded history: keep the newest N entries in memory (0 means unbounded)
+    HISTORY_CAPACITY = int(os.getenv('HISTORY_CAPACITY', '0'))
+    
+    # Optional append-only file receiving entries evicted from bounded history
+    HISTORY_SPILL_FILE = os.getenv('HISTORY_SPILL_FILE', '')
+    
+    # Number of pure command results memoized in memory (0 disables the cache)
+    RESULT_CACHE_SIZE = int(os.getenv('RESULT_CACHE_SIZE', '0'))
+    
+    # Optional SQLite file persisting cached results across runs and processes
+    RESULT_CACHE_FILE = os.getenv('RESULT_CACHE_FILE', '')
+    
+    # Number of most used persisted results preloaded at startup
+    RESULT_CACHE_WARMUP = int(os.getenv('RESULT_CACHE_WARMUP', '1000'))
+    
+    # Number of compiled expressions kept by the eval command
+    EXPRESSION_CACHE_SIZE = int(os.getenv('EXPRESSION_CACHE_SIZE', '256'))
+    
+    # Server sessions: at most SESSION_MAX are kept (least recently used are
+    # dropped first) and sessions idle for SESSION_IDLE_TIMEOUT seconds expire
+    # (0 disables either limit)
+    SESSION_MAX = int(os.getenv('SESSION_MAX', '10000'))
+    SESSION_IDLE_TIMEOUT = float(os.getenv('SESSION_IDLE_TIMEOUT', '3600'))
+    
     @classmethod
     def is_development(cls) -> bool:
         """Check if the application is running in development mode"""